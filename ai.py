@@ -0,0 +1,354 @@
+"""
+Jogadores controlados pelo computador (sem pygame).
+
+DensityAI mantém, para cada célula, quantas posições de navio ainda são
+possíveis passando por ela (mesmas posições de placement.legal_placements).
+Cada erro ou navio afundado só remove as posições que tocam as células
+novas, então a contagem é atualizada aos poucos em vez de refeita a cada
+tiro. Sem acertos pendentes o tiro vai na célula de maior densidade; com
+acertos pendentes, nas posições possíveis que passam por eles.
+
+MonteCarloAI sorteia frotas inteiras coerentes com o histórico (mesmas
+regras de Board.can_place_ship, via placement.FleetSampler) e atira onde
+mais frotas têm navio. A busca roda num executor, fora do loop de
+desenho, e respeita um prazo fixo por jogada.
+
+Interface de um jogador: start_turn() (começa a pensar, sem bloquear),
+choose() -> (x, y) e observe(shot) com o game.ShotResult do próprio tiro.
+"""
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from functools import lru_cache
+
+from board import mask_to_cells, neighbourhood
+from game import BOARD_SIZE
+from placement import blocked_placements, cell_conflicts, legal_placements, popcount, sampler_for
+
+
+@lru_cache(maxsize=None)
+def _placement_cells(size, length):
+    """Índices de célula (y*size + x) de cada posição legal."""
+    return tuple(tuple(y * size + x for x, y in mask_to_cells(mask, size))
+                 for mask in legal_placements(size, length))
+
+
+@lru_cache(maxsize=None)
+def _placement_halo(size, length):
+    """Vizinhança (sem o próprio navio) de cada posição legal."""
+    return tuple(neighbourhood(mask, size) & ~mask for mask in legal_placements(size, length))
+
+
+@lru_cache(maxsize=None)
+def _diagonals(size):
+    """Para cada célula, máscara das vizinhas em diagonal."""
+    masks = []
+    for y in range(size):
+        for x in range(size):
+            mask = 0
+            for dx, dy in ((-1, -1), (1, -1), (-1, 1), (1, 1)):
+                if 0 <= x + dx < size and 0 <= y + dy < size:
+                    mask |= 1 << ((y + dy) * size + x + dx)
+            masks.append(mask)
+    return tuple(masks)
+
+
+def _bits(mask):
+    """Índices dos bits ligados de mask."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class DensityAI:
+    """
+    Atirador por densidade de probabilidade. no_touch=True usa a regra de
+    Board.randomize_ships (navios não se encostam): as diagonais de um
+    acerto e a borda de um navio afundado viram água sem gastar tiros.
+    """
+
+    def __init__(self, lengths, size=BOARD_SIZE, no_touch=True, rng=None):
+        self.size = size
+        self.no_touch = no_touch
+        self.rng = rng or random.Random()
+        self.remaining = Counter(lengths)  # navios ainda não afundados por tamanho
+        self.shot_mask = 0
+        self.open_hits = 0   # acertos de navios ainda não afundados
+        self.blocked = 0     # células sabidamente sem navio (ou de navio afundado)
+        self._alive = {}
+        self._density = {}
+        for length in self.remaining:
+            cells = _placement_cells(size, length)
+            density = [0] * (size * size)
+            for placement in cells:
+                for c in placement:
+                    density[c] += 1
+            self._alive[length] = (1 << len(cells)) - 1
+            self._density[length] = density
+
+    def _block(self, mask):
+        """Descarta as posições que usam alguma célula de mask: O(posições removidas)."""
+        new = mask & ~self.blocked
+        if not new:
+            return
+        self.blocked |= new
+        for length, alive in self._alive.items():
+            gone = blocked_placements(self.size, length, new) & alive
+            if not gone:
+                continue
+            self._alive[length] = alive & ~gone
+            density = self._density[length]
+            cells = _placement_cells(self.size, length)
+            for k in _bits(gone):
+                for c in cells[k]:
+                    density[c] -= 1
+
+    def start_turn(self):
+        """Nada a preparar: a escolha leva menos de 1 ms."""
+
+    def observe(self, shot):
+        """Atualiza o mapa com o resultado (game.ShotResult) do próprio tiro."""
+        x, y = shot.cell
+        c = y * self.size + x
+        bit = 1 << c
+        self.shot_mask |= bit
+        if not shot.hit:
+            self._block(bit)
+            return
+        self.open_hits |= bit
+        if self.no_touch:
+            self._block(_diagonals(self.size)[c] & ~self.shot_mask)
+        if shot.sunk:
+            sunk = 0
+            for sx, sy in shot.sunk:
+                sunk |= 1 << (sy * self.size + sx)
+            self.open_hits &= ~sunk
+            self.remaining[len(shot.sunk)] -= 1
+            self._block(neighbourhood(sunk, self.size) if self.no_touch else sunk)
+
+    def scores(self):
+        """Peso de cada célula (índice y*size + x) para o próximo tiro."""
+        if self.open_hits:
+            return self._target_scores()
+        scores = [0] * (self.size * self.size)
+        for length, count in self.remaining.items():
+            if count > 0:
+                for c, d in enumerate(self._density[length]):
+                    scores[c] += count * d
+        return scores
+
+    def _target_scores(self):
+        """Só posições que passam por acertos pendentes (e não encostam em outros)."""
+        size = self.size
+        scores = [0] * (size * size)
+        for length, count in self.remaining.items():
+            if count <= 0:
+                continue
+            conflict = cell_conflicts(size, length)
+            candidates = 0
+            for c in _bits(self.open_hits):
+                candidates |= conflict[c]
+            candidates &= self._alive[length]
+            masks = legal_placements(size, length)
+            halos = _placement_halo(size, length)
+            cells = _placement_cells(size, length)
+            for k in _bits(candidates):
+                if self.no_touch and halos[k] & self.open_hits:
+                    continue
+                weight = count * popcount(masks[k] & self.open_hits)
+                for c in cells[k]:
+                    scores[c] += weight
+        return scores
+
+    def choose(self):
+        """Célula (x, y) ainda não atingida de maior peso; empates sorteados."""
+        scores = self.scores()
+        best, options = -1, []
+        for c, score in enumerate(scores):
+            if self.shot_mask >> c & 1:
+                continue
+            if score > best:
+                best, options = score, [c]
+            elif score == best:
+                options.append(c)
+        c = self.rng.choice(options)
+        return c % self.size, c // self.size
+
+
+class RandomAI:
+    """Referência para torneios: atira ao acaso em células ainda não atingidas."""
+
+    def __init__(self, lengths, size=BOARD_SIZE, rng=None):
+        self.rng = rng or random.Random()
+        self.cells = [(x, y) for y in range(size) for x in range(size)]
+        self.rng.shuffle(self.cells)
+
+    def start_turn(self):
+        """Nada a preparar."""
+
+    def choose(self):
+        return self.cells[-1]
+
+    def observe(self, shot):
+        self.cells.remove(shot.cell)
+
+
+# Nós da busca de reserva de FleetSampler por frota sorteada (~5 ms): sem
+# limite ela passa fácil do prazo de uma jogada e segura a thread de trabalho
+ESTIMATE_SEARCH_BUDGET = 1000
+# Varreduras de Gibbs por frota: a estimativa quer frotas perto da uniforme
+ESTIMATE_SWEEPS = 2
+# Parte do prazo (s) reservada para a thread de trabalho devolver a GIL
+# (um intervalo de troca) e para choose() terminar depois da estimativa
+MOVE_MARGIN = sys.getswitchinterval() + 0.002
+
+
+class Progress:
+    """
+    Contagens de estimate() até agora. Numa thread, quem chamou lê counts
+    e accepted a qualquer momento e liga stop para encerrar a busca.
+    """
+
+    def __init__(self, size):
+        self.counts = [0] * (size * size)
+        self.accepted = 0
+        self.stop = False
+
+    def snapshot(self):
+        """(contagens, frotas aceitas) lidas agora, sem esperar o fim."""
+        accepted = self.accepted
+        return list(self.counts), accepted
+
+
+def estimate(size, lengths, blocked, open_hits, budget_ms, seed=None, progress=None):
+    """
+    Sorteia frotas de lengths fora de blocked até estourar budget_ms e conta,
+    por célula, em quantas das que cobrem open_hits há navio.
+    Retorna (contagens, frotas aceitas). Função pura: roda em thread ou
+    processo; em thread, progress (Progress) deixa ler o parcial e parar antes.
+    """
+    deadline = time.monotonic() + budget_ms / 1000.0
+    rng = random.Random(seed)
+    progress = progress or Progress(size)
+    counts = progress.counts
+    if not lengths:
+        return progress.snapshot()
+    sampler = sampler_for(size, tuple(sorted(lengths, reverse=True)), ESTIMATE_SWEEPS)
+    while not progress.stop and time.monotonic() < deadline:
+        try:
+            masks = sampler.sample_masks(rng, blocked, ESTIMATE_SEARCH_BUDGET)
+        except ValueError:
+            break  # nenhuma frota cabe (ou a busca não achou) nas células livres
+        union = 0
+        for mask in masks:
+            union |= mask
+        if union & open_hits != open_hits:
+            continue
+        while union:
+            low = union & -union
+            counts[low.bit_length() - 1] += 1
+            union ^= low
+        progress.accepted += 1
+    return progress.snapshot()
+
+
+_executor = None
+
+
+def _default_executor():
+    """Uma thread de trabalho compartilhada, criada no primeiro uso."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai")
+    return _executor
+
+
+class MonteCarloAI(DensityAI):
+    """
+    "Computador Difícil" do menu: estima as probabilidades por amostragem
+    de frotas. Medido contra as mesmas frotas, ainda precisa de tantos
+    tiros quanto DensityAI.
+    start_turn() dispara estimate() no executor (padrão: uma thread; um
+    ProcessPoolExecutor também serve) com budget_ms de prazo; choose()
+    espera no máximo até esse prazo. Numa thread, o que já foi contado
+    vale mesmo se a busca não terminou; num processo só o resultado
+    final. Com menos de min_samples frotas, cai no mapa de densidade da
+    classe base.
+    """
+
+    def __init__(self, lengths, size=BOARD_SIZE, no_touch=True, rng=None,
+                 budget_ms=300, min_samples=30, executor=None):
+        super().__init__(lengths, size, no_touch, rng)
+        self.budget_ms = budget_ms
+        self.min_samples = min_samples
+        self.executor = executor
+        self._future = None
+        self._progress = None
+        self._deadline = 0.0
+        self.last_samples = 0  # frotas usadas na última jogada (0 = densidade)
+        self._warm()
+
+    def _warm(self):
+        """
+        Monta o FleetSampler da frota restante e os caches dele (posições,
+        conflitos) agora, fora do prazo de uma jogada.
+        """
+        lengths = tuple(sorted(self.remaining.elements(), reverse=True))
+        if lengths:
+            try:
+                sampler_for(self.size, lengths, ESTIMATE_SWEEPS).sample_masks(random.Random(0))
+            except ValueError:
+                pass  # estimate() também não vai achar frota: fica a densidade
+
+    def observe(self, shot):
+        super().observe(shot)
+        if shot.sunk:
+            self._warm()  # frota restante nova, FleetSampler novo
+
+    def start_turn(self):
+        if self._future is not None:
+            return
+        lengths = tuple(self.remaining.elements())
+        executor = self.executor or _default_executor()
+        # Um Progress só é visível daqui se o executor for de threads
+        self._progress = Progress(self.size) if isinstance(executor, ThreadPoolExecutor) else None
+        budget = max(0.0, self.budget_ms / 1000.0 - MOVE_MARGIN)
+        self._deadline = time.monotonic() + budget
+        self._future = executor.submit(estimate, self.size, lengths, self.blocked,
+                                       self.open_hits, budget * 1000.0, self.rng.getrandbits(32),
+                                       self._progress)
+
+    def scores(self):
+        self.start_turn()
+        future, self._future = self._future, None
+        progress, self._progress = self._progress, None
+        try:
+            counts, accepted = future.result(timeout=max(0.0, self._deadline - time.monotonic()))
+        except FutureTimeout:
+            # Prazo rígido: usa o parcial e libera a thread para a próxima jogada
+            future.cancel()
+            if progress is None:
+                counts, accepted = None, 0
+            else:
+                progress.stop = True
+                counts, accepted = progress.snapshot()
+        self.last_samples = accepted if accepted >= self.min_samples else 0
+        if not self.last_samples:
+            return super().scores()
+        return counts
+
+
+# Estratégias disponíveis (nome -> classe), usadas pelo menu e por tournament.py
+AI_PLAYERS = {
+    "aleatorio": RandomAI,
+    "densidade": DensityAI,
+    "monte_carlo": MonteCarloAI,
+}
+
+
+def make_ai(level, lengths, size=BOARD_SIZE, rng=None, **options):
+    """Cria o jogador do computador do nível pedido (options vão para a classe)."""
+    return AI_PLAYERS[level](lengths, size=size, rng=rng, **options)
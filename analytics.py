@@ -0,0 +1,265 @@
+"""
+Análise das partidas gravadas em matchlog, para os relatórios de dados.
+
+Calcula, sobre todas as partidas de um tamanho de tabuleiro:
+  - mapa de tiros por célula e taxa de acerto por célula;
+  - frequência de navios por célula (onde as frotas costumam ficar);
+  - distribuição de tiros até vencer (tiros do vencedor).
+
+O log é lido com np.memmap em blocos de partidas inteiras (o índice diz
+onde cada uma começa), então a memória não cresce com o tamanho do log.
+Os blocos vão para um ProcessPoolExecutor e os agregados parciais são
+somados na ordem em que chegam. O agregado fica salvo junto ao log, um
+arquivo por tamanho de tabuleiro (analytics_10.npz): rodar de novo só
+processa as partidas novas, mesmo alternando --size.
+
+Execução:
+    python analytics.py [--dir pasta_dos_logs] [--size 10] [--workers N]
+                        [--chunk 2000] [--full] [--json saida.json]
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from matchlog import END, INDEX, LOG_DIR, NO_WINNER, RECORD, SHIP, SHOT, START
+
+# Mesmo layout de matchlog.RECORD / INDEX, para ler os arquivos direto com NumPy
+RECORD_DTYPE = np.dtype([("kind", "u1"), ("player", "u1"), ("a", "<u2"),
+                         ("match", "<u4"), ("value", "<u8")])
+INDEX_DTYPE = np.dtype([("offset", "<u8"), ("count", "<u4"), ("pad", "<u4")])
+assert RECORD_DTYPE.itemsize == RECORD.size and INDEX_DTYPE.itemsize == INDEX.size
+
+CHUNK_MATCHES = 2000  # partidas por bloco (~4 MB de registros)
+STATE_FILE = "analytics_{size}.npz"  # um estado por tamanho de tabuleiro
+
+
+class Aggregate:
+    """Contagens somáveis; merge() junta o resultado de outro bloco."""
+
+    FIELDS = ("shots", "hits", "ships", "shots_to_win")
+
+    def __init__(self, size=10):
+        cells = size * size
+        self.size = size
+        self.matches = 0      # entradas do índice já processadas (de qualquer tamanho)
+        self.log_bytes = 0    # fim do log já processado
+        self.games = 0        # partidas deste tamanho
+        self.abandoned = 0    # sem vencedor
+        self.fleets = 0       # frotas registradas (uma por jogador)
+        self.shots = np.zeros(cells, dtype=np.int64)
+        self.hits = np.zeros(cells, dtype=np.int64)
+        self.ships = np.zeros(cells, dtype=np.int64)
+        self.shots_to_win = np.zeros(cells + 1, dtype=np.int64)  # histograma
+        self.new_matches = 0  # da última execução de run() (não salvos)
+        self.seconds = 0.0
+
+    def merge(self, other):
+        self.matches += other.matches
+        self.log_bytes = max(self.log_bytes, other.log_bytes)
+        self.games += other.games
+        self.abandoned += other.abandoned
+        self.fleets += other.fleets
+        for name in self.FIELDS:
+            getattr(self, name)[:] += getattr(other, name)
+        return self
+
+    def save(self, path):
+        np.savez(path, size=self.size, matches=self.matches, log_bytes=self.log_bytes,
+                 games=self.games, abandoned=self.abandoned, fleets=self.fleets,
+                 **{name: getattr(self, name) for name in self.FIELDS})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            agg = cls(int(data["size"]))
+            for name in ("matches", "log_bytes", "games", "abandoned", "fleets"):
+                setattr(agg, name, int(data[name]))
+            for name in cls.FIELDS:
+                getattr(agg, name)[:] = data[name]
+        return agg
+
+
+def _paths(directory):
+    return os.path.join(directory, "matches.log"), os.path.join(directory, "matches.idx")
+
+
+def process_chunk(task):
+    """
+    Agrega as partidas [first, last) do log. task = (pasta, first, last,
+    size). Roda num processo do pool: abre os próprios memmaps e devolve
+    só o Aggregate do bloco.
+    """
+    directory, first, last, size = task
+    log_path, index_path = _paths(directory)
+    agg = Aggregate(size)
+    agg.matches = last - first
+    index = np.memmap(index_path, dtype=INDEX_DTYPE, mode="r",
+                      offset=first * INDEX.size, shape=(last - first,))
+    starts = (index["offset"] // RECORD.size).astype(np.int64)
+    counts = index["count"].astype(np.int64)
+    lo, hi = int(starts[0]), int(starts[-1] + counts[-1])
+    agg.log_bytes = hi * RECORD.size
+    block = np.memmap(log_path, dtype=RECORD_DTYPE, mode="r",
+                      offset=lo * RECORD.size, shape=(hi - lo,))
+
+    # Só os registros apontados pelo índice: uma gravação interrompida deixa
+    # registros órfãos no log, com o id da partida seguinte
+    edges = np.zeros(hi - lo + 1, dtype=np.int64)
+    np.add.at(edges, starts - lo, 1)
+    np.add.at(edges, starts - lo + counts, -1)
+    rec = block[np.cumsum(edges[:-1]) > 0]
+    match = np.repeat(np.arange(len(counts)), counts)  # partida (no bloco) de cada registro
+    kind, player, a, value = rec["kind"], rec["player"], rec["a"], rec["value"]
+
+    sizes = np.zeros(len(counts), dtype=np.int64)
+    is_start = kind == START
+    sizes[match[is_start]] = a[is_start]
+    wanted = sizes == size
+    keep = wanted[match]
+    agg.games = int(wanted.sum())
+    cells = size * size
+
+    is_shot = keep & (kind == SHOT)
+    shot_cells = a[is_shot].astype(np.int64)
+    agg.shots += np.bincount(shot_cells, minlength=cells)
+    agg.hits += np.bincount(shot_cells[(value[is_shot] & 1) == 1], minlength=cells)
+
+    is_ship = keep & (kind == SHIP)
+    ship = value[is_ship].astype(np.int64)
+    x, y, length, horizontal = ship & 0xFF, ship >> 8 & 0xFF, ship >> 16 & 0xFF, ship >> 24 & 1
+    for k in range(int(length.max()) if len(length) else 0):
+        part = length > k
+        px = x[part] + k * horizontal[part]
+        py = y[part] + k * (1 - horizontal[part])
+        agg.ships += np.bincount(py * size + px, minlength=cells)
+    agg.fleets = len(np.unique(match[is_ship] * 256 + player[is_ship]))
+
+    winners = np.full(len(counts), NO_WINNER, dtype=np.int64)
+    is_end = kind == END
+    winners[match[is_end]] = player[is_end]
+    decided = wanted & (winners != NO_WINNER)
+    agg.abandoned = int((wanted & ~decided).sum())
+    by_winner = is_shot & (player == winners[match])
+    winner_shots = np.bincount(match[by_winner], minlength=len(counts))[decided]
+    agg.shots_to_win += np.bincount(np.minimum(winner_shots, cells), minlength=cells + 1)
+    return agg
+
+
+def run(directory=LOG_DIR, size=10, workers=None, chunk=CHUNK_MATCHES, full=False, state=None):
+    """
+    Atualiza o agregado com as partidas novas do log e o retorna.
+    full=True ignora o estado salvo e refaz tudo.
+    """
+    log_path, index_path = _paths(directory)
+    state = state or os.path.join(directory, STATE_FILE.format(size=size))
+    try:
+        total = os.path.getsize(index_path) // INDEX.size
+        log_size = os.path.getsize(log_path)
+    except OSError:
+        total = log_size = 0
+
+    agg = None
+    if not full and os.path.exists(state):
+        agg = Aggregate.load(state)
+        # Estado de outro tamanho, ou log apagado/recriado: recomeça do zero
+        if agg.size != size or agg.matches > total or agg.log_bytes > log_size:
+            agg = None
+    agg = agg or Aggregate(size)
+
+    tasks = [(directory, first, min(first + chunk, total), size)
+             for first in range(agg.matches, total, chunk)]
+    start = time.perf_counter()
+    if tasks:
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            for part in map(process_chunk, tasks):
+                agg.merge(part)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for part in pool.map(process_chunk, tasks):
+                    agg.merge(part)
+        agg.save(state)
+    agg.seconds = time.perf_counter() - start
+    agg.new_matches = sum(last - first for _, first, last, _ in tasks)
+    return agg
+
+
+def summarize(agg):
+    """Resumo serializável (listas size x size) para o relatório / JSON."""
+    size = agg.size
+    hist = agg.shots_to_win
+    decided = int(hist.sum())
+    counts = np.arange(len(hist))
+    if decided:
+        cumulative = np.cumsum(hist)
+        def percentile(p):
+            return int(np.searchsorted(cumulative, p / 100.0 * decided))
+        shots_to_win = {"games": decided, "mean": float((hist * counts).sum() / decided),
+                        "p50": percentile(50), "p90": percentile(90),
+                        "min": int(counts[hist > 0][0]), "max": int(counts[hist > 0][-1])}
+    else:
+        shots_to_win = {"games": 0, "mean": None, "p50": None, "p90": None, "min": None, "max": None}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        hit_ratio = np.where(agg.shots > 0, agg.hits / agg.shots, np.nan)
+    return {
+        "size": size,
+        "games": agg.games,
+        "abandoned": agg.abandoned,
+        "fleets": agg.fleets,
+        "shots": agg.shots.reshape(size, size).tolist(),
+        "hits": agg.hits.reshape(size, size).tolist(),
+        "hit_ratio": [[None if np.isnan(v) else round(float(v), 4) for v in row]
+                      for row in hit_ratio.reshape(size, size)],
+        "ship_frequency": (agg.ships / max(1, agg.fleets)).reshape(size, size).round(4).tolist(),
+        "shots_to_win": shots_to_win,
+        "shots_to_win_histogram": hist[:int(counts[hist > 0][-1]) + 1].tolist() if decided else [],
+    }
+
+
+def _grid(title, rows, fmt):
+    print(title)
+    size = len(rows)
+    print("     " + "".join(f"{x:>6}" for x in range(size)))
+    for y, row in enumerate(rows):
+        print(f"{y:>4} " + "".join(f"{'-':>6}" if v is None else format(v, fmt) for v in row))
+
+
+def print_report(agg, summary):
+    print(f"{summary['games']} partidas {agg.size}x{agg.size} ({summary['abandoned']} abandonadas), "
+          f"{agg.new_matches} novas processadas em {agg.seconds:.2f} s")
+    total = max(1, sum(map(sum, summary["shots"])))
+    _grid("Tiros por célula (% do total)", [[v * 100.0 / total for v in row] for row in summary["shots"]], "6.2f")
+    _grid("Taxa de acerto por célula (%)",
+          [[None if v is None else v * 100.0 for v in row] for row in summary["hit_ratio"]], "6.1f")
+    _grid("Navios por célula (% das frotas)",
+          [[v * 100.0 for v in row] for row in summary["ship_frequency"]], "6.1f")
+    s = summary["shots_to_win"]
+    if s["games"]:
+        print(f"Tiros até vencer: média {s['mean']:.1f}, mediana {s['p50']}, p90 {s['p90']}, "
+              f"mín {s['min']}, máx {s['max']} ({s['games']} partidas)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mapas de tiros e estatísticas das partidas gravadas")
+    parser.add_argument("--dir", default=LOG_DIR, help="pasta dos logs")
+    parser.add_argument("--size", type=int, default=10, help="tamanho do tabuleiro")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: núcleos)")
+    parser.add_argument("--chunk", type=int, default=CHUNK_MATCHES, help="partidas por bloco")
+    parser.add_argument("--full", action="store_true", help="ignora o estado salvo e refaz tudo")
+    parser.add_argument("--json", help="grava o resumo completo neste arquivo")
+    args = parser.parse_args()
+
+    agg = run(args.dir, args.size, args.workers, args.chunk, args.full)
+    summary = summarize(agg)
+    print_report(agg, summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
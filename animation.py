@@ -0,0 +1,77 @@
+"""
+Linha do tempo de animações sem bloqueio.
+
+Em vez de cada efeito rodar seu próprio loop com FPSCLOCK.tick e
+display.update, os efeitos viram Animation (duração + função de desenho)
+numa Timeline que o loop principal avança uma vez por quadro. Assim
+vários efeitos se sobrepõem e eventos/rede continuam sendo tratados
+enquanto eles tocam.
+"""
+import time
+
+
+def now_ms():
+    return time.monotonic() * 1000.0
+
+
+class Animation:
+    """
+    draw(surface, progresso) desenha o quadro (progresso de 0.0 a 1.0) e
+    retorna os retângulos alterados. on_start/on_finish são opcionais.
+    """
+
+    def __init__(self, duration_ms, draw, on_start=None, on_finish=None):
+        self.duration_ms = max(duration_ms, 1)
+        self.draw = draw
+        self.on_start = on_start
+        self.on_finish = on_finish
+        self.start_ms = None
+        self.started = False
+
+
+class Timeline:
+    def __init__(self):
+        self.active = []
+        self.last_rects = []  # retângulos desenhados no último quadro
+
+    @property
+    def busy(self):
+        return bool(self.active)
+
+    def add(self, animation, delay_ms=0, start_ms=None):
+        """
+        Agenda animation para start_ms (padrão: agora) + delay_ms.
+        Retorna o fim previsto (ms), útil para encadear efeitos.
+        """
+        start = now_ms() if start_ms is None else start_ms
+        animation.start_ms = start + delay_ms
+        self.active.append(animation)
+        return animation.start_ms + animation.duration_ms
+
+    def update(self, surface, now=None):
+        """Desenha o quadro atual de cada animação ativa e descarta as que acabaram."""
+        now = now_ms() if now is None else now
+        rects = []
+        still_active = []
+        for anim in self.active:
+            if now < anim.start_ms:
+                still_active.append(anim)
+                continue
+            if not anim.started:
+                anim.started = True
+                if anim.on_start:
+                    anim.on_start()
+            progress = (now - anim.start_ms) / anim.duration_ms
+            if progress >= 1.0:
+                if anim.on_finish:
+                    anim.on_finish()
+                continue
+            rects.extend(anim.draw(surface, progress) or [])
+            still_active.append(anim)
+        self.active = still_active
+        self.last_rects = rects
+        return rects
+
+    def clear(self):
+        self.active = []
+        self.last_rects = []
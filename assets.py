@@ -0,0 +1,105 @@
+"""
+Gerenciador de imagens e sons com cache.
+
+- Imagens: carregadas uma vez, convertidas com convert_alpha() (quando já
+  há janela) e guardadas já escaladas por tamanho, para o blit não
+  converter formato nem escalar a cada explosão.
+- Sons curtos: carregados sob demanda ou por preload_sounds() numa thread
+  enquanto a tela inicial está aberta.
+- Música de fundo: tocada em streaming por pygame.mixer.music, sem
+  decodificar o arquivo inteiro na memória.
+"""
+import os
+import sys
+import threading
+
+import pygame
+
+# No executável do PyInstaller os arquivos ficam em sys._MEIPASS
+BASE_DIR = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+IMAGE_DIR = os.path.join(BASE_DIR, "assets", "images")
+SOUND_DIR = os.path.join(BASE_DIR, "assets", "sounds")
+
+EXPLOSION_FILES = [f"blowup{i}.png" for i in range(1, 7)]
+
+
+class Assets:
+    def __init__(self):
+        self._images = {}
+        self._scaled = {}
+        self._sounds = {}
+        self._lock = threading.Lock()
+        self._preload = None
+
+    # ------- Imagens -------
+    def image(self, name):
+        image = self._images.get(name)
+        if image is None:
+            image = pygame.image.load(os.path.join(IMAGE_DIR, name))
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+            self._images[name] = image
+        return image
+
+    def scaled(self, name, size):
+        """Imagem escalada para size (largura, altura), escalada uma só vez."""
+        key = (name, size)
+        image = self._scaled.get(key)
+        if image is None:
+            image = pygame.transform.scale(self.image(name), size)
+            self._scaled[key] = image
+        return image
+
+    def explosion_frames(self, size):
+        """Quadros blowup1..6 já escalados para size×size."""
+        return [self.scaled(name, (size, size)) for name in EXPLOSION_FILES]
+
+    # ------- Sons -------
+    def sound(self, name):
+        """Som carregado (ou None se o arquivo/mixer não estiver disponível)."""
+        with self._lock:
+            if name not in self._sounds:
+                path = os.path.join(SOUND_DIR, name)
+                try:
+                    self._sounds[name] = pygame.mixer.Sound(path) if os.path.exists(path) else None
+                except pygame.error:
+                    self._sounds[name] = None
+            return self._sounds[name]
+
+    def play(self, name, enabled=True):
+        if enabled:
+            sound = self.sound(name)
+            if sound is not None:
+                sound.play()
+
+    def preload_sounds(self, names):
+        """Carrega os sons numa thread em segundo plano."""
+        def load():
+            for name in names:
+                self.sound(name)
+        self._preload = threading.Thread(target=load, daemon=True)
+        self._preload.start()
+        return self._preload
+
+    # ------- Música -------
+    def play_music(self, name, volume=0.5, loops=-1):
+        """Toca name em streaming; retorna False se o arquivo não existir."""
+        path = os.path.join(SOUND_DIR, name)
+        if not os.path.exists(path):
+            return False
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.play(loops)
+        except pygame.error:
+            return False
+        return True
+
+    def stop_music(self):
+        try:
+            pygame.mixer.music.stop()
+        except pygame.error:
+            pass
+
+
+ASSETS = Assets()
@@ -0,0 +1,166 @@
+"""
+Simulador em lote (NumPy): N partidas guardadas como arrays empilhados.
+
+Cada partida é um atirador contra uma frota. A célula (x, y) é o índice
+y*size + x, o mesmo bit usado em board.Board, então os tabuleiros podem
+vir direto de Board (mesmas regras de can_place_ship, sem adjacência).
+
+BatchGame.random posiciona as frotas das N partidas de uma vez: cada navio
+sorteia uma posição de placement.legal_placements por partida e só as
+partidas em que ela colidiu sorteiam de novo. As poucas partidas que caem
+num beco sem saída usam Board.randomize_ships.
+"""
+import random
+from functools import lru_cache
+
+import numpy as np
+
+from board import Board, mask_to_cells, neighbourhood
+from game import BOARD_SIZE, fleet_lengths
+from placement import legal_placements, popcount
+
+MAX_TRIES = 100  # sorteios por navio antes de mandar a partida ao caminho lento
+
+
+@lru_cache(maxsize=None)
+def _placement_tables(size, length):
+    """
+    (células, vizinhança) de cada posição legal como índices y*size + x.
+    As linhas de vizinhança são completadas com size*size, uma coluna
+    extra de descarte no array de células bloqueadas.
+    """
+    masks = legal_placements(size, length)
+    cells = np.array([[y * size + x for x, y in mask_to_cells(m, size)] for m in masks],
+                     dtype=np.intp)
+    halos = [[y * size + x for x, y in mask_to_cells(neighbourhood(m, size), size)] for m in masks]
+    halo = np.full((len(masks), max(map(len, halos))), size * size, dtype=np.intp)
+    for k, row in enumerate(halos):
+        halo[k, :len(row)] = row
+    return cells, halo
+
+
+def random_occupancy(n, lengths, size=BOARD_SIZE, rng=None):
+    """
+    (n, size*size) índice do navio + 1 por célula para n frotas aleatórias,
+    com as regras de Board.can_place_ship e os navios na ordem de lengths.
+    rng: numpy.random.Generator.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    cells_count = size * size
+    occupancy = np.zeros((n, cells_count), dtype=np.uint8)
+    blocked = np.zeros((n, cells_count + 1), dtype=bool)
+    stuck = np.zeros(n, dtype=bool)
+    for index, length in enumerate(lengths):
+        cells, halo = _placement_tables(size, length)
+        todo = np.flatnonzero(~stuck)
+        for _ in range(MAX_TRIES):
+            if not todo.size:
+                break
+            k = rng.integers(len(cells), size=todo.size)
+            ok = ~blocked[todo[:, None], cells[k]].any(axis=1)
+            rows, k = todo[ok], k[ok]
+            occupancy[rows[:, None], cells[k]] = index + 1
+            blocked[rows[:, None], halo[k]] = True
+            todo = todo[~ok]
+        stuck[todo] = True
+    return occupancy, np.flatnonzero(stuck)
+
+
+class BatchGame:
+    """
+    Estado de N partidas:
+      - occupancy: (N, size*size) índice do navio + 1 por célula (0 = água)
+      - shots:     (N, size*size) células já atingidas por tiros
+      - remaining: (N, navios) células de cada navio ainda não atingidas
+    """
+
+    def __init__(self, occupancy, ship_sizes):
+        self.occupancy = np.ascontiguousarray(occupancy, dtype=np.uint8)
+        self.n, cells = self.occupancy.shape
+        self.size = int(round(cells ** 0.5))
+        self.ship_sizes = np.asarray(ship_sizes, dtype=np.int16)
+        self.shots = np.zeros((self.n, cells), dtype=bool)
+        self.remaining = np.tile(self.ship_sizes, (self.n, 1))
+        self.cells_left = np.full(self.n, int(self.ship_sizes.sum()), dtype=np.int16)
+        self.shots_fired = np.zeros(self.n, dtype=np.int32)
+        self.finished = np.zeros(self.n, dtype=bool)
+        self._rows = np.arange(self.n)
+
+    @classmethod
+    def from_boards(cls, boards):
+        """Cria o lote a partir de tabuleiros board.Board já posicionados."""
+        boards = list(boards)
+        occupancy = np.stack([np.frombuffer(b.owners(), dtype=np.uint8) for b in boards])
+        sizes = [popcount(mask) for mask in boards[0].ship_masks]
+        return cls(occupancy, sizes)
+
+    @classmethod
+    def random(cls, n, fleet="dez_navios", size=BOARD_SIZE, rng=None):
+        """
+        N partidas com frotas aleatórias (random_occupancy). rng pode ser
+        um numpy.random.Generator ou um random.Random.
+        """
+        if not isinstance(rng, np.random.Generator):
+            rng = np.random.default_rng((rng or random).getrandbits(64))
+        lengths = fleet_lengths(fleet)
+        occupancy, stuck = random_occupancy(n, lengths, size, rng)
+        for i in stuck:
+            board = Board(size)
+            board.randomize_ships(lengths, rng=random.Random(int(rng.integers(1 << 63))))
+            occupancy[i] = np.frombuffer(board.owners(), dtype=np.uint8)
+        return cls(occupancy, lengths)
+
+    @property
+    def available(self):
+        """(N, size*size) células onde ainda se pode atirar."""
+        return ~self.shots
+
+    def step(self, cells):
+        """
+        Um tiro por partida. cells é (N,) com índices y*size + x ou (N, 2)
+        com (x, y). Partidas encerradas e tiros repetidos são ignorados.
+        Retorna arrays booleanos (hit, sunk, finished) deste passo.
+        """
+        cells = np.asarray(cells)
+        if cells.ndim == 2:
+            cells = cells[:, 1] * self.size + cells[:, 0]
+        rows = self._rows
+        fresh = ~self.finished & ~self.shots[rows, cells]
+        self.shots[rows[fresh], cells[fresh]] = True
+        self.shots_fired += fresh
+
+        owner = self.occupancy[rows, cells]
+        hit = fresh & (owner > 0)
+        hit_rows = rows[hit]
+        ship = owner[hit].astype(np.intp) - 1
+        self.remaining[hit_rows, ship] -= 1
+        self.cells_left -= hit
+
+        sunk = np.zeros(self.n, dtype=bool)
+        sunk[hit_rows] = self.remaining[hit_rows, ship] == 0
+        finished = hit & (self.cells_left == 0)
+        self.finished |= finished
+        return hit, sunk, finished
+
+    def run(self, policy, max_steps=None):
+        """
+        Joga até todas as partidas acabarem. policy(batch) devolve as
+        células do próximo tiro (N,). Retorna shots_fired por partida.
+        """
+        max_steps = max_steps or self.shots.shape[1]
+        for _ in range(max_steps):
+            if self.finished.all():
+                break
+            self.step(policy(self))
+        return self.shots_fired
+
+
+def random_policy(rng=None):
+    """Política que atira numa célula livre aleatória de cada partida."""
+    rng = rng or np.random.default_rng()
+
+    def policy(batch):
+        scores = rng.random(batch.shots.shape)
+        scores[batch.shots] = -1.0
+        return scores.argmax(axis=1)
+    return policy
@@ -12,13 +12,22 @@ Requisitos Técnicos: listas, filas, pilhas, análise Big O, interface Pygame.
 """
 
 # pylint: disable=import-error,global-statement,too-many-positional-arguments
-import os
-import random
 import sys
-from collections import deque  # fila para turnos
 
 import pygame
-from pygame.locals import QUIT, MOUSEBUTTONUP, KEYDOWN, K_s, K_m
+from pygame.locals import QUIT, MOUSEBUTTONUP, KEYDOWN, K_s, K_m, K_ESCAPE, K_F3
+
+from ai import make_ai
+from animation import Animation, Timeline, now_ms
+from assets import ASSETS
+from board import mask_to_cells
+from event_loop import LoopDriver
+from game import Game, fleet_lengths
+from matchlog import MatchLog
+from overlay import DebugOverlay
+from profiler import PROFILER
+from render import BoardView
+from text_cache import get_font, render_text
 
 # ------- Configurações Globais -------
 FPS = 30
@@ -52,46 +61,78 @@ TEXTCOLOR  = WHITE
 TILECOLOR  = GREEN
 SHIPCOLOR  = YELLOW
 
+# Pausa antes do tiro do computador, para o jogador ver o tabuleiro trocar
+# (maior que o prazo de ai.MonteCarloAI, que pensa durante ela)
+AI_DELAY_MS = 600
+
 # Flags de áudio
 SOUND_ON = True
 MUSIC_ON = True
 
 # pré-definição de variáveis globais para o Pylint
 DISPLAYSURF = None
-FPSCLOCK     = None
+LOOP         = None
 BASICFONT    = None
 BIGFONT      = None
 NEW_SURF     = NEW_RECT     = None
 CONFIG_SURF  = CONFIG_RECT  = None
 HELP_SURF    = HELP_RECT    = None
-SHOT_SOUND   = EXPLOSION_SOUND = None
-EXPLOSION_IMAGES = None
 
 
 def main():
+    """Executa o modo local numa janela própria."""
+    play()
+    pygame.quit()
+
+
+def play(sound_on=None, music_on=None, ai=None):
+    """
+    Roda partidas locais até o jogador apertar ESC.
+    Reaproveita o pygame já inicializado (ex.: menu do main.py): só ajusta
+    o tamanho da janela, sem reabrir SDL, fontes ou sons.
+    ai: nível de ai.AI_PLAYERS para jogar contra o computador (None = dois humanos).
+    """
+    global SOUND_ON, MUSIC_ON
+    if sound_on is not None:
+        SOUND_ON = sound_on
+    if music_on is not None:
+        MUSIC_ON = music_on
+    setup()
+    try:
+        while True:
+            resultado = run_game(ai)
+            if resultado is None:
+                return
+            show_gameover_screen(*resultado)
+    finally:
+        ASSETS.stop_music()
+
+
+def setup():
     """
     Inicializa o Pygame, mixer, janela, fontes, sons e imagens.
+    Chamadas repetidas custam pouco: tudo já inicializado é reaproveitado.
     """
-    global DISPLAYSURF, FPSCLOCK, BASICFONT, BIGFONT
+    global DISPLAYSURF, LOOP, BASICFONT, BIGFONT
     global NEW_SURF, NEW_RECT, CONFIG_SURF, CONFIG_RECT, HELP_SURF, HELP_RECT
-    global SHOT_SOUND, EXPLOSION_SOUND, EXPLOSION_IMAGES
 
     pygame.init()
     pygame.font.init()
     pygame.mixer.init()
 
-    DISPLAYSURF = pygame.display.set_mode((WINDOWWIDTH, WINDOWHEIGHT))
-    FPSCLOCK    = pygame.time.Clock()
-    BASICFONT   = pygame.font.Font('freesansbold.ttf', 20)
-    BIGFONT     = pygame.font.Font('freesansbold.ttf', 50)
+    surface = pygame.display.get_surface()
+    if surface is None or surface.get_size() != (WINDOWWIDTH, WINDOWHEIGHT):
+        surface = pygame.display.set_mode((WINDOWWIDTH, WINDOWHEIGHT))
+    DISPLAYSURF = surface
+    LOOP        = LoopDriver(FPS)
+    BASICFONT   = get_font('freesansbold.ttf', 20)
+    BIGFONT     = get_font('freesansbold.ttf', 50)
     pygame.display.set_caption('Batalha Naval - Dois Jogadores')
 
-    # Música de fundo
-    bg = os.path.join('sound', 'background.wav')
-    if MUSIC_ON and os.path.exists(bg):
-        pygame.mixer.music.load(bg)
-        pygame.mixer.music.set_volume(0.5)
-        pygame.mixer.music.play(-1)
+    # Música de fundo (streaming) e efeitos sonoros em segundo plano
+    if MUSIC_ON:
+        ASSETS.play_music('background.wav')
+    ASSETS.preload_sounds(['pew.wav', 'boom.wav'])
 
     # Botões
     NEW_SURF    = BASICFONT.render('NOVO JOGO', True, TEXTCOLOR)
@@ -101,17 +142,8 @@ def main():
     HELP_SURF   = BASICFONT.render('AJUDA', True, TEXTCOLOR)
     HELP_RECT   = HELP_SURF.get_rect(topleft=(CONFIG_RECT.left - HELP_SURF.get_width() - 20, 10))
 
-    # Efeitos sonoros
-    SHOT_SOUND = pygame.mixer.Sound(os.path.join('assets', 'sounds', 'pew.wav'))
-    EXPLOSION_SOUND = pygame.mixer.Sound(os.path.join('assets', 'sounds', 'boom.wav'))
-
-    # Imagens de explosão
-    EXPLOSION_IMAGES = [pygame.image.load(f'assets/images/blowup{i}.png') for i in range(1, 7)]
-
-    # Loop principal
-    while True:
-        vencedor, tiros = run_game()
-        show_gameover_screen(vencedor, tiros)
+    # Imagens de explosão: convertidas e escaladas uma vez
+    ASSETS.explosion_frames(TILESIZE + 10)
 
 
 def show_settings_screen():
@@ -211,141 +243,175 @@ def show_settings_screen():  # pylint: disable=global-statement
                 return  # sai das configurações
 
 
-def run_game():  # pylint: disable=too-many-locals,too-many-branches,too-many-statements
+def run_game(ai=None):  # pylint: disable=too-many-branches,too-many-statements
     """
-    Loop principal para dois jogadores.
-    Usa lista (players), fila (turn_queue) e pilha (action_stack).
-    Retorna (vencedor, tiros). Complexidades:
+    Loop principal para dois jogadores, desenhado a partir de game.Game.
+    O núcleo usa lista (players), fila (turn_queue) e pilha (action_stack).
+    Com ai, o segundo jogador é o computador e entra na mesma fila de turnos.
+    A partida (frotas e tiros) é gravada no matchlog ao terminar.
+    Retorna (vencedor, tiros), ou None se o jogador apertar ESC. Complexidades:
       - deque.rotate(): O(1)
       - append/pop: O(1)
-      - vitória varre 10×10: O(n²)
+      - vitória e navio afundado (bitboards): O(1)
     """
-    players     = ['Jogador 1', 'Jogador 2']
-    turn_queue  = deque(players)
-    action_stack = []
-
-    boards   = {p: generate_default_tiles(None)  for p in players}
-    revealed = {p: generate_default_tiles(False) for p in players}
-    ship_list = [
-        'battleship','cruiser1','cruiser2',
-        'destroyer1','destroyer2','destroyer3',
-        'submarine1','submarine2','submarine3','submarine4'
-    ]
-    for p in players:
-        boards[p] = add_ships_to_board(boards[p], ship_list)
-
-    ship_positions = {p: {} for p in players}
-    for p in players:
-        for sh in ship_list:
-            ship_positions[p][sh] = [
-                (x, y)
-                for x in range(BOARDWIDTH)
-                for y in range(BOARDHEIGHT)
-                if boards[p][x][y] == sh
-            ]
-
-    tiros    = 0
-    xmarkers = {p: set_markers(boards[p])[0] for p in players}
-    ymarkers = {p: set_markers(boards[p])[1] for p in players}
+    players = ['Jogador 1', 'Computador' if ai else 'Jogador 2']
+    game = Game(players=players, fleet='dez_navios')
+    ship_list = [name for name, _ in game.fleet]
+    for p in game.players:
+        add_ships_to_board(game.boards[p], ship_list)
+    bots = {'Computador': make_ai(ai, fleet_lengths(game.fleet), game.size)} if ai else {}
+    record = MatchLog().recorder('ai' if ai else 'local', game.size)
+    for i, p in enumerate(game.players):
+        record.fleet_from_board(i, game.boards[p])
+
+    xmarkers = {p: set_markers(game.boards[p])[0] for p in game.players}
+    ymarkers = {p: set_markers(game.boards[p])[1] for p in game.players}
+    views    = {p: make_board_view(game.boards[p]) for p in game.players}
+    timeline = Timeline()
+    target   = game.opponent  # tabuleiro na tela
+    shown    = False          # False força a tela inteira no próximo quadro
+    bot_at   = None           # instante (ms) do próximo tiro do computador
+    overlay  = DebugOverlay((WINDOWWIDTH - 260, WINDOWHEIGHT - 130), width=250, background=BGCOLOR)
+
+    def fire(cell):
+        """Tiro do jogador da vez, com as animações encadeadas."""
+        board = game.boards[game.opponent]
+        end = timeline.add(reveal_tile_animation(board, [cell]))
+        shot = game.shoot(cell)
+        record.shot(players.index(shot.player), cell, shot.hit, shot.sunk)
+        if shot.hit:
+            explosion = blowup_animation(left_top_coords_tile(*cell))
+            end = timeline.add(explosion, start_ms=end)
+            if shot.sunk:
+                timeline.add(highlight_sunk_ship(shot.sunk), start_ms=end)
+        return shot
 
     while True:
-        current  = turn_queue[0]
-        opponent = turn_queue[1]
-
-        DISPLAYSURF.fill(BGCOLOR)
-        DISPLAYSURF.blit(NEW_SURF,    NEW_RECT)
-        DISPLAYSURF.blit(CONFIG_SURF, CONFIG_RECT)
-        DISPLAYSURF.blit(HELP_SURF,   HELP_RECT)
-        draw_status(current, tiros)
-        draw_board(boards[opponent], revealed[opponent])
-        draw_markers(xmarkers[opponent], ymarkers[opponent])
-        pygame.display.update()
-        FPSCLOCK.tick(FPS)
-
+        PROFILER.frame()
+        # O tabuleiro só troca (e a vitória só aparece) quando os efeitos acabam
+        if not timeline.busy:
+            if game.winner:
+                record.finish(players.index(game.winner))
+                return game.winner, game.shots
+            if target != game.opponent:
+                target = game.opponent
+                shown = False
+            bot = bots.get(game.current)
+            if bot is not None and bot_at is None:
+                bot_at = now_ms() + AI_DELAY_MS
+                bot.start_turn()  # pensa em segundo plano durante a pausa
+            elif bot is not None and now_ms() >= bot_at:
+                bot_at = None
+                ASSETS.play('pew.wav', SOUND_ON)
+                bot.observe(fire(bot.choose()))
+                shown = False
+
+        with PROFILER.section('draw'):
+            # Limpa o que as animações desenharam no quadro anterior
+            dirty = list(timeline.last_rects)
+            for rect in dirty:
+                DISPLAYSURF.fill(BGCOLOR, rect)
+            if not shown:
+                shown = True
+                DISPLAYSURF.fill(BGCOLOR)
+                DISPLAYSURF.blit(NEW_SURF,    NEW_RECT)
+                DISPLAYSURF.blit(CONFIG_SURF, CONFIG_RECT)
+                DISPLAYSURF.blit(HELP_SURF,   HELP_RECT)
+                draw_status(game.current if target == game.opponent else game.opponent, game.shots)
+                views[target].invalidate()
+                overlay.invalidate()
+                draw_board(game.boards[target], views[target])
+                draw_markers(xmarkers[target], ymarkers[target])
+                dirty = [DISPLAYSURF.get_rect()]
+            else:
+                if timeline.busy:
+                    views[target].invalidate()
+                dirty += draw_board(game.boards[target], views[target])
+            dirty += timeline.update(DISPLAYSURF)
+            dirty += overlay.draw(DISPLAYSURF)
+        if dirty:
+            with PROFILER.section('flip'):
+                pygame.display.update(dirty)
+
+        # FPS fixo só com animação tocando; parado, dorme até o próximo evento
         mx = my = None
         clicked = False
-        for e in pygame.event.get():
-            if e.type == QUIT:
-                pygame.quit()
-                sys.exit()
-            if e.type == MOUSEBUTTONUP:
-                if NEW_RECT.collidepoint(e.pos):
-                    return run_game()
-                if CONFIG_RECT.collidepoint(e.pos):
-                    show_settings_screen()
-                if HELP_RECT.collidepoint(e.pos):
-                    show_help_screen()
-                mx, my = e.pos
-                clicked = True
-
-        if clicked and mx is not None:
+        events = LOOP.events(busy=timeline.busy or bot_at is not None)
+        with PROFILER.section('events'):
+            for e in events:
+                if e.type == QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if e.type == KEYDOWN and e.key == K_ESCAPE:
+                    record.finish()
+                    return None
+                if e.type == KEYDOWN and e.key == K_F3:
+                    PROFILER.toggle()
+                if e.type == MOUSEBUTTONUP:
+                    if NEW_RECT.collidepoint(e.pos):
+                        record.finish()
+                        return run_game(ai)
+                    if CONFIG_RECT.collidepoint(e.pos):
+                        show_settings_screen()
+                        shown = False
+                    if HELP_RECT.collidepoint(e.pos):
+                        show_help_screen()
+                        shown = False
+                    mx, my = e.pos
+                    clicked = True
+
+        human = game.current not in bots
+        if clicked and human and mx is not None and target == game.opponent:
             tx, ty = get_tile_at_pixel(mx, my)
-            if tx is not None and not revealed[opponent][tx][ty]:
-                if SOUND_ON:
-                    SHOT_SOUND.play()
-                action_stack.append((current, opponent, (tx, ty)))
-                reveal_tile_animation(boards[opponent], [(tx, ty)])
-                revealed[opponent][tx][ty] = True
-                tiros += 1
-                if check_revealed_tile(boards[opponent], [(tx, ty)]):
-                    if SOUND_ON:
-                        EXPLOSION_SOUND.play()
-                    blowup_animation(left_top_coords_tile(tx, ty))
-                    ship = boards[opponent][tx][ty]
-                    if all(revealed[opponent][x][y] for x, y in ship_positions[opponent][ship]):
-                        highlight_sunk_ship(ship_positions[opponent][ship])
-                    if check_for_win(boards[opponent], revealed[opponent]):
-                        return current, tiros
-                turn_queue.rotate(-1)
+            if tx is not None and game.can_shoot((tx, ty)):
+                ASSETS.play('pew.wav', SOUND_ON)
+                fire((tx, ty))
+                shown = False  # status (vez/tiros) mudou
 
 
 def highlight_sunk_ship(coords):
-    """Destaca navio afundado com borda vermelha."""
-    for x, y in coords:
-        left, top = left_top_coords_tile(x, y)
-        pygame.draw.rect(DISPLAYSURF, RED, (left, top, TILESIZE, TILESIZE), 3)
-    pygame.display.update()
-    pygame.time.delay(500)
+    """Animação: destaca navio afundado com borda vermelha por 500 ms."""
+    def draw(surface, _progress):
+        rects = []
+        for x, y in coords:
+            left, top = left_top_coords_tile(x, y)
+            rects.append(pygame.draw.rect(surface, RED, (left, top, TILESIZE, TILESIZE), 3))
+        return rects
+    return Animation(500, draw)
 
 
 def draw_status(player, tiros):
     """Desenha texto com jogador atual e tiros efetuados."""
     text = f'Vez: {player}   Tiros: {tiros}'
-    surf = BASICFONT.render(text, True, TEXTCOLOR)
+    surf = render_text(text, TEXTCOLOR, BASICFONT)
     DISPLAYSURF.blit(surf, (10, 10))
 
 
 def show_help_screen():
     """Exibe tela de ajuda até o usuário pressionar qualquer tecla ou fechar."""
-    while True:
-        DISPLAYSURF.fill(BGCOLOR)
-        msgs = [
-            '• Para atirar: clique em uma célula do tabuleiro adversário.',
-            '• Contador de tiros: canto superior esquerdo.',
-            '• Acertos disparam explosão; erros revelam água.',
-            '• Turno alterna automaticamente após cada tiro.',
-            '• Pressione qualquer tecla para voltar.'
-        ]
-        panel_w = WINDOWWIDTH - 2 * XMARGIN
-        panel_h = len(msgs) * (TEXT_HEIGHT * 2) + 40
-        panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
-        panel.fill((0, 0, 0, 200))
-        rect = panel.get_rect(center=(WINDOWWIDTH//2, WINDOWHEIGHT//2))
-        DISPLAYSURF.blit(panel, rect)
-        margin_x = rect.left + 20
-        margin_y = rect.top + 20
-        for i, line in enumerate(msgs):
-            surf, r = make_text_objs(line, BASICFONT, TEXTCOLOR)
-            r.topleft = (margin_x, margin_y + i * (TEXT_HEIGHT * 2))
-            DISPLAYSURF.blit(surf, r)
-        pygame.display.update()
-
-        ev = pygame.event.wait()
-        if ev.type == QUIT:
-            pygame.quit()
-            sys.exit()
-        if ev.type in (KEYDOWN, MOUSEBUTTONUP):
-            return
+    DISPLAYSURF.fill(BGCOLOR)
+    msgs = [
+        '• Para atirar: clique em uma célula do tabuleiro adversário.',
+        '• Contador de tiros: canto superior esquerdo.',
+        '• Acertos disparam explosão; erros revelam água.',
+        '• Turno alterna automaticamente após cada tiro.',
+        '• ESC encerra o jogo local; F3 mostra tempos de quadro.',
+        '• Pressione qualquer tecla para voltar.'
+    ]
+    panel_w = WINDOWWIDTH - 2 * XMARGIN
+    panel_h = len(msgs) * (TEXT_HEIGHT * 2) + 40
+    panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
+    panel.fill((0, 0, 0, 200))
+    rect = panel.get_rect(center=(WINDOWWIDTH//2, WINDOWHEIGHT//2))
+    DISPLAYSURF.blit(panel, rect)
+    margin_x = rect.left + 20
+    margin_y = rect.top + 20
+    for i, line in enumerate(msgs):
+        surf, r = make_text_objs(line, BASICFONT, TEXTCOLOR)
+        r.topleft = (margin_x, margin_y + i * (TEXT_HEIGHT * 2))
+        DISPLAYSURF.blit(surf, r)
+    pygame.display.update()
+    wait_for_key()
 
 
 def show_gameover_screen(vencedor, tiros):
@@ -362,81 +428,77 @@ def show_gameover_screen(vencedor, tiros):
     wait_for_key()
 
 
-def generate_default_tiles(val):
-    """Gera uma matriz BOARDWIDTH×BOARDHEIGHT preenchida com val."""
-    return [[val] * BOARDHEIGHT for _ in range(BOARDWIDTH)]
+def blowup_animation(coord):
+    """Animação: sequência de frames de explosão em coord (EXPLOSIONSPEED frames/s)."""
+    frames = ASSETS.explosion_frames(TILESIZE + 10)
 
+    def draw(surface, progress):
+        frame = frames[min(int(progress * len(frames)), len(frames) - 1)]
+        return [surface.blit(frame, coord)]
 
-def blowup_animation(coord):
-    """Executa sequência de frames de explosão em coord."""
-    for img in EXPLOSION_IMAGES:
-        frame = pygame.transform.scale(img, (TILESIZE + 10, TILESIZE + 10))
-        DISPLAYSURF.blit(frame, coord)
-        pygame.display.flip()
-        FPSCLOCK.tick(EXPLOSIONSPEED)
+    def boom():
+        ASSETS.play('boom.wav', SOUND_ON)
+
+    return Animation(len(frames) * 1000 // EXPLOSIONSPEED, draw, on_start=boom)
 
 
 def reveal_tile_animation(board, coords):
-    """Anima progressivamente a remoção da cobertura do tile."""
-    for cov in range(TILESIZE, -REVEALSPEED - 1, -REVEALSPEED):
-        draw_tile_covers(board, coords, cov)
+    """Animação: remove progressivamente a cobertura do tile."""
+    steps = len(range(TILESIZE, -REVEALSPEED - 1, -REVEALSPEED))
+
+    def draw(_surface, progress):
+        cov = TILESIZE - int(progress * steps) * REVEALSPEED
+        return [draw_tile_covers(board, coords, cov)]
+
+    return Animation(steps * 1000 // FPS, draw)
 
 
 def draw_tile_covers(board, coords, cov):
-    """Desenha a cobertura e revela o conteúdo atrás."""
+    """Desenha a cobertura e revela o conteúdo atrás. Retorna o retângulo do tile."""
     lx, ly = left_top_coords_tile(coords[0][0], coords[0][1])
     clr = SHIPCOLOR if check_revealed_tile(board, coords) else BGCOLOR
-    pygame.draw.rect(DISPLAYSURF, clr, (lx, ly, TILESIZE, TILESIZE))
+    rect = pygame.draw.rect(DISPLAYSURF, clr, (lx, ly, TILESIZE, TILESIZE))
     if cov > 0:
         pygame.draw.rect(DISPLAYSURF, TILECOLOR, (lx, ly, cov, TILESIZE))
-    pygame.display.update()
-    FPSCLOCK.tick(FPS)
+    return rect
 
 
 def check_revealed_tile(board, tile):
     """Retorna True se há navio em tile."""
-    return board[tile[0][0]][tile[0][1]] is not None
-
-
-def check_for_win(board, rev):
-    """Verifica condição de vitória (todas as partes reveladas)."""
-    for x in range(BOARDWIDTH):
-        for y in range(BOARDHEIGHT):
-            if board[x][y] is not None and not rev[x][y]:
-                return False
-    return True
-
-
-def draw_board(board, rev):
-    """Desenha os tiles do tabuleiro (água ou navio)."""
-    for x in range(BOARDWIDTH):
-        for y in range(BOARDHEIGHT):
-            lx, ly = left_top_coords_tile(x, y)
-            color = TILECOLOR if not rev[x][y] else (SHIPCOLOR if board[x][y] else BGCOLOR)
-            pygame.draw.rect(DISPLAYSURF, color, (lx, ly, TILESIZE, TILESIZE))
-    for i in range(BOARDWIDTH + 1):
-        pygame.draw.line(
-            DISPLAYSURF, DARKGRAY,
-            (XMARGIN + MARKERSIZE + i * TILESIZE, YMARGIN + MARKERSIZE),
-            (XMARGIN + MARKERSIZE + i * TILESIZE, WINDOWHEIGHT - YMARGIN)
-        )
-    for i in range(BOARDHEIGHT + 1):
-        pygame.draw.line(
-            DISPLAYSURF, DARKGRAY,
-            (XMARGIN + MARKERSIZE, YMARGIN + MARKERSIZE + i * TILESIZE),
-            (WINDOWWIDTH - (DISPLAYWIDTH + MARKERSIZE * 2), YMARGIN + MARKERSIZE + i * TILESIZE)
-        )
+    return board.has_ship(tile[0])
+
+
+def check_for_win(board):
+    """Verifica condição de vitória (todas as partes atingidas)."""
+    return board.all_ships_sunk()
+
+
+def draw_tile(surface, rect, value):
+    """Desenha um tile: coberto, navio atingido ('X') ou água revelada ('O')."""
+    color = SHIPCOLOR if value == 'X' else BGCOLOR if value == 'O' else TILECOLOR
+    pygame.draw.rect(surface, color, rect)
+    pygame.draw.rect(surface, DARKGRAY, (rect.left, rect.top, TILESIZE + 1, TILESIZE + 1), 1)
+
+
+def make_board_view(board):
+    """Camada com a grade coberta em cache, na posição do tabuleiro na tela."""
+    return BoardView(board, *left_top_coords_tile(0, 0), cell_size=TILESIZE, cell_drawer=draw_tile)
+
+
+def draw_board(board, view=None):
+    """Desenha os tiles do tabuleiro (coberto, água ou navio).
+    Com view, só redesenha o que mudou. Retorna os retângulos sujos."""
+    view = view or make_board_view(board)
+    return view.draw(DISPLAYSURF)
 
 
 def set_markers(board):
     """Conta quantas partes de navio em cada coluna e linha."""
     xm = [0] * BOARDWIDTH
     ym = [0] * BOARDHEIGHT
-    for x in range(BOARDWIDTH):
-        for y in range(BOARDHEIGHT):
-            if board[x][y] is not None:
-                xm[x] += 1
-                ym[y] += 1
+    for x, y in mask_to_cells(board.fleet, board.size):
+        xm[x] += 1
+        ym[y] += 1
     return xm, ym
 
 
@@ -458,57 +520,20 @@ def draw_markers(xlist, ylist):
         DISPLAYSURF.blit(surf, rect)
 
 
+def ship_length(ship):
+    """Tamanho do navio a partir do nome (battleship, cruiser...)."""
+    return (
+        4 if 'battleship' in ship else
+        3 if 'cruiser' in ship else
+        2 if 'destroyer' in ship else
+        1
+    )
+
+
 def add_ships_to_board(board, ships):
     """Posiciona cada navio aleatoriamente sem colisões ou adjacências."""
-    nb = [row[:] for row in board]
-    for sh in ships:
-        length = (
-            4 if 'battleship' in sh else
-            3 if 'cruiser' in sh else
-            2 if 'destroyer' in sh else
-            1
-        )
-        placed = False
-        while not placed:
-            xs = random.randint(0, BOARDWIDTH - 1)
-            ys = random.randint(0, BOARDHEIGHT - 1)
-            hor = random.choice([True, False])
-            valid, coords = make_ship_position(nb, xs, ys, hor, length, sh)
-            if valid:
-                for cx, cy in coords:
-                    nb[cx][cy] = sh
-                placed = True
-    return nb
-
-
-def make_ship_position(  # pylint: disable=too-many-arguments,too-many-locals
-    board, x, y, hor, length, ship
-):
-    """Calcula e retorna as coordenadas se o navio couber sem conflito."""
-    coords = []
-    for i in range(length):
-        nx = x + i if hor else x
-        ny = y if hor else y + i
-        if (
-            nx >= BOARDWIDTH or
-            ny >= BOARDHEIGHT or
-            board[nx][ny] is not None or
-            has_adjacent(board, nx, ny, ship)
-        ):
-            return False, []
-        coords.append((nx, ny))
-    return True, coords
-
-
-def has_adjacent(board, x, y, ship):
-    """Verifica 8 direções para evitar adjacência indevida."""
-    for dx in (-1, 0, 1):
-        for dy in (-1, 0, 1):
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < BOARDWIDTH and 0 <= ny < BOARDHEIGHT:
-                if board[nx][ny] not in (ship, None):
-                    return True
-    return False
+    board.randomize_ships([ship_length(sh) for sh in ships])
+    return board
 
 
 def left_top_coords_tile(tx, ty):
@@ -530,15 +555,18 @@ def get_tile_at_pixel(x, y):
 
 
 def make_text_objs(text, font, color):
-    """Gera Surface e Rect para renderizar texto na tela."""
-    surf = font.render(text, True, color)
+    """Gera Surface (do cache de textos) e Rect para renderizar texto na tela."""
+    surf = render_text(text, color, font)
     return surf, surf.get_rect()
 
 
 def wait_for_key():
-    """Aguarda qualquer tecla ou clique para continuar."""
+    """Aguarda qualquer tecla ou clique para continuar (dormindo entre eventos)."""
     while True:
-        for e in pygame.event.get():
+        for e in LOOP.events():
+            if e.type == QUIT:
+                pygame.quit()
+                sys.exit()
             if e.type in (KEYDOWN, MOUSEBUTTONUP):
                 return
 
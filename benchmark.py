@@ -0,0 +1,358 @@
+"""
+Benchmarks dos caminhos quentes: regras, sorteio de frotas, rede e desenho.
+
+Cada benchmark tem um preparo (fora do tempo medido) e um trecho medido
+que faz ops operações; o trecho roda --repeat vezes com semente fixa e o
+resultado guarda o melhor tempo e a mediana por operação. A saída em
+JSON (--json) serve para comparar versões (--compare anterior.json).
+O desenho roda com SDL_VIDEODRIVER=dummy, sem abrir janela.
+
+Execução:
+    python benchmark.py [--repeat 5] [--only network] [--json saida.json]
+                        [--compare anterior.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# pylint: disable=wrong-import-position
+from board import Board
+from game import FLEETS, fleet_lengths
+
+SEED = 1234
+LENGTHS = fleet_lengths("dez_navios")
+CELLS = [(x, y) for y in range(10) for x in range(10)]
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Registra fn(), que retorna (preparo, trecho medido, ops por execução)."""
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+def _boards(n, rng):
+    boards = []
+    for _ in range(n):
+        board = Board()
+        board.randomize_ships(LENGTHS, rng=rng)
+        boards.append(board)
+    return boards
+
+
+# ------- Regras (board.py) -------
+@benchmark("board.receive_attack+all_ships_sunk")
+def bench_receive_attack():
+    def prepare():
+        rng = random.Random(SEED)
+        return [(board, rng.sample(CELLS, len(CELLS))) for board in _boards(100, rng)]
+
+    def run(state):
+        for board, cells in state:
+            for cell in cells:
+                board.receive_attack(cell)
+                if board.all_ships_sunk():
+                    break
+    return prepare, run, 100 * len(CELLS)
+
+
+@benchmark("board.all_ships_sunk")
+def bench_all_ships_sunk():
+    def prepare():
+        return _boards(100, random.Random(SEED))
+
+    def run(boards):
+        for _ in range(100):
+            for board in boards:
+                board.all_ships_sunk()
+    return prepare, run, 100 * 100
+
+
+@benchmark("board.randomize_ships")
+def bench_randomize_ships():
+    def prepare():
+        return random.Random(SEED), [Board() for _ in range(200)]
+
+    def run(state):
+        rng, boards = state
+        for board in boards:
+            board.randomize_ships(LENGTHS, rng=rng)
+    return prepare, run, 200
+
+
+# ------- Funções do modo local (battleship.py) -------
+def _battleship():
+    """Importa battleship e abre a janela dummy uma vez (saída do pygame omitida)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        import battleship  # pylint: disable=import-outside-toplevel
+        if battleship.DISPLAYSURF is None:
+            battleship.MUSIC_ON = False
+            battleship.setup()
+    return battleship
+
+
+@benchmark("battleship.add_ships_to_board")
+def bench_add_ships_to_board():
+    bs = _battleship()
+    names = [name for name, _ in FLEETS["dez_navios"]]
+
+    def prepare():
+        random.seed(SEED)
+        return [Board() for _ in range(200)]
+
+    def run(boards):
+        for board in boards:
+            bs.add_ships_to_board(board, names)
+    return prepare, run, 200
+
+
+@benchmark("battleship.check_for_win")
+def bench_check_for_win():
+    bs = _battleship()
+
+    def prepare():
+        return _boards(100, random.Random(SEED))
+
+    def run(boards):
+        for _ in range(100):
+            for board in boards:
+                bs.check_for_win(board)
+    return prepare, run, 100 * 100
+
+
+@benchmark("battleship.set_markers")
+def bench_set_markers():
+    bs = _battleship()
+
+    def prepare():
+        return _boards(100, random.Random(SEED))
+
+    def run(boards):
+        for _ in range(10):
+            for board in boards:
+                bs.set_markers(board)
+    return prepare, run, 10 * 100
+
+
+# ------- Rede (network.py) -------
+def _roundtrip(codec, messages=500):
+    from network import NetworkClient, NetworkServer  # pylint: disable=import-outside-toplevel
+
+    def prepare():
+        with contextlib.redirect_stdout(io.StringIO()):
+            server = NetworkServer(host="127.0.0.1", port=0)
+            port = server.sock.getsockname()[1]
+            accept = threading.Thread(target=server.accept)
+            accept.start()
+            client = NetworkClient(host="127.0.0.1", port=port)
+            accept.join()
+        server.codec = client.codec = codec
+
+        def echo():
+            try:
+                while True:
+                    data = server.receive()
+                    if data is None:
+                        return
+                    server.send({"action": "result", "hit": data["cell"][0] % 2 == 0,
+                                 "sunk": None, "over": False})
+            except OSError:
+                pass  # socket fechado ao fim da medição
+        threading.Thread(target=echo, daemon=True).start()
+        return server, client
+
+    def run(state):
+        server, client = state
+        try:
+            for i in range(messages):
+                client.send({"action": "attack", "cell": (i % 10, i // 10 % 10)})
+                client.receive()
+        finally:
+            client.close()
+            server.close()
+    return prepare, run, messages
+
+
+@benchmark("network.roundtrip.json")
+def bench_roundtrip_json():
+    return _roundtrip("json")
+
+
+@benchmark("network.roundtrip.bin1")
+def bench_roundtrip_bin1():
+    return _roundtrip("bin1")
+
+
+# ------- Desenho (render.py / battleship.py) -------
+def _shot_boards(rng):
+    boards = _boards(20, rng)
+    for board in boards:
+        for cell in rng.sample(CELLS, 40):
+            board.receive_attack(cell)
+    return boards
+
+
+@benchmark("render.BoardView.draw.full")
+def bench_boardview_full():
+    import pygame  # pylint: disable=import-outside-toplevel
+    from render import BoardView  # pylint: disable=import-outside-toplevel
+    bs = _battleship()
+
+    def prepare():
+        return [BoardView(board, 50, 50, reveal=True) for board in _shot_boards(random.Random(SEED))]
+
+    def run(views):
+        for view in views:
+            view.invalidate()
+            view.draw(bs.DISPLAYSURF)
+        pygame.display.update()
+    return prepare, run, 20
+
+
+@benchmark("render.BoardView.draw.one_shot")
+def bench_boardview_incremental():
+    from render import BoardView  # pylint: disable=import-outside-toplevel
+    bs = _battleship()
+
+    def prepare():
+        rng = random.Random(SEED)
+        state = []
+        for board in _shot_boards(rng):
+            view = BoardView(board, 50, 50, reveal=True)
+            view.draw(bs.DISPLAYSURF)
+            free = [c for c in CELLS if not board.was_shot(c)]
+            state.append((view, board, rng.sample(free, 20)))
+        return state
+
+    def run(state):
+        for view, board, cells in state:
+            for cell in cells:
+                board.receive_attack(cell)
+                view.draw(bs.DISPLAYSURF)
+    return prepare, run, 20 * 20
+
+
+@benchmark("battleship.draw_board.full")
+def bench_draw_board_full():
+    import pygame  # pylint: disable=import-outside-toplevel
+    bs = _battleship()
+
+    def prepare():
+        return _shot_boards(random.Random(SEED))
+
+    def run(boards):
+        for board in boards:
+            bs.draw_board(board)
+        pygame.display.update()
+    return prepare, run, 20
+
+
+@benchmark("battleship.draw_board.cached")
+def bench_draw_board_cached():
+    bs = _battleship()
+
+    def prepare():
+        boards = _shot_boards(random.Random(SEED))
+        views = [bs.make_board_view(board) for board in boards]
+        for board, view in zip(boards, views):
+            bs.draw_board(board, view)
+        return list(zip(boards, views))
+
+    def run(state):
+        for _ in range(10):
+            for board, view in state:
+                bs.draw_board(board, view)
+    return prepare, run, 10 * 20
+
+
+# ------- Execução -------
+def measure(name, repeat):
+    prepare, run, ops = BENCHMARKS[name]()
+    times = []
+    for _ in range(repeat):
+        state = prepare()
+        start = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    median = statistics.median(times)
+    return {
+        "ops": ops,
+        "repeat": repeat,
+        "best_us_per_op": best / ops * 1e6,
+        "median_us_per_op": median / ops * 1e6,
+        "ops_per_sec": ops / median,
+    }
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata():
+    try:
+        import pygame  # pylint: disable=import-outside-toplevel
+        pygame_version = pygame.version.ver
+    except ImportError:
+        pygame_version = None
+    return {
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "pygame": pygame_version,
+        "seed": SEED,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks da Batalha Naval")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="roda só os benchmarks cujo nome contém este texto")
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args()
+
+    previous = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)["results"]
+
+    results = {}
+    for name in BENCHMARKS:
+        if args.only and args.only not in name:
+            continue
+        results[name] = r = measure(name, args.repeat)
+        line = f"{name:<40}{r['median_us_per_op']:>12.2f} µs/op{r['ops_per_sec']:>14,.0f} op/s"
+        if name in previous:
+            change = r["median_us_per_op"] / previous[name]["median_us_per_op"] - 1
+            line += f"  {change:+.1%}"
+        print(line)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"meta": metadata(), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,80 +1,206 @@
 import random
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _masks(size):
+    """Máscaras fixas de um tabuleiro size×size (bit de (x, y) = y*size + x)."""
+    full = (1 << (size * size)) - 1
+    col0 = sum(1 << (y * size) for y in range(size))
+    not_first_col = full & ~col0
+    not_last_col = full & ~(col0 << (size - 1))
+    return full, not_first_col, not_last_col
+
+
+@lru_cache(maxsize=None)
+def _vertical_unit(size, length):
+    """Bits de um navio vertical de tamanho length começando no bit 0."""
+    return sum(1 << (i * size) for i in range(length))
+
+
+def ship_mask(size, x, y, length, horizontal):
+    """Bitmask das células de um navio, ou 0 se sair do tabuleiro."""
+    if x < 0 or y < 0:
+        return 0
+    if horizontal:
+        if x + length > size or y >= size:
+            return 0
+        return ((1 << length) - 1) << (y * size + x)
+    if y + length > size or x >= size:
+        return 0
+    return _vertical_unit(size, length) << (y * size + x)
+
+
+def neighbourhood(mask, size):
+    """Dilata mask para as 8 direções (a própria máscara incluída)."""
+    full, not_first_col, not_last_col = _masks(size)
+    row = mask | ((mask & not_last_col) << 1) | ((mask & not_first_col) >> 1)
+    return (row | (row << size) | (row >> size)) & full
+
+
+def mask_to_cells(mask, size):
+    """Lista de (x, y) dos bits ligados em mask."""
+    cells = []
+    while mask:
+        low = mask & -mask
+        pos = low.bit_length() - 1
+        cells.append((pos % size, pos // size))
+        mask ^= low
+    return cells
+
 
 class Board:
-    def __init__(self):
-        self.size = 10
-        self.grid = [["~"] * self.size for _ in range(self.size)]
-        self.ships = []  # lista de sets de coordenadas
-        self.hits = set()
-        self.misses = set()
+    """
+    Tabuleiro guardado em bitboards: cada célula (x, y) é o bit y*size + x
+    de um inteiro. Navios, acertos e erros são máscaras, então acerto,
+    navio afundado e frota afundada são checados em O(1) operações.
+    """
+
+    __slots__ = ("size", "fleet", "ship_masks", "hit_mask", "miss_mask",
+                 "sunk_mask", "_halo", "_owner")
+
+    def __init__(self, size=10):
+        self.size = size
+        self.fleet = 0          # células ocupadas por navios
+        self.ship_masks = []    # uma máscara por navio
+        self.hit_mask = 0
+        self.miss_mask = 0
+        self.sunk_mask = 0      # bit i ligado = navio i afundado
+        self._halo = 0          # navios + vizinhança (regra de não adjacência)
+        self._owner = bytearray(size * size)  # índice do navio + 1 por célula
+
+    def _bit(self, cell):
+        x, y = cell
+        return 1 << (int(y) * self.size + int(x))
+
+    # ------- Compatibilidade com a grade de strings -------
+    @property
+    def ships(self):
+        return [set(mask_to_cells(m, self.size)) for m in self.ship_masks]
 
+    @property
+    def hits(self):
+        return set(mask_to_cells(self.hit_mask, self.size))
+
+    @property
+    def misses(self):
+        return set(mask_to_cells(self.miss_mask, self.size))
+
+    @property
+    def grid(self):
+        return [[self.cell_value(x, y) for x in range(self.size)] for y in range(self.size)]
+
+    def cell_value(self, x, y):
+        """Símbolo da célula: '~' água, 'N' navio, 'X' acerto, 'O' erro."""
+        bit = 1 << (int(y) * self.size + int(x))
+        if self.hit_mask & bit:
+            return "X"
+        if self.miss_mask & bit:
+            return "O"
+        if self.fleet & bit:
+            return "N"
+        return "~"
+
+    # ------- Consultas O(1) -------
+    def has_ship(self, cell):
+        return bool(self.fleet & self._bit(cell))
+
+    def was_shot(self, cell):
+        return bool((self.hit_mask | self.miss_mask) & self._bit(cell))
+
+    def ship_at(self, cell):
+        """Índice do navio em cell, ou None se for água."""
+        x, y = cell
+        owner = self._owner[int(y) * self.size + int(x)]
+        return owner - 1 if owner else None
+
+    def owners(self):
+        """Índice do navio + 1 de cada célula (0 = água), em bytes na ordem dos bits."""
+        return bytes(self._owner)
+
+    def is_sunk(self, index):
+        return bool(self.sunk_mask >> index & 1)
+
+    def sunk_ship_at(self, cell):
+        """Coordenadas do navio em cell se ele já afundou, senão None."""
+        index = self.ship_at(cell)
+        if index is None or not self.is_sunk(index):
+            return None
+        return mask_to_cells(self.ship_masks[index], self.size)
+
+    # ------- API do jogo -------
     def place_ship(self, positions):
-        self.ships.append(set(positions))
+        mask = 0
         for x, y in positions:
-            self.grid[y][x] = "N"
+            mask |= 1 << (int(y) * self.size + int(x))
+        self._place_mask(mask)
+
+    def _place_mask(self, mask):
+        index = len(self.ship_masks)
+        self.ship_masks.append(mask)
+        self.fleet |= mask
+        self._halo |= neighbourhood(mask, self.size)
+        owner = self._owner
+        while mask:
+            low = mask & -mask
+            owner[low.bit_length() - 1] = index + 1
+            mask ^= low
 
     def receive_attack(self, cell):
-        x, y = cell
-        for ship in self.ships:
-            if cell in ship:
-                self.hits.add(cell)
-                self.grid[y][x] = "X"
-                return True
-        self.misses.add(cell)
-        self.grid[y][x] = "O"
+        x, y = int(cell[0]), int(cell[1])  # coordenadas NumPy estourariam no <<
+        if not (0 <= x < self.size and 0 <= y < self.size):
+            # Sem a checagem, (size, 0) cairia no bit de (0, 1)
+            raise IndexError(f"Célula fora do tabuleiro: {cell}")
+        pos = y * self.size + x
+        bit = 1 << pos
+        if self.fleet & bit:
+            self.hit_mask |= bit
+            index = self._owner[pos] - 1
+            if not self.ship_masks[index] & ~self.hit_mask:
+                self.sunk_mask |= 1 << index
+            return True
+        self.miss_mask |= bit
         return False
 
+    def mark_shot(self, cell, hit, sunk=None):
+        """
+        Anota o resultado de um tiro num tabuleiro de frota desconhecida
+        (a do oponente). sunk: células do navio afundado, que passa a
+        fazer parte da frota conhecida.
+        """
+        bit = self._bit(cell)
+        if not hit:
+            self.miss_mask |= bit
+            return
+        self.hit_mask |= bit
+        if sunk:
+            self.place_ship([tuple(c) for c in sunk])
+            self.sunk_mask |= 1 << (len(self.ship_masks) - 1)
+
     def all_ships_sunk(self):
-        for ship in self.ships:
-            if not ship.issubset(self.hits):
-                return False
-        return True
+        return not self.fleet & ~self.hit_mask
+
+    def _placement_blocked(self):
+        """
+        Células onde um navio novo não pode ficar: navios, tiros e a
+        vizinhança dos navios ainda não atingidos (célula 'X' não conta
+        para a adjacência, como na grade de strings).
+        """
+        halo = self._halo
+        if self.hit_mask:
+            halo = neighbourhood(self.fleet & ~self.hit_mask, self.size)
+        return halo | self.fleet | self.hit_mask | self.miss_mask
 
     def can_place_ship(self, x, y, length, horizontal):
-        coords = []
-        for i in range(length):
-            nx = x + i if horizontal else x
-            ny = y if horizontal else y + i
-            if nx >= self.size or ny >= self.size or self.grid[ny][nx] != "~":
-                return False
-            coords.append((nx, ny))
-
-        # Verifica adjacentes
-        for nx, ny in coords:
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    ax, ay = nx + dx, ny + dy
-                    if 0 <= ax < self.size and 0 <= ay < self.size:
-                        if self.grid[ay][ax] == "N" and (ax, ay) not in coords:
-                            return False
-        return True
-
-    def randomize_ships(self):
-        ship_lengths = [4, 3, 3, 2, 2, 2, 1, 1, 1, 1]
-        for length in ship_lengths:
-            placed = False
-            while not placed:
-                x = random.randint(0, self.size - 1)
-                y = random.randint(0, self.size - 1)
-                horizontal = random.choice([True, False])
-                if self.can_place_ship(x, y, length, horizontal):
-                    positions = [(x + i, y) if horizontal else (x, y + i) for i in range(length)]
-                    self.place_ship(positions)
-                    placed = True
-
-    def draw(self, surface, offset_x=0, offset_y=0, reveal=False):
-        import pygame
-        for y in range(self.size):
-            for x in range(self.size):
-                rect = pygame.Rect(offset_x + x*40, offset_y + y*40, 40, 40)
-                pygame.draw.rect(surface, (0, 0, 100), rect)
-                pygame.draw.rect(surface, (255, 255, 255), rect, 1)
-
-                value = self.grid[y][x]
-                if value == "X":
-                    pygame.draw.line(surface, (255, 0, 0), rect.topleft, rect.bottomright, 3)
-                    pygame.draw.line(surface, (255, 0, 0), rect.topright, rect.bottomleft, 3)
-                elif value == "O":
-                    pygame.draw.circle(surface, (255, 255, 255), rect.center, 10, 2)
-                elif value == "N" and reveal:
-                    pygame.draw.rect(surface, (0, 255, 0), rect.inflate(-10, -10))
+        mask = ship_mask(self.size, int(x), int(y), int(length), horizontal)
+        if not mask:
+            return False
+        # Célula livre (sem navio nem tiro) e sem navio nas 8 direções
+        return not mask & self._placement_blocked()
+
+    def randomize_ships(self, ship_lengths=(4, 3, 3, 2, 2, 2, 1, 1, 1, 1), rng=None):
+        from placement import sampler_for
+        sampler = sampler_for(self.size, tuple(ship_lengths))
+        blocked = self._placement_blocked()
+        for mask in sampler.sample_masks(rng, blocked):
+            self._place_mask(mask)
@@ -1,5 +1,10 @@
 import pygame
 
+from event_loop import LoopDriver
+from game import FLEETS
+from render import draw_cell, static_layer
+from text_cache import get_font, render_text
+
 class Config:
     def __init__(self, screen, board_size=10, cell_size=40):
         self.screen = screen
@@ -8,23 +13,29 @@ class Config:
         self.grid = [["~"] * board_size for _ in range(board_size)]
         self.ships = []
         # Navios para posicionar: (nome, tamanho)
-        self.ships_to_place = [("Porta-aviões", 5), ("Encouraçado", 4), ("Destroyer", 3), ("Submarino", 3), ("Patrulha", 2)]
+        self.ships_to_place = list(FLEETS["classica"])
         self.current_ship_index = 0
         self.placing_horizontal = True
         self.running = True
-        self.font = pygame.font.SysFont(None, 24)
+        self.font = get_font(None, 24)
+        self._preview = None      # (células, válido) da prévia desenhada
+        self._pending = set()     # células a redesenhar no próximo quadro
+        self._ui_state = None
 
     def run(self):
-        clock = pygame.time.Clock()
+        # Prévia segue o mouse: MOUSEMOTION acorda o loop, sem FPS fixo
+        driver = LoopDriver()
+
+        self.screen.fill((0, 0, 50))
+        self.draw_grid()
+        pygame.display.flip()
 
         while self.running:
-            self.screen.fill((0, 0, 50))
-            self.draw_grid()
-            self.draw_ships()
-            self.draw_ui()
-            pygame.display.flip()
+            dirty = self.draw_ships() + self.draw_ui()
+            if dirty:
+                pygame.display.update(dirty)
 
-            for event in pygame.event.get():
+            for event in driver.events():
                 if event.type == pygame.QUIT:
                     self.running = False
                     return None
@@ -42,6 +53,7 @@ class Config:
                             last = self.ships.pop()
                             for x, y in last:
                                 self.grid[y][x] = "~"
+                            self._pending.update(last)
                             self.current_ship_index = max(0, self.current_ship_index - 1)
 
                 elif event.type == pygame.MOUSEBUTTONDOWN:
@@ -54,11 +66,10 @@ class Config:
                             coords = self.get_ship_coords(x, y, ship_len)
                             for cx, cy in coords:
                                 self.grid[cy][cx] = "N"
+                            self._pending.update(coords)
                             self.ships.append(coords)
                             self.current_ship_index += 1
 
-            clock.tick(30)
-
     def can_place_ship(self, x, y):
         ship_len = self.ships_to_place[self.current_ship_index][1]
         coords = self.get_ship_coords(x, y, ship_len)
@@ -76,42 +87,67 @@ class Config:
         else:
             return [(x, y + i) for i in range(length)]
 
-    def draw_grid(self):
-        for y in range(self.board_size):
-            for x in range(self.board_size):
-                rect = pygame.Rect(x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size)
-                pygame.draw.rect(self.screen, (0, 0, 100), rect)
-                pygame.draw.rect(self.screen, (255, 255, 255), rect, 1)
-
-                if self.grid[y][x] == "N":
-                    pygame.draw.rect(self.screen, (0, 255, 0), rect.inflate(-10, -10))
+    def draw_grid(self, cells=None):
+        """Sem cells: grade estática em cache + navios. Com cells: só essas células.
+        Retorna os retângulos sujos."""
+        if cells is None:
+            self.screen.blit(static_layer(draw_cell, self.board_size, self.cell_size), (0, 0))
+            cells = [(x, y) for y in range(self.board_size) for x in range(self.board_size)
+                     if self.grid[y][x] == "N"]
+            span = self.board_size * self.cell_size + 1
+            dirty = [pygame.Rect(0, 0, span, span)]
+        else:
+            dirty = []
+        for x, y in cells:
+            rect = pygame.Rect(x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size)
+            draw_cell(self.screen, rect, self.grid[y][x])
+            dirty.append(rect)
+        return dirty
 
     def draw_ships(self):
-        # Opcional: destaca navio que está sendo posicionado (preview)
+        # Prévia do navio que está sendo posicionado; redesenha só se mudou
         pos = pygame.mouse.get_pos()
         x = pos[0] // self.cell_size
         y = pos[1] // self.cell_size
+        preview = ([], True)
         if self.current_ship_index < len(self.ships_to_place):
             ship_len = self.ships_to_place[self.current_ship_index][1]
-            coords = self.get_ship_coords(x, y, ship_len)
-            valid = self.can_place_ship(x, y)
-            color = (0, 200, 0, 100) if valid else (200, 0, 0, 100)
-            s = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
-            s.fill(color)
-            for cx, cy in coords:
-                if 0 <= cx < self.board_size and 0 <= cy < self.board_size:
-                    self.screen.blit(s, (cx * self.cell_size, cy * self.cell_size))
+            coords = [(cx, cy) for cx, cy in self.get_ship_coords(x, y, ship_len)
+                      if 0 <= cx < self.board_size and 0 <= cy < self.board_size]
+            preview = (coords, self.can_place_ship(x, y))
+        if preview == self._preview and not self._pending:
+            return []
+
+        old_cells = self._preview[0] if self._preview else []
+        cells = self._pending.union(old_cells, preview[0])
+        self._pending.clear()
+        self._preview = preview
+        dirty = self.draw_grid(cells)
+
+        color = (0, 200, 0, 100) if preview[1] else (200, 0, 0, 100)
+        s = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
+        s.fill(color)
+        for cx, cy in preview[0]:
+            self.screen.blit(s, (cx * self.cell_size, cy * self.cell_size))
+        return dirty
 
     def draw_ui(self):
-        # Instruções e status
+        # Instruções e status; o texto só muda quando muda o navio da vez
+        if self._ui_state == self.current_ship_index:
+            return []
+        self._ui_state = self.current_ship_index
+        ui_rect = pygame.Rect(0, 405, self.screen.get_width(), 110)
+        self.screen.fill((0, 0, 50), ui_rect)
+
         ship_name = "Todos os navios posicionados" if self.current_ship_index >= len(self.ships_to_place) else self.ships_to_place[self.current_ship_index][0]
         instr1 = "Clique para posicionar navio"
         instr2 = "R para rotacionar (horizontal/vertical)"
         instr3 = "Enter para confirmar"
         instr4 = "Backspace para apagar último navio"
 
-        self.screen.blit(self.font.render(f"Posicionando: {ship_name}", True, (255, 255, 255)), (10, 410))
-        self.screen.blit(self.font.render(instr1, True, (255, 255, 255)), (10, 430))
-        self.screen.blit(self.font.render(instr2, True, (255, 255, 255)), (10, 450))
-        self.screen.blit(self.font.render(instr3, True, (255, 255, 255)), (10, 470))
-        self.screen.blit(self.font.render(instr4, True, (255, 255, 255)), (10, 490))
+        self.screen.blit(render_text(f"Posicionando: {ship_name}", (255, 255, 255), self.font), (10, 410))
+        self.screen.blit(render_text(instr1, (255, 255, 255), self.font), (10, 430))
+        self.screen.blit(render_text(instr2, (255, 255, 255), self.font), (10, 450))
+        self.screen.blit(render_text(instr3, (255, 255, 255), self.font), (10, 470))
+        self.screen.blit(render_text(instr4, (255, 255, 255), self.font), (10, 490))
+        return [ui_rect]
@@ -0,0 +1,149 @@
+"""
+Descoberta de salas na rede local por UDP, sem depender de internet.
+
+Quem cria a sala roda um Announcer, que a cada segundo manda um
+datagrama {"app": "batalha-naval", "name": ..., "port": ...} para o
+broadcast da rede e para 127.0.0.1 (teste numa máquina só). A tela
+inicial roda um Browser, que escuta a porta DISCOVERY_PORT e mantém a
+lista das salas vistas nos últimos HOST_TTL segundos; o IP vem do
+próprio datagrama, então ninguém precisa digitar endereço.
+
+Execução (listar salas no terminal): python discovery.py
+"""
+import json
+import socket
+import threading
+import time
+import uuid
+
+DISCOVERY_PORT = 5001
+ANNOUNCE_INTERVAL = 1.0
+HOST_TTL = 3.5  # sala some da lista se ficar esse tempo sem anunciar
+APP_TAG = "batalha-naval"
+BROADCAST_TARGETS = ("255.255.255.255", "127.0.0.1")
+
+
+def local_ip():
+    """
+    IP desta máquina na rede local. Um socket UDP "conectado" a um
+    endereço privado escolhe a interface de saída sem mandar pacote e
+    sem precisar de rota para a internet; sem rede nenhuma, 127.0.0.1.
+    """
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        s.connect(("10.255.255.255", 1))
+        return s.getsockname()[0]
+    except OSError:
+        return "127.0.0.1"
+    finally:
+        s.close()
+
+
+class Announcer:
+    """Anuncia uma sala aberta até stop()."""
+
+    def __init__(self, name, game_port=5000, port=DISCOVERY_PORT,
+                 targets=BROADCAST_TARGETS, interval=ANNOUNCE_INTERVAL):
+        # id distingue a sala quando o mesmo anúncio chega por broadcast e por loopback
+        self.message = json.dumps({"app": APP_TAG, "id": uuid.uuid4().hex[:12],
+                                   "name": name, "port": game_port}).encode()
+        self.port = port
+        self.targets = targets
+        self.interval = interval
+        self._stop = threading.Event()
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            for target in self.targets:
+                try:
+                    self.sock.sendto(self.message, (target, self.port))
+                except OSError:
+                    pass  # sem rota para esse destino (ex.: broadcast sem rede)
+            if self._stop.wait(self.interval):
+                return
+
+    def stop(self):
+        self._stop.set()
+        self.thread.join()
+        self.sock.close()
+
+
+class Browser:
+    """
+    Escuta anúncios e mantém as salas vistas. notify (opcional) é chamada
+    na thread de escuta quando aparece uma sala nova.
+    """
+
+    def __init__(self, port=DISCOVERY_PORT, bind="", notify=None, ttl=HOST_TTL):
+        self.notify = notify
+        self.ttl = ttl
+        self._hosts = {}  # id da sala -> (nome, ip, porta do jogo, visto por último)
+        self._lock = threading.Lock()
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            # Vários jogos na mesma máquina escutando a mesma porta
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        try:
+            self.sock.bind((bind, port))
+        except OSError:
+            self.sock.close()
+            raise
+        # close() não interrompe um recvfrom bloqueado: acorda de tempos em tempos
+        self.sock.settimeout(0.5)
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                payload, (ip, _) = self.sock.recvfrom(512)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            try:
+                data = json.loads(payload.decode())
+                if data.get("app") != APP_TAG:
+                    continue
+                key = str(data.get("id", ip))
+                port = int(data["port"])
+                name = str(data.get("name", ip))[:40]
+            except (ValueError, KeyError, TypeError, AttributeError):
+                continue
+            with self._lock:
+                old = self._hosts.get(key)
+                new = old is None
+                if old is not None and ip.startswith("127.") and not old[1].startswith("127."):
+                    ip = old[1]  # mesma máquina: fica com o IP da rede, que os outros também veem
+                self._hosts[key] = (name, ip, port, time.monotonic())
+            if new and self.notify is not None:
+                self.notify()
+
+    def hosts(self):
+        """Salas ativas: lista de (nome, ip, porta), ordenada por nome."""
+        now = time.monotonic()
+        with self._lock:
+            for key in [k for k, host in self._hosts.items() if now - host[3] > self.ttl]:
+                del self._hosts[key]
+            return sorted(host[:3] for host in self._hosts.values())
+
+    def stop(self):
+        self._stop.set()
+        self.thread.join()
+        self.sock.close()
+
+
+if __name__ == "__main__":
+    browser = Browser()
+    try:
+        while True:
+            time.sleep(1.0)
+            print(browser.hosts())
+    except KeyboardInterrupt:
+        browser.stop()
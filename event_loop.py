@@ -0,0 +1,46 @@
+"""
+Driver dos loops de tela: FPS fixo só quando há algo animando.
+
+Ocioso, o loop dorme em pygame.event.wait até chegar entrada, um evento
+de rede/thread (wake) ou estourar idle_timeout_ms (para checar prazos).
+Assim as telas paradas (menu, fim de jogo, espera de conexão) não
+gastam CPU redesenhando a 30 FPS.
+"""
+import pygame
+
+from profiler import PROFILER
+
+# Evento postado por threads (rede, accept) para acordar o loop
+WAKE_EVENT = pygame.USEREVENT + 1
+
+
+def wake(**attrs):
+    """Acorda o loop principal; pode ser chamada de qualquer thread."""
+    try:
+        pygame.event.post(pygame.event.Event(WAKE_EVENT, attrs))
+    except pygame.error:
+        pass  # vídeo já encerrado
+
+
+class LoopDriver:
+    def __init__(self, fps=30, idle_timeout_ms=500):
+        self.fps = fps
+        self.idle_timeout_ms = idle_timeout_ms
+        self.clock = pygame.time.Clock()
+
+    def events(self, busy=False):
+        """
+        Eventos do próximo quadro. busy=True (animação tocando) mantém o
+        ritmo de fps; senão bloqueia até haver evento ou idle_timeout_ms.
+        """
+        if busy:
+            with PROFILER.idle():
+                self.clock.tick(self.fps)
+            return pygame.event.get()
+        with PROFILER.idle():
+            first = pygame.event.wait(self.idle_timeout_ms)
+            # Limita a taxa mesmo com rajadas de eventos (ex.: movimento do mouse)
+            self.clock.tick(self.fps)
+        events = [] if first.type == pygame.NOEVENT else [first]
+        events.extend(pygame.event.get())
+        return events
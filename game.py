@@ -0,0 +1,142 @@
+"""
+Núcleo do jogo sem pygame: regras, frotas, ordem de turnos e vitória.
+
+Usado pelo modo local (battleship.py) e pelo modo em rede (main.py), e
+também pode rodar partidas sem janela (simulações, servidores, CI).
+"""
+import random
+from collections import deque, namedtuple
+
+from board import Board
+
+BOARD_SIZE = 10
+
+# Variantes de frota: tupla de (nome, tamanho)
+FLEETS = {
+    # Frota do modo em rede (posicionada em config.Config)
+    "classica": (
+        ("Porta-aviões", 5), ("Encouraçado", 4), ("Destroyer", 3),
+        ("Submarino", 3), ("Patrulha", 2),
+    ),
+    # Frota do modo local (battleship.py) e de Board.randomize_ships
+    "dez_navios": (
+        ("battleship", 4), ("cruiser1", 3), ("cruiser2", 3),
+        ("destroyer1", 2), ("destroyer2", 2), ("destroyer3", 2),
+        ("submarine1", 1), ("submarine2", 1), ("submarine3", 1), ("submarine4", 1),
+    ),
+}
+
+# Resultado de um tiro: sunk traz as coordenadas do navio afundado (ou None)
+# e winner o jogador que venceu com esse tiro (ou None)
+ShotResult = namedtuple("ShotResult", "player target cell hit sunk winner")
+
+
+def fleet_lengths(fleet):
+    """Tamanhos dos navios de uma frota (nome da variante ou tupla)."""
+    if isinstance(fleet, str):
+        fleet = FLEETS[fleet]
+    return [length for _, length in fleet]
+
+
+class Game:
+    """
+    Partida entre jogadores que se alternam numa fila (deque).
+    Cada tiro vai no tabuleiro do próximo da fila; o turno passa
+    após cada tiro e a partida acaba quando uma frota inteira afunda.
+    """
+
+    def __init__(self, players=("Jogador 1", "Jogador 2"), fleet="dez_navios",
+                 size=BOARD_SIZE, boards=None):
+        self.players = list(players)
+        self.fleet = FLEETS[fleet] if isinstance(fleet, str) else tuple(fleet)
+        self.size = size
+        self.turn_queue = deque(self.players)
+        self.action_stack = []  # histórico de tiros (pilha)
+        self.boards = boards if boards is not None else {p: Board(size) for p in self.players}
+        self.winner = None
+
+    def randomize(self, rng=None):
+        """Posiciona a frota aleatoriamente em todos os tabuleiros vazios."""
+        lengths = fleet_lengths(self.fleet)
+        for board in self.boards.values():
+            if not board.ship_masks:
+                board.randomize_ships(lengths, rng=rng)
+
+    @property
+    def current(self):
+        return self.turn_queue[0]
+
+    @property
+    def opponent(self):
+        return self.turn_queue[1]
+
+    @property
+    def shots(self):
+        return len(self.action_stack)
+
+    @property
+    def over(self):
+        return self.winner is not None
+
+    def can_shoot(self, cell):
+        """True se cell está no tabuleiro do oponente e ainda não foi atingida."""
+        x, y = cell
+        if self.over or not (0 <= x < self.size and 0 <= y < self.size):
+            return False
+        return not self.boards[self.opponent].was_shot(cell)
+
+    def shoot(self, cell):
+        """
+        Jogador da vez atira em cell. Retorna ShotResult, ou None se o
+        tiro for inválido (fora do tabuleiro, repetido ou jogo encerrado).
+        """
+        if not self.can_shoot(cell):
+            return None
+        player, target = self.current, self.opponent
+        board = self.boards[target]
+        hit = board.receive_attack(cell)
+        sunk = board.sunk_ship_at(cell) if hit else None
+        self.action_stack.append((player, target, cell))
+        if hit and board.all_ships_sunk():
+            self.winner = player
+        else:
+            self.turn_queue.rotate(-1)
+        return ShotResult(player, target, cell, hit, sunk, self.winner)
+
+    def apply_result(self, cell, hit, sunk=None, over=False):
+        """
+        Como shoot(), mas com o resultado informado por quem conhece a
+        frota do oponente (o próprio oponente ou o juiz do relay): o
+        tabuleiro dele aqui só guarda tiros e navios já afundados.
+        Lança ValueError se o navio afundado informado não for possível.
+        """
+        if not self.can_shoot(cell):
+            return None
+        if hit and sunk:
+            sunk = [tuple(c) for c in sunk]
+            if tuple(cell) not in sunk or not all(0 <= x < self.size and 0 <= y < self.size
+                                                  for x, y in sunk):
+                raise ValueError(f"navio afundado inválido: {sunk}")
+        player, target = self.current, self.opponent
+        self.boards[target].mark_shot(cell, hit, sunk)
+        self.action_stack.append((player, target, cell))
+        sunk = sunk if hit and sunk else None
+        if hit and over:
+            self.winner = player
+        else:
+            self.turn_queue.rotate(-1)
+        return ShotResult(player, target, cell, hit, sunk, self.winner)
+
+
+def random_game(fleet="dez_navios", rng=None):
+    """Joga uma partida inteira com tiros aleatórios. Retorna o Game final."""
+    rng = rng or random
+    game = Game(fleet=fleet)
+    game.randomize(rng)
+    remaining = {p: [(x, y) for x in range(game.size) for y in range(game.size)]
+                 for p in game.players}
+    for cells in remaining.values():
+        rng.shuffle(cells)
+    while not game.over:
+        game.shoot(remaining[game.opponent].pop())
+    return game
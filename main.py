@@ -1,12 +1,25 @@
 import pygame
 import sys
 from start_screen import StartScreen
-from network import NetworkServer, NetworkClient
+from network import NetworkServer, NetworkClient, Receiver
+from event_loop import LoopDriver, wake
+from protocol import attack_cell, check_result, negotiate, result_message
 from board import Board
+from game import Game
+from render import BoardView
 from config import Config
+from text_cache import render_text
+from assets import ASSETS
+from overlay import DebugOverlay
+from profiler import PROFILER
+from discovery import Announcer, local_ip
+from matchlog import MatchLog
+from spectator import RelayPublisher, SpectatorServer, shot_delta
+from session import Session, check_resume, new_token, peer_result, reconcile
+from referee import Commitment, check_reveal
+import battleship
 import threading
 import time
-from queue import Queue
 import socket
 
 # Inicializa pygame
@@ -15,202 +28,446 @@ pygame.font.init()
 pygame.mixer.init()
 
 SCREEN_WIDTH, SCREEN_HEIGHT = 950, 650
+
+# Prazo para o outro lado responder durante a troca de codec e compromissos
+HANDSHAKE_TIMEOUT = 15.0
+
+# Quanto a tela de fim de jogo espera a frota revelada do oponente
+REVEAL_TIMEOUT = 3.0
+
+# Opções do menu contra o computador -> nível em ai.AI_PLAYERS
+AI_LEVELS = {"Contra o Computador": "densidade", "Computador Difícil": "monte_carlo"}
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Batalha Naval")
 
-sound_pew = pygame.mixer.Sound("assets/sounds/pew.wav")
-sound_boom = pygame.mixer.Sound("assets/sounds/boom.wav")
-sound_background = pygame.mixer.Sound("assets/sounds/background.wav")
+
+def restore_window():
+    """Volta a janela ao tamanho e título do menu (após o jogo local)."""
+    global screen
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Batalha Naval")
 
 def draw_text_centered(screen, text, size, color, y):
-    font = pygame.font.SysFont(None, size)
-    rendered = font.render(text, True, color)
+    rendered = render_text(text, color, size=size)
     rect = rendered.get_rect(center=(SCREEN_WIDTH // 2, y))
     screen.blit(rendered, rect)
 
-def play_sound(sound, enabled):
-    if enabled:
-        sound.play()
-
-def game_loop(screen, network, is_server, sound_config, my_ships, enemy_ships):
-    clock = pygame.time.Clock()
+def play_sound(name, enabled):
+    ASSETS.play(name, enabled)
+
+def game_loop(screen, network, is_server, sound_config, commitment, enemy_digest,
+              reply_timeout=10.0, turn_timeout=None, spectators=None, session=None):
+    """
+    Partida em rede. As mensagens chegam por um network.Receiver, então o
+    loop de eventos/desenho nunca bloqueia no socket. A frota do oponente
+    não é conhecida: cada ataque é respondido com o resultado (ver
+    referee.py) e, no fim, a frota revelada é conferida contra
+    enemy_digest, o compromisso recebido no handshake. reply_timeout limita
+    a espera pelo resultado do nosso tiro; turn_timeout (None = sem limite)
+    a espera pela jogada do oponente. Estouro ou queda viram fim de jogo.
+    Entre eventos o loop dorme: o Receiver o acorda a cada mensagem.
+    A partida é gravada no matchlog (0 = este jogador, 1 = oponente) e,
+    com spectators (spectator.SpectatorServer/RelayPublisher), cada tiro
+    vira um delta para os espectadores (0 = host, 1 = convidado).
+    Com session (session.Session), uma queda no meio da partida abre a
+    tela de reconexão e o jogo continua do último tiro confirmado.
+    """
+    driver = LoopDriver()
     board = Board()
     enemy_board = Board()
 
-    for ship in my_ships:
-        board.place_ship(ship)
+    for ship in commitment.ships:
+        board.place_ship([tuple(cell) for cell in ship])
 
-    for ship in enemy_ships:
-        enemy_board.place_ship([tuple(cell) for cell in ship])  # converte listas para tuplas
+    # Servidor começa; a ordem de turnos e a vitória ficam no núcleo
+    players = ("self", "enemy") if is_server else ("enemy", "self")
+    game = Game(players, fleet="classica", boards={"self": board, "enemy": enemy_board})
+    receiver = Receiver(network, notify=wake)
+    record = MatchLog().recorder("network", board.size)
+    record.fleet_from_board(0, board)  # a do oponente só quando ele revelar
 
-    turn_queue = Queue()
-    if is_server:
-        turn_queue.put("self")
-        turn_queue.put("enemy")
-    else:
-        turn_queue.put("enemy")
-        turn_queue.put("self")
+    def on_shot(shot):
+        if shot is None:
+            return
+        record.shot(0 if shot.player == "self" else 1, shot.cell, shot.hit, shot.sunk)
+        if spectators is not None:
+            spectators.publish(shot_delta(0 if (shot.player == "self") == is_server else 1, shot))
 
     game_over = False
+    result_text = None
+    pending_cell = None   # nosso tiro aguardando o resultado
+    peer_reveal = None
+    waiting_since = time.monotonic()
+
+    def send(data):
+        try:
+            network.send(data)
+            return True
+        except OSError:
+            return False
 
     if sound_config["background"]:
-        sound_background.play(-1)
-
-    while not game_over:
+        ASSETS.play_music("background.wav")
+
+    # Fundo e textos fixos uma vez; depois só o que mudou vai para a tela
+    my_view = BoardView(board, offset_x=50, offset_y=50, reveal=True)
+    enemy_view = BoardView(enemy_board, offset_x=500, offset_y=50, reveal=False)
+    status_rect = pygame.Rect(0, 440, SCREEN_WIDTH, 40)
+    overlay = DebugOverlay((10, 490), background=(0, 0, 50))
+    latency_rect = pygame.Rect(SCREEN_WIDTH - 200, 0, 200, 40)
+    shown_latency = ""
+    attack_sent = None    # perf_counter do envio do tiro pendente (RTT)
+    shown_turn = None
+
+    def draw_background():
+        nonlocal shown_turn, shown_latency
         screen.fill((0, 0, 50))
-        board.draw(screen, offset_x=50, offset_y=50, reveal=True)
-        enemy_board.draw(screen, offset_x=500, offset_y=50, reveal=False)
-
         draw_text_centered(screen, "VSVSVSVSVSSVVS", 24, (255, 255, 255), 20)
         draw_text_centered(screen, "--------------", 24, (255, 255, 255), 20)
-
-        my_turn = (turn_queue.queue[0] == "self")
-        if my_turn:
-            draw_text_centered(screen, "Seu turno", 28, (0, 255, 0), 460)
-        else:
-            draw_text_centered(screen, "Aguardando oponente...", 28, (255, 255, 0), 460)
-
         pygame.display.flip()
+        for view in (my_view, enemy_view, overlay):
+            view.invalidate()
+        shown_turn = None
+        shown_latency = ""
+
+    def resume():
+        """Tela de reconexão e reconciliação; True se a partida continua."""
+        nonlocal receiver, pending_cell, waiting_since
+        peer = None
+        cancel = threading.Event()
+
+        def reconnect():
+            # Roda na thread de wait_for_connection; o resume do outro lado fica em peer
+            nonlocal peer
+            peer = session.reconnect(network, game, board, cancel.is_set)
+            return peer is not None
+
+        ok = wait_for_connection(
+            screen, reconnect,
+            f"Aguardando o oponente por até {session.grace:.0f} s", "Conexão perdida. Reconectando...")
+        draw_background()
+        if not ok:
+            cancel.set()
+            return False
+        try:
+            # O resume vem da rede: malformado ou de outra partida encerra o jogo
+            check_resume(peer, game.size)
+            step = reconcile(game, enemy_board, peer, pending_cell)
+            if step == "apply":
+                # O outro lado já tinha recebido o tiro; o resultado vem no resume dele
+                shot = game.apply_result(pending_cell, **peer_result(peer, pending_cell))
+        except ValueError:
+            return False
+        receiver = Receiver(network, notify=wake)
+        waiting_since = time.monotonic()
+        if step == "apply":
+            on_shot(shot)
+            pending_cell = None
+        elif step == "resend":
+            return send({"action": "attack", "cell": pending_cell})
+        return True
+
+    draw_background()
 
-        if my_turn:
-            for event in pygame.event.get():
+    while not game_over:
+        PROFILER.frame()
+        with PROFILER.section("draw"):
+            dirty = my_view.draw(screen) + enemy_view.draw(screen)
+
+            my_turn = (game.current == "self")
+            if my_turn != shown_turn:
+                shown_turn = my_turn
+                screen.fill((0, 0, 50), status_rect)
+                if my_turn:
+                    draw_text_centered(screen, "Seu turno", 28, (0, 255, 0), 460)
+                else:
+                    draw_text_centered(screen, "Aguardando oponente...", 28, (255, 255, 0), 460)
+                dirty.append(status_rect)
+
+            rtt = getattr(network, "rtt", None)
+            if rtt is None:
+                latency = "Latência: --"
+            else:
+                latency = f"Latência: {rtt:.1f} ms" if rtt < 10 else f"Latência: {rtt:.0f} ms"
+            if latency != shown_latency:
+                shown_latency = latency
+                screen.fill((0, 0, 50), latency_rect)
+                text = render_text(latency, (180, 180, 180), size=24)
+                screen.blit(text, text.get_rect(midright=(latency_rect.right - 10, latency_rect.centery)))
+                dirty.append(latency_rect)
+            dirty += overlay.draw(screen)
+
+        if dirty:
+            with PROFILER.section("flip"):
+                pygame.display.update(dirty)
+
+        events = driver.events()
+        with PROFILER.section("events"):
+            for event in events:
                 if event.type == pygame.QUIT:
+                    record.finish()
+                    ASSETS.stop_music()
                     return
-                elif event.type == pygame.MOUSEBUTTONDOWN:
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    PROFILER.toggle()
+                elif event.type == pygame.MOUSEBUTTONDOWN and my_turn and pending_cell is None:
                     mx, my = event.pos
                     x = (mx - 500) // 40
                     y = (my - 50) // 40
-                    if 0 <= x < 10 and 0 <= y < 10:
-                        play_sound(sound_pew, sound_config["pew"])
-                        cell = (x, y)
-                        network.send({"action": "attack", "cell": cell})
-                        result = network.receive()
-                        if result and "hit" in result:
-                            enemy_board.receive_attack(cell)
-                            if result["hit"]:
-                                play_sound(sound_boom, sound_config["boom"])
-                            turn_queue.get()
-                            turn_queue.put("enemy")
-        else:
-            data = network.receive()
-            if data:
-                if data.get("action") == "attack":
-                    cell = tuple(data["cell"])
-                    hit = board.receive_attack(cell)
-                    network.send({"hit": hit})
-                    turn_queue.get()
-                    turn_queue.put("self")
-                elif data.get("action") == "game_over":
-                    game_over = True
-                    if data.get("winner"):
-                        draw_text_centered(screen, "Você venceu!", 48, (0, 255, 0), 250)
-                    else:
-                        draw_text_centered(screen, "Você perdeu!", 48, (255, 0, 0), 250)
-
-        # Fim de jogo local
-        if board.all_ships_sunk():
-            network.send({"action": "game_over", "winner": False})
-            game_over = True
-            draw_text_centered(screen, "Você perdeu!", 48, (255, 0, 0), 250)
-        elif enemy_board.all_ships_sunk():
-            network.send({"action": "game_over", "winner": True})
+                    cell = (x, y)
+                    if game.can_shoot(cell):
+                        play_sound("pew.wav", sound_config["pew"])
+                        attack_sent = time.perf_counter()
+                        if not send({"action": "attack", "cell": cell}):
+                            result_text = ("Conexão perdida", (255, 0, 0))
+                            break
+                        pending_cell = cell
+                        waiting_since = time.monotonic()
+
+        for data in receiver.poll():
+            action = data.get("action")
+            if action == "disconnected":
+                if session is not None and game.winner is None and not result_text and resume():
+                    break  # novo Receiver; a conexão velha acabou aqui
+                result_text = result_text or ("Conexão perdida", (255, 0, 0))
+            elif action == "result" and pending_cell is not None:
+                PROFILER.record("rtt_attack", (time.perf_counter() - attack_sent) * 1000.0)
+                try:
+                    hit, sunk, over = check_result(data)
+                    on_shot(game.apply_result(pending_cell, hit, sunk, over))
+                except ValueError:
+                    result_text = result_text or ("Resultado inválido do oponente", (255, 0, 0))
+                else:
+                    if hit:
+                        play_sound("boom.wav", sound_config["boom"])
+                pending_cell = None
+                waiting_since = time.monotonic()
+            elif action == "attack" and game.current == "enemy":
+                # O turno vem do núcleo: um resultado neste mesmo lote já pode tê-lo passado
+                try:
+                    cell = attack_cell(data)
+                except ValueError:
+                    result_text = result_text or ("Ataque inválido do oponente", (255, 0, 0))
+                    continue
+                shot = game.shoot(cell)
+                if shot is not None:
+                    on_shot(shot)
+                    send(result_message(shot))
+                    waiting_since = time.monotonic()
+            elif action == "reveal":
+                peer_reveal = data
+
+        waited = time.monotonic() - waiting_since
+        if pending_cell is not None and reply_timeout is not None and waited > reply_timeout:
+            result_text = result_text or ("Oponente não respondeu", (255, 0, 0))
+        elif not my_turn and turn_timeout is not None and waited > turn_timeout:
+            result_text = result_text or ("Oponente não respondeu", (255, 0, 0))
+
+        # Fim de jogo: os dois lados revelam a frota para o outro conferir
+        if game.winner is not None:
+            send(commitment.reveal())
+            if game.winner == "enemy":
+                result_text = ("Você perdeu!", (255, 0, 0))
+            else:
+                result_text = ("Você venceu!", (0, 255, 0))
+
+        if result_text:
             game_over = True
-            draw_text_centered(screen, "Você venceu!", 48, (0, 255, 0), 250)
-
-        clock.tick(30)
+            draw_text_centered(screen, result_text[0], 48, result_text[1], 250)
 
     pygame.display.flip()
-    pygame.time.wait(3000)
-    sound_background.stop()
-
-def get_local_ip():
-    try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        ip = s.getsockname()[0]
-        s.close()
-        return ip
-    except Exception:
-        return "127.0.0.1"
-
-def wait_for_connection(screen, server):
-    font = pygame.font.SysFont(None, 36)
+    deadline = time.monotonic() + REVEAL_TIMEOUT
+    if game.winner is not None:
+        while peer_reveal is None and time.monotonic() < deadline:
+            closed = not receiver.connected  # antes do poll: nada chega depois da queda
+            peer_reveal = next((d for d in receiver.poll() if d.get("action") == "reveal"), None)
+            if peer_reveal is None and not closed:
+                driver.events()
+            elif closed:
+                break
+        warning = "O oponente não revelou a frota"
+        if peer_reveal is not None:
+            try:
+                record.fleet(1, check_reveal(peer_reveal, enemy_digest, enemy_board, game.winner == "self"))
+                warning = None
+            except ValueError:
+                warning = "Frota do oponente não confere com os resultados!"
+        if warning:
+            draw_text_centered(screen, warning, 30, (255, 128, 0), 300)
+            pygame.display.flip()
+    record.finish({"self": 0, "enemy": 1}.get(game.winner))
+    pygame.time.wait(max(0, int((deadline - time.monotonic()) * 1000)))
+    ASSETS.stop_music()
+
+def wait_for_connection(screen, wait, info, message="Aguardando conexão do cliente..."):
+    """Mostra a tela de espera enquanto wait() bloqueia numa thread.
+    Retorna False se o usuário cancelar ou wait() devolver False."""
     connected = False
-    host_ip = get_local_ip()
+    ok = True
 
     def accept_thread():
-        nonlocal connected
-        server.accept()
+        nonlocal connected, ok
+        try:
+            ok = wait() is not False
+        except (OSError, ValueError):
+            ok = False  # cancelado (socket fechado) ou conexão caiu
         connected = True
+        wake()
 
     t = threading.Thread(target=accept_thread)
     t.start()
 
-    while not connected:
-        screen.fill((10, 10, 30))
-        draw_text_centered(screen, "Aguardando conexão do cliente...", 30, (255, 255, 0), SCREEN_HEIGHT // 2 - 40)
-        draw_text_centered(screen, f"IP do HOST: {host_ip}", 30, (255, 255, 0), SCREEN_HEIGHT // 2)
-        draw_text_centered(screen, "Pressione ESC para cancelar", 20, (180, 180, 180), SCREEN_HEIGHT // 2 + 40)
-        pygame.display.flip()
+    # Tela fixa: desenha uma vez e dorme até ESC ou o wake() da thread
+    screen.fill((10, 10, 30))
+    draw_text_centered(screen, message, 30, (255, 255, 0), SCREEN_HEIGHT // 2 - 40)
+    draw_text_centered(screen, info, 30, (255, 255, 0), SCREEN_HEIGHT // 2)
+    draw_text_centered(screen, "Pressione ESC para cancelar", 20, (180, 180, 180), SCREEN_HEIGHT // 2 + 40)
+    pygame.display.flip()
 
-        for event in pygame.event.get():
+    driver = LoopDriver()
+    while not connected:
+        for event in driver.events():
             if event.type == pygame.QUIT:
                 return False
             elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 return False
 
-        time.sleep(0.1)
+    return ok
 
-    return True
+def exchange_commitments(network, is_server, commitment, referee=False):
+    """Combina o codec e troca os compromissos das frotas (quem hospeda
+    envia primeiro); a frota em si não sai daqui. Com referee (relay) ela
+    vai antes só para o juiz do relay. Retorna o compromisso do oponente
+    ou None. Depois da troca liga o heartbeat, que mede a latência e
+    derruba a conexão se o outro lado sumir."""
+    network.set_timeout(HANDSHAKE_TIMEOUT)
+    try:
+        if referee:
+            network.send(commitment.fleet_message(is_server))
+        negotiate(network, is_server, session=new_token() if is_server else None)
+        if is_server:
+            network.send(commitment.message())
+        data = network.receive()
+        if not data or data.get("action") != "commit":
+            return None
+        if not is_server:
+            network.send(commitment.message())
+    except (OSError, ValueError):
+        return None
+    network.start_heartbeat()
+    return data["digest"]
+
+def make_session(network, redial, is_host):
+    """Session para retomar a partida, se o outro lado combinou um token."""
+    return Session(network.session, redial, is_host) if network.session else None
+
+def connect_client(host):
+    """host é "ip" ou "ip:porta" (como vem da lista de salas da rede local)."""
+    host, _, port = host.partition(":")
+    try:
+        return NetworkClient(host=host, port=int(port) if port else 5000)
+    except Exception as e:
+        screen.fill((0, 0, 0))
+        draw_text_centered(screen, f"Erro ao conectar: {e}", 30, (255, 0, 0), SCREEN_HEIGHT // 2)
+        pygame.display.flip()
+        pygame.time.wait(3000)
+        return None
 
 def main():
+    # Sons carregam em segundo plano enquanto a tela inicial está aberta
+    ASSETS.preload_sounds(["pew.wav", "boom.wav"])
     while True:
         start = StartScreen(screen)
         choice, ip, sound_config = start.run()
 
-        if choice == "Jogo Local":
-            import subprocess
-            pygame.quit()
-            subprocess.run(["python", "battleship.py"])
+        if choice in ("Jogo Local",) + tuple(AI_LEVELS):
+            # Mesmo processo e janela: só troca o tamanho e volta ao menu no ESC
+            battleship.play(sound_on=sound_config["pew"] or sound_config["boom"],
+                            music_on=sound_config["background"],
+                            ai=AI_LEVELS.get(choice))
+            restore_window()
             continue
 
         config = Config(screen)
         my_ships = config.run()
         if not my_ships:
             continue  # volta ao menu
+        commitment = Commitment(my_ships)
 
         if choice == "Criar Sala (Servidor)":
             server = NetworkServer()
-            if not wait_for_connection(screen, server):
+            # A sala aparece sozinha na lista dos clientes da rede local
+            announcer = Announcer(f"Sala de {socket.gethostname()}")
+            try:
+                connected = wait_for_connection(screen, server.accept, f"IP do HOST: {local_ip()}")
+            finally:
+                announcer.stop()
+            if not connected:
                 server.close()
                 continue
-            server.send({"ships": my_ships})
-            enemy_data = server.receive()
-            if not enemy_data or "ships" not in enemy_data:
+            enemy_digest = exchange_commitments(server, True, commitment)
+            if enemy_digest is None:
                 server.close()
                 continue
+            try:
+                spectators = SpectatorServer()
+            except OSError:
+                spectators = None  # porta ocupada: partida sem espectadores
             game_loop(screen, server, is_server=True, sound_config=sound_config,
-                      my_ships=my_ships, enemy_ships=enemy_data["ships"])
+                      commitment=commitment, enemy_digest=enemy_digest, spectators=spectators,
+                      session=make_session(server, lambda left: server.accept(timeout=left), True))
+            if spectators is not None:
+                spectators.close()
             server.close()
 
         elif choice == "Entrar em Sala (Cliente)":
             if not ip:
                 continue
-            try:
-                client = NetworkClient(host=ip)
-            except Exception as e:
-                screen.fill((0, 0, 0))
-                draw_text_centered(screen, f"Erro ao conectar: {e}", 30, (255, 0, 0), SCREEN_HEIGHT // 2)
-                pygame.display.flip()
-                pygame.time.wait(3000)
+            client = connect_client(ip)
+            if not client:
                 continue
-            data = client.receive()
-            if not data or "ships" not in data:
+            enemy_digest = exchange_commitments(client, False, commitment)
+            if enemy_digest is None:
                 client.close()
                 continue
-            client.send({"ships": my_ships})
             game_loop(screen, client, is_server=False, sound_config=sound_config,
-                      my_ships=my_ships, enemy_ships=data["ships"])
+                      commitment=commitment, enemy_digest=enemy_digest,
+                      session=make_session(client, lambda left: client.reconnect(min(left, 5.0)), False))
+            client.close()
+
+        elif choice == "Sala Online (Relay)":
+            if not ip:
+                continue
+            host, _, room = ip.partition("/")
+            client = connect_client(host)
+            if not client:
+                continue
+            room_id, is_host = client.join_room(room or None)
+            if room_id is None or not wait_for_connection(
+                    screen, client.wait_paired, f"Sala: {room_id}", "Aguardando o outro jogador..."):
+                client.close()
+                continue
+            # O relay é o juiz: recebe a frota, confere e resolve os ataques
+            enemy_digest = exchange_commitments(client, is_host, commitment, referee=True)
+            if enemy_digest is None:
+                client.close()
+                continue
+            def rejoin(left, client=client, room_id=room_id, is_host=is_host, commitment=commitment):
+                # O relay fecha a sala quando alguém cai: os dois entram de novo
+                client.reconnect(min(left, 5.0))
+                if client.join_room(room_id)[0] is None:
+                    return False
+                client.set_timeout(left)
+                if not client.wait_paired():
+                    return False
+                # A mesma frota de antes devolve ao jogador o seu lugar no juiz
+                client.send(commitment.fleet_message(is_host))
+                return True
+
+            game_loop(screen, client, is_server=is_host, sound_config=sound_config,
+                      commitment=commitment, enemy_digest=enemy_digest,
+                      spectators=RelayPublisher(client) if is_host else None,
+                      session=make_session(client, rejoin, is_host))
             client.close()
 
 if __name__ == "__main__":
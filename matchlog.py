@@ -0,0 +1,176 @@
+"""
+Registro binário das partidas: só acrescenta, registros de tamanho fixo.
+
+Dois arquivos em LOG_DIR:
+  matches.log  registros de 16 bytes (<BBHIQ: tipo, jogador, a, partida, valor)
+  matches.idx  uma entrada de 16 bytes por partida (<QII: posição, registros, 0)
+
+Tipos de registro:
+  START  jogador = modo (MODES), a = tamanho do tabuleiro, valor = início (ms Unix)
+  SHIP   a = índice do navio, valor = x | y << 8 | tamanho << 16 | horizontal << 24
+  SHOT   a = célula (y*size + x), valor = acerto | afundou << 1 | ms desde o início << 8
+  END    jogador = vencedor (NO_WINNER se abandonada), a = tiros, valor = duração (ms)
+
+Cada partida é gravada de uma vez ao terminar (MatchRecorder.finish), então
+seus registros ficam contíguos e o índice aponta direto para eles. O
+índice e o log são lidos com mmap: abrir a partida N custa O(registros
+dela), não uma leitura do arquivo todo. Um processo gravando por vez.
+"""
+import mmap
+import os
+import struct
+import time
+from collections import namedtuple
+
+from board import mask_to_cells
+
+LOG_DIR = os.environ.get("BATALHA_LOG_DIR", os.path.join(os.path.expanduser("~"), ".batalha_naval"))
+
+RECORD = struct.Struct("<BBHIQ")
+INDEX = struct.Struct("<QII")
+
+START, SHIP, SHOT, END = 1, 2, 3, 4
+MODES = {"local": 0, "ai": 1, "network": 2}
+NO_WINNER = 255
+
+Shot = namedtuple("Shot", "player cell hit sunk ms")
+Match = namedtuple("Match", "id mode size started fleets shots winner duration_ms")
+
+
+def ship_value(cells):
+    """Navio (lista de (x, y)) -> valor do registro SHIP."""
+    xs = [x for x, _ in cells]
+    ys = [y for _, y in cells]
+    horizontal = len(set(ys)) == 1
+    return min(xs) | min(ys) << 8 | len(cells) << 16 | horizontal << 24
+
+
+def ship_cells(value):
+    """Valor do registro SHIP -> lista de (x, y)."""
+    x, y, length, horizontal = value & 0xFF, value >> 8 & 0xFF, value >> 16 & 0xFF, value >> 24 & 1
+    return [(x + i, y) if horizontal else (x, y + i) for i in range(length)]
+
+
+class MatchRecorder:
+    """Acumula os registros de uma partida; finish() grava tudo no log."""
+
+    def __init__(self, log, mode, size=10):
+        self.log = log
+        self.size = size
+        self.start = time.monotonic()
+        self.shots = 0
+        self.records = [(START, MODES[mode], size, int(time.time() * 1000))]
+        self.done = False
+
+    def _ms(self):
+        return int((time.monotonic() - self.start) * 1000)
+
+    def fleet(self, player, ships):
+        """ships: lista de navios (listas de (x, y)), ex. de Board.ships."""
+        for i, cells in enumerate(ships):
+            self.records.append((SHIP, player, i, ship_value(cells)))
+
+    def fleet_from_board(self, player, board):
+        self.fleet(player, [mask_to_cells(mask, board.size) for mask in board.ship_masks])
+
+    def shot(self, player, cell, hit, sunk=False):
+        x, y = cell
+        self.shots += 1
+        flags = bool(hit) | bool(sunk) << 1
+        self.records.append((SHOT, player, y * self.size + x, flags | self._ms() << 8))
+
+    def finish(self, winner=None):
+        """Grava a partida (winner = índice do jogador ou None). Retorna o id, ou None se falhar."""
+        if self.done:
+            return None
+        self.done = True
+        self.records.append((END, NO_WINNER if winner is None else winner, self.shots, self._ms()))
+        try:
+            return self.log.append(self.records)
+        except OSError:
+            return None  # registro é opcional: sem disco, a partida segue
+
+
+class MatchLog:
+    def __init__(self, directory=LOG_DIR):
+        self.directory = directory
+        self.log_path = os.path.join(directory, "matches.log")
+        self.index_path = os.path.join(directory, "matches.idx")
+        self._maps = {}  # caminho -> (tamanho mapeado, mmap)
+
+    # ------- Escrita -------
+    def recorder(self, mode, size=10):
+        return MatchRecorder(self, mode, size)
+
+    def append(self, records):
+        """Acrescenta uma partida inteira (lista de tuplas de registro). Retorna o id."""
+        os.makedirs(self.directory, exist_ok=True)
+        match_id = self.count()
+        body = b"".join(RECORD.pack(kind, player, a, match_id, value)
+                        for kind, player, a, value in records)
+        with open(self.log_path, "ab") as log:
+            offset = log.tell()
+            log.write(body)
+        # O índice por último: uma queda no meio deixa só registros órfãos no log
+        with open(self.index_path, "ab") as index:
+            index.write(INDEX.pack(offset, len(records), 0))
+        return match_id
+
+    # ------- Leitura -------
+    def _map(self, path):
+        """mmap somente leitura de path, refeito quando o arquivo cresce."""
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return None
+        mapped = self._maps.get(path)
+        if mapped and mapped[0] == size:
+            return mapped[1]
+        if mapped:
+            mapped[1].close()
+        if size == 0:
+            self._maps.pop(path, None)
+            return None
+        with open(path, "rb") as f:
+            view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps[path] = (size, view)
+        return view
+
+    def count(self):
+        """Número de partidas registradas."""
+        try:
+            return os.path.getsize(self.index_path) // INDEX.size
+        except OSError:
+            return 0
+
+    def records(self, match_id):
+        """Registros crus (tuplas) da partida match_id, direto do mmap."""
+        if not 0 <= match_id < self.count():
+            raise IndexError(f"Partida {match_id} não existe")
+        index = self._map(self.index_path)
+        offset, n, _ = INDEX.unpack_from(index, match_id * INDEX.size)
+        log = self._map(self.log_path)
+        return list(RECORD.iter_unpack(log[offset:offset + n * RECORD.size]))
+
+    def match(self, match_id):
+        """Partida match_id decodificada (Match)."""
+        mode = size = started = winner = duration = None
+        fleets = {}
+        shots = []
+        for kind, player, a, _, value in self.records(match_id):
+            if kind == START:
+                mode = next((name for name, code in MODES.items() if code == player), player)
+                size, started = a, value
+            elif kind == SHIP:
+                fleets.setdefault(player, []).append(ship_cells(value))
+            elif kind == SHOT:
+                shots.append(Shot(player, (a % size, a // size), bool(value & 1), bool(value & 2), value >> 8))
+            elif kind == END:
+                winner = None if player == NO_WINNER else player
+                duration = value
+        return Match(match_id, mode, size, started, fleets, shots, winner, duration)
+
+    def close(self):
+        for _, view in self._maps.values():
+            view.close()
+        self._maps.clear()
@@ -1,28 +1,75 @@
 import socket
-import json
+import threading
+import time
+from queue import Queue, Empty
 
-class NetworkServer:
-    def __init__(self, host='0.0.0.0', port=5000):
-        self.conn = None
-        self.addr = None
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.sock.bind((host, port))
-        self.sock.listen(1)
-        print(f"Servidor ouvindo em {host}:{port}...")
+from profiler import PROFILER
+from protocol import encode, decode
 
-    def accept(self):
-        self.conn, self.addr = self.sock.accept()
-        print(f"Conectado com {self.addr}")
+HEARTBEAT_INTERVAL = 1.0  # segundos entre pings
+DEAD_AFTER = 5.0          # sem nenhum quadro nesse tempo, a conexão caiu
 
-    def send(self, data):
-        if self.conn:
-            msg = json.dumps(data).encode()
-            # envia tamanho da mensagem + mensagem (para evitar parcial)
+
+def _stamp():
+    """Marca de tempo do ping: microssegundos, módulo 2³² (volta a cada ~71 min)."""
+    return int(time.monotonic() * 1e6) & 0xFFFFFFFF
+
+
+class _Connection:
+    """
+    Envio/recebimento enquadrado (4 bytes de tamanho + corpo) sobre self.conn,
+    mais o heartbeat: depois de start_heartbeat() os dois lados trocam
+    ping/pong; o pong mede a latência (rtt, em ms) e, se nenhum quadro
+    chegar em dead_after segundos, receive() lança socket.timeout.
+    ping/pong são tratados aqui dentro e nunca chegam a quem chama receive().
+    session guarda o token combinado em protocol.negotiate (ou None); ele
+    sobrevive a disconnect() e a uma nova conexão, para retomar a partida.
+    """
+
+    def _setup_connection(self, conn):
+        self.conn = conn
+        self.codec = "json"  # trocado por protocol.negotiate
+        self.rtt = None       # latência suavizada (ms), None antes do primeiro pong
+        self.last_rtt = None
+        self._send_lock = threading.Lock()
+        self._heartbeat = None
+        self._closed = threading.Event()
+        # Tiros são quadros de poucos bytes: sem Nagle eles saem na hora
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def set_timeout(self, seconds):
+        """Prazo de cada leitura (None = sem limite); estouro vira socket.timeout."""
+        self.conn.settimeout(seconds)
+
+    def start_heartbeat(self, interval=HEARTBEAT_INTERVAL, dead_after=DEAD_AFTER):
+        """Começa a mandar pings e passa a considerar morta uma conexão muda."""
+        self.set_timeout(dead_after)
+        if self._heartbeat is None:
+            self._heartbeat = threading.Thread(target=self._ping_loop, args=(interval, self._closed),
+                                               daemon=True)
+            self._heartbeat.start()
+
+    def _ping_loop(self, interval, closed):
+        # closed é o da conexão atual: depois de uma reconexão este ping para
+        while not closed.wait(interval):
+            try:
+                self.send({"action": "ping", "t": _stamp()})
+            except OSError:
+                return
+
+    def send(self, data, codec=None):
+        msg = encode(data, codec or self.codec)
+        # envia tamanho da mensagem + mensagem (para evitar parcial);
+        # o lock impede que o ping do heartbeat se intercale com outro quadro
+        with self._send_lock:
             self.conn.sendall(len(msg).to_bytes(4, 'big') + msg)
 
     def receive(self):
-        if self.conn:
+        """
+        Próxima mensagem (dict), ou None se a conexão fechou; responde pings
+        no caminho. Quadro malformado lança ValueError.
+        """
+        while True:
             # ler tamanho da mensagem primeiro
             raw_len = self._recvall(4)
             if not raw_len:
@@ -31,51 +78,163 @@ class NetworkServer:
             data = self._recvall(msg_len)
             if not data:
                 return None
-            return json.loads(data.decode())
-        return None
+            data = decode(data)
+            if not isinstance(data, dict):
+                raise ValueError(f"Mensagem não é um objeto: {data!r}")
+            action = data.get("action")
+            if action in ("ping", "pong") and not isinstance(data.get("t"), int):
+                raise ValueError(f"{action} sem carimbo de tempo")
+            if action == "ping":
+                self.send({"action": "pong", "t": data["t"]})
+            elif action == "pong":
+                self._update_rtt(((_stamp() - data["t"]) & 0xFFFFFFFF) / 1000.0)
+            else:
+                return data
+
+    def _update_rtt(self, ms):
+        self.last_rtt = ms
+        self.rtt = ms if self.rtt is None else 0.8 * self.rtt + 0.2 * ms
+        PROFILER.record("rtt_ping", ms)
 
     def _recvall(self, n):
         data = b''
-        while len(data) < n:
-            packet = self.conn.recv(n - len(data))
-            if not packet:
-                return None
-            data += packet
+        with PROFILER.section("recv_blocked"):
+            while len(data) < n:
+                packet = self.conn.recv(n - len(data))
+                if not packet:
+                    return None
+                data += packet
         return data
 
-    def close(self):
+    def disconnect(self):
+        """Fecha só a conexão com o outro lado (o servidor continua ouvindo)."""
         if self.conn:
+            self._closed.set()
             self.conn.close()
-        self.sock.close()
 
-class NetworkClient:
-    def __init__(self, host='localhost', port=5000):
+    def close(self):
+        self.disconnect()
+
+
+class NetworkServer(_Connection):
+    def __init__(self, host='0.0.0.0', port=5000):
+        self.conn = None
+        self.addr = None
+        self.codec = "json"
+        self.session = None
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.sock.connect((host, port))
-        print(f"Conectado ao servidor {host}:{port}")
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((host, port))
+        self.sock.listen(1)
+        print(f"Servidor ouvindo em {host}:{port}...")
 
-    def send(self, data):
-        msg = json.dumps(data).encode()
-        self.sock.sendall(len(msg).to_bytes(4, 'big') + msg)
+    def accept(self, timeout=None):
+        """
+        Espera um cliente por até timeout segundos (None = sem limite).
+        Retorna False se o prazo estourar ou o socket for fechado (cancelar).
+        """
+        self.sock.settimeout(timeout)
+        try:
+            conn, self.addr = self.sock.accept()
+        except OSError:
+            return False
+        conn.settimeout(None)
+        self._setup_connection(conn)
+        print(f"Conectado com {self.addr}")
+        return True
 
-    def receive(self):
-        raw_len = self._recvall(4)
-        if not raw_len:
-            return None
-        msg_len = int.from_bytes(raw_len, 'big')
-        data = self._recvall(msg_len)
-        if not data:
-            return None
-        return json.loads(data.decode())
+    def send(self, data, codec=None):
+        if self.conn:
+            super().send(data, codec)
 
-    def _recvall(self, n):
-        data = b''
-        while len(data) < n:
-            packet = self.sock.recv(n - len(data))
-            if not packet:
-                return None
-            data += packet
-        return data
+    def receive(self):
+        if self.conn:
+            return super().receive()
+        return None
 
     def close(self):
+        super().close()
         self.sock.close()
+
+class NetworkClient(_Connection):
+    def __init__(self, host='localhost', port=5000, connect_timeout=5.0):
+        self.address = (host, port)
+        self.session = None
+        self.sock = socket.create_connection(self.address, timeout=connect_timeout)
+        self.sock.settimeout(None)
+        self._setup_connection(self.sock)
+        print(f"Conectado ao servidor {host}:{port}")
+
+    def reconnect(self, connect_timeout=5.0):
+        """Fecha a conexão atual e conecta de novo ao mesmo endereço (codec volta a json)."""
+        self.disconnect()
+        self.sock = socket.create_connection(self.address, timeout=connect_timeout)
+        self.sock.settimeout(None)
+        self._setup_connection(self.sock)
+        return True
+
+    def join_room(self, room=None):
+        """
+        Entra numa sala do relay (relay.py). Retorna (sala, is_host) ou
+        (None, False) se a sala estiver cheia ou a conexão cair.
+        """
+        self.send({"action": "join", "room": room})
+        reply = self.receive()
+        if not reply or reply.get("action") != "joined":
+            return None, False
+        return reply["room"], reply["is_host"]
+
+    def wait_paired(self):
+        """Bloqueia até o relay avisar que o outro jogador entrou na sala."""
+        reply = self.receive()
+        return bool(reply and reply.get("action") == "paired")
+
+class Receiver:
+    """
+    Lê mensagens de um NetworkServer/NetworkClient numa thread e entrega
+    por uma fila, para o loop do jogo nunca bloquear em receive().
+    Queda de conexão vira a mensagem {"action": "disconnected"}.
+    notify (opcional) é chamada, na thread de leitura, a cada mensagem
+    enfileirada; serve para acordar um loop que esteja bloqueado.
+    """
+
+    def __init__(self, network, notify=None):
+        self.network = network
+        self.notify = notify
+        self.queue = Queue()
+        self.connected = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                data = self.network.receive()
+            except (OSError, ValueError):
+                data = None
+            if data is None:
+                self.connected = False
+                self._put({"action": "disconnected"})
+                return
+            self._put(data)
+
+    def _put(self, data):
+        self.queue.put(data)
+        if self.notify is not None:
+            self.notify()
+
+    def poll(self):
+        """Todas as mensagens já recebidas, sem esperar."""
+        messages = []
+        while True:
+            try:
+                messages.append(self.queue.get_nowait())
+            except Empty:
+                return messages
+
+    def get(self, timeout=None):
+        """Próxima mensagem, ou None se nada chegar em timeout segundos."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except Empty:
+            return None
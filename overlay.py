@@ -0,0 +1,67 @@
+"""
+Overlay de depuração: FPS e percentis do profiler.PROFILER na tela.
+
+O painel é redesenhado no máximo a cada REFRESH_MS e fica num canto
+livre de cada tela; quem chama só inclui os retângulos devolvidos no
+pygame.display.update. Ao desligar (F3) o painel pinta o fundo de volta.
+"""
+import pygame
+
+from animation import now_ms
+from profiler import PROFILER
+from text_cache import get_font
+
+REFRESH_MS = 250
+LINE_HEIGHT = 16
+# (métrica, rótulo) na ordem do painel
+METRICS = (
+    ("frame", "quadro"),
+    ("events", "eventos"),
+    ("draw", "desenho"),
+    ("flip", "flip"),
+    ("rtt_attack", "rtt tiro"),
+    ("recv_blocked", "recv"),
+)
+
+
+class DebugOverlay:
+    def __init__(self, topleft, width=300, background=(0, 0, 0), profiler=PROFILER):
+        self.rect = pygame.Rect(topleft, (width, LINE_HEIGHT * (len(METRICS) + 1) + 8))
+        self.background = background
+        self.profiler = profiler
+        self._next_ms = 0.0
+        self._shown = False
+
+    def invalidate(self):
+        """Redesenha no próximo quadro (ex.: a tela foi apagada por cima)."""
+        self._next_ms = 0.0
+
+    def _lines(self):
+        yield f"FPS {self.profiler.fps():5.1f}   p50/p95/p99 ms"
+        for name, label in METRICS:
+            values = self.profiler.percentiles(name)
+            if values is not None:
+                yield f"{label:<9}" + "/".join(f"{v:.1f}" for v in values)
+
+    def draw(self, surface):
+        """Atualiza o painel se for a hora; retorna os retângulos alterados."""
+        if not self.profiler.enabled:
+            if self._shown:  # acabou de desligar: apaga o painel
+                self._shown = False
+                surface.fill(self.background, self.rect)
+                return [self.rect]
+            return []
+        now = now_ms()
+        if self._shown and now < self._next_ms:
+            return []
+        self._next_ms = now + REFRESH_MS
+        self._shown = True
+        surface.fill(self.background, self.rect)
+        font = get_font("monospace", 14)
+        y = self.rect.top + 4
+        for line in self._lines():
+            # Os números mudam a cada quadro: render direto, sem encher o cache de textos
+            surface.blit(font.render(line, True, (255, 255, 0)), (self.rect.left + 4, y))
+            y += LINE_HEIGHT
+        return [self.rect]
+
@@ -0,0 +1,273 @@
+"""
+Sorteio rápido de frotas a partir de máscaras de posições legais.
+
+Para cada tamanho de navio as posições possíveis (horizontal e vertical)
+são calculadas uma vez como bitmasks de board.Board, e cada célula guarda
+quais dessas posições a usam. Ao posicionar um navio, as posições legais
+dos próximos são atualizadas pela vizinhança dele (um AND por célula),
+sem sortear coordenadas e testar de novo como em randomize_ships.
+Opcionalmente, varreduras de Gibbs (re-sortear um navio entre as posições
+legais dadas as outras) aproximam a distribuição uniforme sobre as frotas
+válidas: no 10x10 duas varreduras já ficam no nível do ruído de
+amostragem, frotas apertadas (ex. 6x6) continuam com algum viés e pedem mais.
+"""
+import random
+from functools import lru_cache
+
+from board import mask_to_cells, neighbourhood, ship_mask
+
+SEARCH_BUDGET = 20_000  # nós da busca em profundidade antes de desistir
+
+
+def popcount(mask):
+    """Número de bits ligados."""
+    return bin(mask).count("1")  # int.bit_count só existe a partir do 3.10
+
+
+@lru_cache(maxsize=None)
+def legal_placements(size, length):
+    """Todas as máscaras de um navio de tamanho length num tabuleiro vazio."""
+    masks = []
+    for horizontal in (True, False):
+        for y in range(size):
+            for x in range(size):
+                mask = ship_mask(size, x, y, length, horizontal)
+                if mask and mask not in masks:
+                    masks.append(mask)
+    return tuple(masks)
+
+
+@lru_cache(maxsize=None)
+def cell_conflicts(size, length):
+    """
+    Para cada célula, bitmask dos índices de legal_placements(size, length)
+    que usam essa célula. Bloquear células vira OR desses bitmasks.
+    """
+    conflict = [0] * (size * size)
+    for k, mask in enumerate(legal_placements(size, length)):
+        while mask:
+            low = mask & -mask
+            conflict[low.bit_length() - 1] |= 1 << k
+            mask ^= low
+    return conflict
+
+
+def blocked_placements(size, length, cells):
+    """Índices (em bitmask) das posições que tocam alguma célula de cells."""
+    conflict = cell_conflicts(size, length)
+    blocked = 0
+    while cells:
+        low = cells & -cells
+        blocked |= conflict[low.bit_length() - 1]
+        cells ^= low
+    return blocked
+
+
+@lru_cache(maxsize=None)
+def _halo_conflicts(size, length, other):
+    """
+    Para cada posição de um navio de tamanho length, bitmask das posições
+    de um navio de tamanho other que ela proíbe (sobreposição ou encosto).
+    """
+    return tuple(blocked_placements(size, other, neighbourhood(mask, size))
+                 for mask in legal_placements(size, length))
+
+
+def _pick(options, total, rng):
+    """Índice de um bit ligado de options (< total) escolhido uniformemente."""
+    # Sorteio com rejeição resolve rápido quando há muitas posições livres
+    for _ in range(8):
+        k = int(rng.random() * total)  # randrange custa o dobro e total é pequeno
+        if options >> k & 1:
+            return k
+    for _ in range(rng.randrange(popcount(options))):
+        options &= options - 1
+    return (options & -options).bit_length() - 1
+
+
+class _Exhausted(Exception):
+    pass
+
+
+def _search(size, lengths, blocked, budget=SEARCH_BUDGET):
+    """
+    Busca em profundidade por uma frota válida (maiores navios primeiro).
+    None se não houver frota ou se a busca passar de budget nós.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: -lengths[i])
+    chosen = [0] * len(lengths)
+    nodes = [0]
+
+    def place(k, blocked):
+        if k == len(order):
+            return True
+        nodes[0] += 1
+        if nodes[0] > budget:
+            raise _Exhausted
+        i = order[k]
+        for mask in legal_placements(size, lengths[i]):
+            if not mask & blocked:
+                chosen[i] = mask
+                if place(k + 1, blocked | neighbourhood(mask, size)):
+                    return True
+        return False
+
+    try:
+        return list(chosen) if place(0, blocked) else None
+    except _Exhausted:
+        return None
+
+
+def is_feasible(size, lengths):
+    """
+    True se a frota cabe no tabuleiro sem navios encostados. Frotas no
+    limite que a busca não resolve em SEARCH_BUDGET nós contam como não.
+    """
+    return _reference_layout(size, tuple(lengths)) is not None
+
+
+@lru_cache(maxsize=None)
+def _reference_layout(size, lengths):
+    if any(length > size or length < 1 for length in lengths):
+        return None
+    # Cada navio + sua borda direita/inferior ocupa (tam+1)×2 células de
+    # uma grade (size+1)×(size+1), sem sobreposição
+    if sum((length + 1) * 2 for length in lengths) > (size + 1) ** 2:
+        return None
+    # As células de um bloco 2×2 são todas vizinhas: cada bloco tem no
+    # máximo um navio, e um navio de tamanho L passa por ceil(L/2) blocos
+    half = (size + 1) // 2
+    if sum((length + 1) // 2 for length in lengths) > half * half:
+        return None
+    layout = _search(size, lengths, 0)
+    return tuple(layout) if layout is not None else None
+
+
+@lru_cache(maxsize=None)
+def _legal_set(size, length):
+    return frozenset(legal_placements(size, length))
+
+
+def validate_fleet(ships, lengths, size=10, touching=True):
+    """
+    Confere uma frota recebida pela rede: cada navio é uma posição legal
+    (reto, contíguo, dentro do tabuleiro), os tamanhos batem com lengths
+    e não há sobreposição. touching=False também proíbe navios encostados
+    (regra de Board.can_place_ship). Retorna as máscaras dos navios ou
+    lança ValueError.
+    """
+    if not isinstance(ships, (list, tuple)) or len(ships) != len(lengths):
+        raise ValueError("número de navios errado")
+    masks = []
+    taken = 0
+    for ship in ships:
+        mask = 0
+        for cell in ship:
+            x, y = cell
+            if not (isinstance(x, int) and isinstance(y, int) and 0 <= x < size and 0 <= y < size):
+                raise ValueError(f"célula fora do tabuleiro: {cell}")
+            mask |= 1 << (y * size + x)
+        if len(ship) not in lengths or mask not in _legal_set(size, len(ship)):
+            raise ValueError(f"navio inválido: {ship}")
+        if mask & (taken if touching else neighbourhood(taken, size)):
+            raise ValueError("navios sobrepostos" if mask & taken else "navios encostados")
+        taken |= mask
+        masks.append(mask)
+    if sorted(map(popcount, masks)) != sorted(lengths):
+        raise ValueError("tamanhos dos navios não batem com a frota")
+    return masks
+
+
+class FleetSampler:
+    """
+    Sorteia frotas válidas (mesmas regras de Board.can_place_ship).
+    Lança ValueError na criação se a frota não couber no tabuleiro.
+    Com sweeps=0 cada navio, do maior ao menor, sorteia uniformemente entre
+    as posições que sobraram (a mesma distribuição de sortear coordenadas e
+    testar, só que sem rejeição). Quem precisa de frotas perto da
+    distribuição uniforme (MonteCarloAI) pede varreduras de Gibbs, que
+    reduzem o viés das primeiras posições sorteadas.
+    """
+
+    def __init__(self, lengths, size=10, sweeps=0, max_restarts=20):
+        self.lengths = tuple(lengths)
+        self.size = size
+        self.sweeps = sweeps
+        self.max_restarts = max_restarts
+        self._reference = _reference_layout(size, self.lengths)
+        if self._reference is None:
+            raise ValueError(f"Frota {list(self.lengths)} não cabe num tabuleiro {size}x{size}")
+        self._order = sorted(range(len(self.lengths)), key=lambda i: -self.lengths[i])
+        self._distinct = sorted(set(self.lengths))
+        # Todas as posições de cada tamanho, como bitmask de índices
+        self._count = {length: len(legal_placements(size, length)) for length in self._distinct}
+        self._all = {length: (1 << count) - 1 for length, count in self._count.items()}
+
+    def _sequential(self, rng, blocked):
+        """Índices das posições escolhidas em ordem; None se algum navio ficar sem posição."""
+        size = self.size
+        forbidden = {length: blocked_placements(size, length, blocked) for length in self._distinct}
+        chosen = [0] * len(self.lengths)
+        for i in self._order:
+            length = self.lengths[i]
+            options = self._all[length] & ~forbidden[length]
+            if not options:
+                return None
+            chosen[i] = k = _pick(options, self._count[length], rng)
+            for other in self._distinct:
+                forbidden[other] |= _halo_conflicts(size, length, other)[k]
+        return chosen
+
+    def _gibbs(self, chosen, rng, blocked):
+        """Re-sorteia cada navio entre as posições legais dadas as outras."""
+        size = self.size
+        lengths = self.lengths
+        for _ in range(self.sweeps):
+            for i, length in enumerate(lengths):
+                taken = blocked_placements(size, length, blocked) if blocked else 0
+                for j, k in enumerate(chosen):
+                    if j != i:
+                        taken |= _halo_conflicts(size, lengths[j], length)[k]
+                chosen[i] = _pick(self._all[length] & ~taken, self._count[length], rng)
+        return chosen
+
+    def _to_masks(self, chosen):
+        return [legal_placements(self.size, length)[k] for length, k in zip(self.lengths, chosen)]
+
+    def sample_masks(self, rng=None, blocked=0, budget=SEARCH_BUDGET):
+        """
+        Uma frota como lista de máscaras, na ordem de lengths. budget limita
+        a busca de reserva (em nós) quando blocked deixa poucas saídas;
+        ValueError se ela não achar frota.
+        """
+        rng = rng or random
+        for _ in range(self.max_restarts):
+            chosen = self._sequential(rng, blocked)
+            if chosen is not None:
+                return self._to_masks(self._gibbs(chosen, rng, blocked))
+        # Muitos becos sem saída: parte de uma frota válida conhecida
+        if blocked:
+            layout = _search(self.size, self.lengths, blocked, budget)
+            if layout is None:
+                raise ValueError("Frota não cabe nas células livres do tabuleiro")
+        else:
+            layout = self._reference
+        chosen = [legal_placements(self.size, length).index(mask)
+                  for length, mask in zip(self.lengths, layout)]
+        return self._to_masks(self._gibbs(chosen, rng, blocked))
+
+    def sample(self, rng=None, blocked=0):
+        """Uma frota como lista de navios, cada um uma lista de (x, y)."""
+        return [mask_to_cells(m, self.size) for m in self.sample_masks(rng, blocked)]
+
+    def layouts(self, n, rng=None):
+        """Gera n frotas (listas de máscaras) em sequência."""
+        rng = rng or random
+        for _ in range(n):
+            yield self.sample_masks(rng)
+
+
+@lru_cache(maxsize=None)
+def sampler_for(size, lengths, sweeps=0):
+    """FleetSampler compartilhado por tamanho de tabuleiro, frota e varreduras."""
+    return FleetSampler(lengths, size, sweeps)
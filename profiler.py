@@ -0,0 +1,119 @@
+"""
+Medição de tempos por quadro e da rede, para separar travada de desenho
+de travada de rede (sem pygame).
+
+PROFILER guarda as últimas amostras de cada métrica (para FPS e
+percentis ao vivo no overlay.py) e um histograma de toda a sessão em
+faixas de 1 ms. Desligado, section() e record() quase não custam nada.
+'frame' é só o trabalho do quadro: a espera do loop por eventos
+(event_loop.LoopDriver, dentro de idle()) fica de fora; fps() usa o relógio.
+
+Ligar: tecla F3 nas telas de jogo, ou BATALHA_DEBUG=1 no ambiente.
+BATALHA_DEBUG_CSV=arquivo.csv grava os histogramas ao sair.
+"""
+import atexit
+import csv
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+
+class FrameProfiler:
+    def __init__(self, window=300, enabled=False):
+        self.window = window
+        self.enabled = enabled
+        self.recent = {}      # métrica -> deque das últimas amostras (ms)
+        self.histograms = {}  # métrica -> Counter de faixas de 1 ms
+        self._last_frame = None
+        self._idle = 0.0  # segundos ociosos desde a última marca de quadro
+        self._marks = deque(maxlen=window)  # instantes das marcas, para o FPS
+        self._lock = threading.Lock()  # a rede registra da thread do Receiver
+
+    def record(self, name, ms):
+        if not self.enabled:
+            return
+        with self._lock:
+            recent = self.recent.get(name)
+            if recent is None:
+                recent = self.recent[name] = deque(maxlen=self.window)
+                self.histograms[name] = Counter()
+            recent.append(ms)
+            self.histograms[name][int(ms)] += 1
+
+    @contextmanager
+    def section(self, name):
+        """Mede o bloco with como uma amostra de name."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000.0)
+
+    @contextmanager
+    def idle(self):
+        """Espera do loop (event.wait, clock.tick): fica fora de 'frame'."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._idle += time.perf_counter() - start
+
+    def frame(self):
+        """
+        Marca o fim de um quadro; o intervalo entre marcas, sem o tempo
+        ocioso de idle(), vira 'frame'.
+        """
+        now = time.perf_counter()
+        if self.enabled:
+            if self._last_frame is not None:
+                self.record("frame", max(0.0, now - self._last_frame - self._idle) * 1000.0)
+            self._marks.append(now)
+        self._last_frame = now
+        self._idle = 0.0
+
+    def fps(self):
+        """Quadros por segundo de relógio, com as esperas incluídas."""
+        marks = self._marks
+        if len(marks) < 2 or marks[-1] == marks[0]:
+            return 0.0
+        return (len(marks) - 1) / (marks[-1] - marks[0])
+
+    def percentiles(self, name, ps=(50, 95, 99)):
+        """Percentis (ms) das amostras recentes de name, ou None sem amostras."""
+        with self._lock:
+            samples = sorted(self.recent.get(name, ()))
+        if not samples:
+            return None
+        return tuple(samples[min(len(samples) - 1, int(p / 100.0 * len(samples)))] for p in ps)
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self._last_frame = None
+        self._marks.clear()
+        return self.enabled
+
+    def dump_csv(self, path):
+        """Grava metric,ms,count (faixas de 1 ms) de toda a sessão."""
+        with self._lock:
+            rows = [(name, bucket, count)
+                    for name, hist in sorted(self.histograms.items())
+                    for bucket, count in sorted(hist.items())]
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(("metric", "ms", "count"))
+            writer.writerows(rows)
+
+
+_csv_path = os.environ.get("BATALHA_DEBUG_CSV")
+PROFILER = FrameProfiler(enabled=os.environ.get("BATALHA_DEBUG") == "1" or bool(_csv_path))
+
+if _csv_path:
+    atexit.register(lambda: PROFILER.dump_csv(_csv_path))
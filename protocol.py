@@ -0,0 +1,156 @@
+"""
+Codificação das mensagens de rede: JSON ou binário compacto.
+
+Todo quadro continua com 4 bytes de tamanho na frente. Quadros JSON
+começam com '{'; quadros binários começam com um opcode < 0x20, então
+decode() reconhece os dois sem saber o codec combinado.
+
+Binário (codec "bin1"):
+  attack     B op, B x, B y                          (3 bytes)
+  ping/pong  B op, I marca de tempo (µs, módulo 2³²)  (5 bytes)
+  shot       B op, I seq, B jogador, B x, B y, B flags (9 bytes; espectadores)
+             flags: acerto | afundou << 1 | fim de jogo << 2
+  result     B op, B flags, 2 bytes (x, y) por célula do navio afundado
+             flags: acerto | fim de jogo << 1         (2 bytes sem afundar)
+  commit     B op, 32 bytes do SHA-256 da frota       (33 bytes)
+Os opcodes 0x02-0x04 (hit, game_over, ships) eram da troca de frotas
+entre os jogadores e não são mais usados: a frota não sai de quem a
+posicionou (ver referee.py).
+Mensagens sem opcode (join, hello, reveal, ...) seguem em JSON.
+"""
+import json
+import struct
+
+CODECS = ("bin1", "json")  # em ordem de preferência
+
+OP_ATTACK = 0x01
+OP_PING = 0x05
+OP_PONG = 0x06
+OP_SHOT = 0x07
+OP_RESULT = 0x08
+OP_COMMIT = 0x09
+
+_ATTACK = struct.Struct("BBB")
+_FLAG = struct.Struct("BB")
+_STAMP = struct.Struct(">BI")
+_SHOT = struct.Struct(">BIBBBB")
+_HEARTBEAT_OPS = {"ping": OP_PING, "pong": OP_PONG}
+_RESULT_KEYS = {"action", "hit", "sunk", "over"}
+
+
+def result_message(shot):
+    """Resposta a um ataque a partir de um game.ShotResult (tiro no nosso tabuleiro)."""
+    return {"action": "result", "hit": bool(shot.hit),
+            "sunk": [list(c) for c in shot.sunk] if shot.sunk else None,
+            "over": shot.winner is not None}
+
+
+def _is_cell(cell):
+    return (isinstance(cell, (list, tuple)) and len(cell) == 2
+            and all(isinstance(v, int) and not isinstance(v, bool) for v in cell))
+
+
+def check_result(data):
+    """
+    (hit, sunk, over) de uma mensagem result vinda da rede, com os tipos
+    conferidos (o JSON aceita qualquer coisa). Lança ValueError.
+    """
+    hit, sunk, over = data.get("hit"), data.get("sunk"), data.get("over")
+    if not isinstance(hit, bool) or not isinstance(over, bool):
+        raise ValueError(f"result malformado: {data!r}")
+    if sunk is not None and not (isinstance(sunk, list) and sunk and all(map(_is_cell, sunk))):
+        raise ValueError(f"navio afundado malformado: {sunk!r}")
+    return hit, sunk, over
+
+
+def attack_cell(data):
+    """Célula (x, y) de uma mensagem attack; ValueError se não for um par de inteiros."""
+    cell = data.get("cell")
+    if not _is_cell(cell):
+        raise ValueError(f"attack malformado: {data!r}")
+    return tuple(cell)
+
+
+def encode(data, codec="json"):
+    """Mensagem (dict) -> bytes do corpo do quadro."""
+    if codec == "bin1":
+        action = data.get("action")
+        if action == "attack" and len(data) == 2:
+            x, y = data["cell"]
+            return _ATTACK.pack(OP_ATTACK, x, y)
+        if action == "result" and data.keys() == _RESULT_KEYS:
+            out = bytearray(_FLAG.pack(OP_RESULT, bool(data["hit"]) | bool(data["over"]) << 1))
+            for x, y in data["sunk"] or ():
+                out += bytes((x, y))
+            return bytes(out)
+        if action == "commit" and len(data) == 2:
+            return bytes([OP_COMMIT]) + bytes.fromhex(data["digest"])
+        if action in _HEARTBEAT_OPS and len(data) == 2:
+            return _STAMP.pack(_HEARTBEAT_OPS[action], data["t"])
+        if action == "shot":
+            x, y = data["cell"]
+            flags = bool(data["hit"]) | bool(data["sunk"]) << 1 | bool(data["game_over"]) << 2
+            return _SHOT.pack(OP_SHOT, data["seq"], data["player"], x, y, flags)
+    return json.dumps(data).encode()
+
+
+def decode(payload):
+    """
+    Bytes do corpo do quadro -> mensagem (dict), qualquer codec.
+    Quadro malformado lança ValueError.
+    """
+    try:
+        return _decode(payload)
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"Quadro inválido: {e}") from e
+
+
+def _decode(payload):
+    op = payload[0] if payload else None
+    if op == OP_ATTACK:
+        _, x, y = _ATTACK.unpack(payload)
+        return {"action": "attack", "cell": [x, y]}
+    if op == OP_RESULT:
+        flags = payload[1]
+        cells = [list(payload[i:i + 2]) for i in range(2, len(payload) - 1, 2)]
+        return {"action": "result", "hit": bool(flags & 1), "sunk": cells or None,
+                "over": bool(flags & 2)}
+    if op == OP_COMMIT:
+        if len(payload) != 33:
+            raise ValueError("commit com tamanho errado")
+        return {"action": "commit", "digest": payload[1:].hex()}
+    if op in (OP_PING, OP_PONG):
+        _, stamp = _STAMP.unpack(payload)
+        return {"action": "ping" if op == OP_PING else "pong", "t": stamp}
+    if op == OP_SHOT:
+        _, seq, player, x, y, flags = _SHOT.unpack(payload)
+        return {"action": "shot", "seq": seq, "player": player, "cell": [x, y],
+                "hit": bool(flags & 1), "sunk": bool(flags & 2), "game_over": bool(flags & 4)}
+    return json.loads(payload.decode())
+
+
+def negotiate(network, is_host, session=None):
+    """
+    Combina o codec antes da troca dos compromissos de frota: o host
+    oferece CODECS e o outro lado escolhe o primeiro que conhece.
+    Define network.codec.
+    O host também pode oferecer um token de sessão (para retomar a partida
+    após uma queda); os dois lados o guardam em network.session.
+    """
+    if is_host:
+        hello = {"action": "hello", "codecs": list(CODECS)}
+        if session is not None:
+            hello["session"] = session
+        network.session = session
+        network.send(hello)
+        reply = network.receive()
+        if reply and reply.get("action") == "hello" and reply.get("codec") in CODECS:
+            network.codec = reply["codec"]
+        return network.codec
+    offer = network.receive()
+    offered = offer.get("codecs", []) if offer and offer.get("action") == "hello" else []
+    network.session = offer.get("session") if offered else None
+    codec = next((c for c in CODECS if c in offered), "json")
+    network.send({"action": "hello", "codec": codec})
+    network.codec = codec
+    return codec
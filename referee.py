@@ -0,0 +1,137 @@
+"""
+Partida em rede sem mandar a frota ao oponente.
+
+Cada jogador guarda a própria frota e responde aos ataques com o
+resultado ({"action": "result", "hit", "sunk", "over"}, protocol.OP_RESULT);
+quem atira só fica sabendo o que o tiro revelou. No lugar da frota, o
+handshake troca um compromisso (SHA-256 da frota com um sal aleatório,
+33 bytes em bin1). Ao fim da partida os dois revelam frota e sal, e
+check_reveal() confere as regras de posicionamento, o compromisso e se
+os resultados informados durante o jogo batem com a frota revelada.
+
+Pelo relay a partida pode ter juiz: cada jogador manda a frota só para o
+relay ({"action": "fleet", "ships", "host"}), que a valida na chegada,
+resolve os ataques com as regras de game.Game e responde ele mesmo a
+quem atirou. A resposta do defensor é descartada, então um jogador não
+consegue mentir sobre os próprios acertos. O cliente é o mesmo nos dois
+modos.
+"""
+import hashlib
+import hmac
+import json
+import secrets
+
+from board import Board, mask_to_cells
+from game import Game, fleet_lengths
+from placement import validate_fleet
+from protocol import result_message
+
+FLEET = "classica"  # frota do modo em rede (config.Config)
+
+
+def fleet_digest(ships, salt):
+    """Hash da frota; a ordem dos navios e das células não importa."""
+    canonical = sorted(sorted([x, y] for x, y in ship) for ship in ships)
+    return hashlib.sha256((salt + json.dumps(canonical)).encode()).hexdigest()
+
+
+class Commitment:
+    """A frota deste jogador e o sal do compromisso."""
+
+    def __init__(self, ships):
+        self.ships = [[list(cell) for cell in ship] for ship in ships]
+        self.salt = secrets.token_hex(16)
+        self.digest = fleet_digest(self.ships, self.salt)
+
+    def message(self):
+        return {"action": "commit", "digest": self.digest}
+
+    def reveal(self):
+        return {"action": "reveal", "ships": self.ships, "salt": self.salt}
+
+    def fleet_message(self, is_host):
+        """
+        Frota para o juiz do relay. O lugar vem da ordem de entrada na sala;
+        host só vale para reaver o lugar com a mesma frota após uma queda.
+        """
+        return {"action": "fleet", "ships": self.ships, "host": bool(is_host)}
+
+
+def check_reveal(reveal, digest, fired_board, over, size=10):
+    """
+    Confere a frota revelada pelo oponente contra o compromisso e contra
+    fired_board (nossos tiros nele, com os resultados que ele informou);
+    over: ele informou que a frota inteira afundou. Retorna os navios
+    (listas de (x, y)) ou lança ValueError.
+    """
+    try:
+        ships, salt = reveal["ships"], str(reveal["salt"])
+        masks = validate_fleet(ships, fleet_lengths(FLEET), size)
+        if not hmac.compare_digest(fleet_digest(ships, salt), str(digest)):
+            raise ValueError("frota diferente do compromisso")
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"revelação malformada: {e}") from e
+    fleet = 0
+    for mask in masks:
+        fleet |= mask
+    if fired_board.hit_mask & ~fleet or fired_board.miss_mask & fleet:
+        raise ValueError("acertos e erros informados não batem com a frota")
+    sunk = {mask for mask in masks if not mask & ~fired_board.hit_mask}
+    if sunk != set(fired_board.ship_masks):
+        raise ValueError("navios afundados informados não batem com a frota")
+    if over != (len(sunk) == len(masks)):
+        raise ValueError("fim de jogo informado não bate com a frota")
+    return [[tuple(cell) for cell in ship] for ship in ships]
+
+
+class Referee:
+    """
+    Juiz de uma sala do relay: as duas frotas e o Game com a ordem dos
+    turnos (lugar 0 = host, que começa). Não faz E/S; o relay passa os
+    quadros decodificados e envia o que ele devolver.
+    """
+
+    def __init__(self, size=10):
+        self.size = size
+        self.fleets = [None, None]
+        self.game = Game((0, 1), fleet=FLEET, size=size, boards={0: Board(size), 1: Board(size)})
+        self.last = None  # (lugar, célula, resposta) do último tiro resolvido
+
+    @property
+    def ready(self):
+        return None not in self.fleets
+
+    @property
+    def running(self):
+        return self.ready and not self.game.over
+
+    def register(self, seat, ships):
+        """
+        Frota do jogador no lugar seat. Na volta de uma queda o jogador
+        manda a mesma frota de novo: é ela que prova quem ele é.
+        Lança ValueError se a frota for inválida ou o lugar já for de outra.
+        """
+        masks = validate_fleet(ships, fleet_lengths(FLEET), self.size)
+        if self.fleets[seat] is not None:
+            if sorted(masks) != self.fleets[seat]:
+                raise ValueError("lugar ocupado por outra frota")
+            return
+        board = self.game.boards[seat]
+        for mask in masks:
+            board.place_ship(mask_to_cells(mask, self.size))
+        self.fleets[seat] = sorted(masks)
+
+    def attack(self, seat, cell):
+        """Resposta (dict result) para quem atirou, ou None se o tiro não vale."""
+        cell = tuple(cell)
+        if self.last is not None and self.last[:2] == (seat, cell):
+            return self.last[2]  # ataque reenviado após uma queda
+        if not self.ready or self.game.current != seat:
+            return None
+        shot = self.game.shoot(cell)
+        if shot is None:
+            return None
+        reply = result_message(shot)
+        self.last = (seat, cell, reply)
+        return reply
+
@@ -0,0 +1,268 @@
+"""
+Servidor relay assíncrono: muitas partidas em rede num só processo.
+
+Usa o mesmo enquadramento de network.py (4 bytes de tamanho + JSON).
+O cliente conecta e manda {"action": "join", "room": id}; sem id, entra
+na próxima sala livre. O primeiro da sala recebe "is_host": true e faz o
+papel do antigo NetworkServer. Com dois jogadores na sala, ambos recebem
+{"action": "paired"} e daí em diante cada quadro (hello, commit, resume,
+reveal...) é repassado ao outro jogador.
+
+O relay também é o juiz da sala (referee.Referee): cada jogador manda a
+frota só para ele ({"action": "fleet"}, nunca repassada), o relay valida
+o posicionamento e resolve cada ataque, respondendo a quem atirou no
+codec do ataque e repassando o ataque ao defensor. A resposta do
+defensor é descartada. Se alguém cair, o juiz da sala espera os dois
+voltarem por até session.RESUME_GRACE segundos; quem volta manda a mesma
+frota e recupera o seu lugar.
+
+Espectadores mandam {"action": "watch", "room": id} e passam a receber
+os deltas de tiro que o host da sala publica (quadros protocol.OP_SHOT,
+que o relay não repassa ao outro jogador); ver spectator.py.
+
+Execução: python relay.py [--host 0.0.0.0] [--port 5000]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+
+from protocol import OP_ATTACK, OP_PING, OP_PONG, OP_SHOT, attack_cell, decode, encode
+from referee import Referee
+from session import RESUME_GRACE
+from spectator import SpectatorHub
+
+MAX_FRAME = 1 << 20  # quadros maiores que 1 MiB derrubam a conexão
+
+
+async def read_frame(reader):
+    """Lê um quadro (bytes sem o cabeçalho) ou None se a conexão caiu."""
+    try:
+        header = await reader.readexactly(4)
+        size = int.from_bytes(header, 'big')
+        if size > MAX_FRAME:
+            return None
+        return await reader.readexactly(size)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+
+def encode_frame(data, codec="json"):
+    msg = json.dumps(data).encode() if codec == "json" else encode(data, codec)
+    return len(msg).to_bytes(4, 'big') + msg
+
+
+class Room:
+    def __init__(self, room_id):
+        self.room_id = room_id
+        self.players = []  # writers, o primeiro é o host
+        self.hub = SpectatorHub()
+        self.referee = Referee()
+        self.seats = {}    # writer -> lugar no juiz (0 = host), após mandar a frota
+        self.expiry = None  # fechamento adiado enquanto a partida espera quem caiu
+
+    def is_host(self, writer):
+        seat = self.seats.get(writer)
+        return seat == 0 if seat is not None else writer is self.players[0]
+
+    def peer_of(self, writer):
+        for other in self.players:
+            if other is not writer:
+                return other
+        return None
+
+
+class RelayServer:
+    def __init__(self, host='0.0.0.0', port=5000):
+        self.host = host
+        self.port = port
+        self.rooms = {}
+        self._ids = itertools.count(1)
+        self._open_room = None  # sala automática esperando o segundo jogador
+        self._server = None
+
+    def _join(self, room_id):
+        """Sala para o jogador, ou None se a sala pedida estiver cheia."""
+        if room_id is None:
+            room = self._open_room
+            if room is None or len(room.players) != 1:
+                room_id = str(next(self._ids))
+                while room_id in self.rooms:
+                    room_id = str(next(self._ids))
+                room = self.rooms[room_id] = Room(room_id)
+                self._open_room = room
+            return room
+        room_id = str(room_id)
+        if room_id not in self.rooms:
+            self.rooms[room_id] = Room(room_id)
+        room = self.rooms[room_id]
+        return room if len(room.players) < 2 else None
+
+    def _leave(self, room, writer):
+        if writer in room.players:
+            room.players.remove(writer)
+        room.seats.pop(writer, None)
+        if not room.players:
+            if room.referee.running:
+                # Partida no meio: o juiz espera os jogadores voltarem
+                if room.expiry is None:
+                    room.expiry = asyncio.get_running_loop().call_later(
+                        RESUME_GRACE, self._close_room, room)
+            else:
+                self._close_room(room)
+
+    def _close_room(self, room):
+        if room.players:
+            return
+        room.hub.close()
+        if self.rooms.get(room.room_id) is room:
+            del self.rooms[room.room_id]
+        if self._open_room is room:
+            self._open_room = None
+
+    async def _referee(self, room, writer, frame):
+        """
+        Trata um quadro de jogador pelo juiz. Retorna True se o quadro
+        foi consumido aqui (não vai ao outro jogador).
+        """
+        if frame[:1] in (bytes([OP_PING]), bytes([OP_PONG])):
+            return False
+        try:
+            data = decode(frame)
+        except ValueError:
+            return False
+        action = data.get("action") if isinstance(data, dict) else None
+        if action == "fleet":
+            taken = set(room.seats.values())
+            claimed = 0 if data.get("host") else 1
+            if room.referee.fleets[claimed] is not None and claimed not in taken:
+                seat = claimed  # volta de uma queda: register() confere se a frota é a mesma
+            else:
+                # Primeira frota: o lugar vem da ordem de entrada, não do cliente
+                seat = room.players.index(writer)
+                if seat in taken:
+                    seat = 1 - seat  # o host caiu antes de mandar a frota
+            try:
+                if seat in taken:
+                    raise ValueError("lugar já ocupado")
+                room.referee.register(seat, data["ships"])
+            except (KeyError, TypeError, ValueError):
+                writer.write(encode_frame({"action": "error", "reason": "frota inválida"}))
+                await writer.drain()
+                raise ConnectionResetError("frota inválida")
+            room.seats[writer] = seat
+            return True
+        if action in ("attack", "result") and not room.referee.ready:
+            # As frotas vão antes dos compromissos: jogada sem as duas é fora do protocolo
+            writer.write(encode_frame({"action": "error", "reason": "frotas não registradas"}))
+            await writer.drain()
+            raise ConnectionResetError("frotas não registradas")
+        if action == "result":
+            return True  # quem responde é o juiz
+        if action == "attack":
+            seat = room.seats.get(writer)
+            try:
+                reply = None if seat is None else room.referee.attack(seat, attack_cell(data))
+            except ValueError:
+                reply = None
+            if reply is None:
+                return True  # fora do turno, repetido ou fora do tabuleiro
+            # Resposta no codec em que o ataque veio
+            writer.write(encode_frame(reply, "bin1" if frame[0] == OP_ATTACK else "json"))
+            await writer.drain()
+        return False
+
+    async def handle(self, reader, writer):
+        room = None
+        try:
+            frame = await read_frame(reader)
+            if frame is None:
+                return
+            try:
+                request = json.loads(frame.decode())
+            except (ValueError, UnicodeDecodeError):
+                return
+            if isinstance(request, dict) and request.get("action") == "watch":
+                await self._watch(request.get("room"), reader, writer)
+                return
+            if not isinstance(request, dict) or request.get("action") != "join":
+                return
+            room = self._join(request.get("room"))
+            if room is None:
+                writer.write(encode_frame({"action": "error", "reason": "sala cheia"}))
+                await writer.drain()
+                return
+            room.players.append(writer)
+            if room.expiry is not None:
+                room.expiry.cancel()
+                room.expiry = None
+            writer.write(encode_frame({"action": "joined", "room": room.room_id,
+                                       "is_host": len(room.players) == 1}))
+            if len(room.players) == 2:
+                if self._open_room is room:
+                    self._open_room = None
+                for player in room.players:
+                    player.write(encode_frame({"action": "paired", "room": room.room_id}))
+            await writer.drain()
+
+            while True:
+                frame = await read_frame(reader)
+                if frame is None:
+                    break
+                if frame[:1] == bytes([OP_SHOT]):
+                    # Delta para os espectadores: só o host publica, e o outro jogador não recebe
+                    if room.is_host(writer):
+                        try:
+                            room.hub.publish(decode(frame))
+                        except ValueError:
+                            pass
+                    continue
+                if await self._referee(room, writer, frame):
+                    continue
+                peer = room.peer_of(writer)
+                if peer is not None:
+                    peer.write(len(frame).to_bytes(4, 'big') + frame)
+                    await peer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if room is not None:
+                self._leave(room, writer)
+                peer = room.peer_of(writer)
+                if peer is not None:
+                    # Avisa o outro jogador; o cliente trata como conexão perdida
+                    peer.close()
+            writer.close()
+
+    async def _watch(self, room_id, reader, writer):
+        room = self.rooms.get(str(room_id))
+        if room is None:
+            writer.write(encode_frame({"action": "error", "reason": "sala não existe"}))
+            await writer.drain()
+            return
+        await room.hub.serve(reader, writer)
+
+    async def start(self):
+        self._server = await asyncio.start_server(self.handle, self.host, self.port)
+        print(f"Relay ouvindo em {self.host}:{self.port}...")
+        return self._server
+
+    async def serve_forever(self):
+        server = await self.start()
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor relay de Batalha Naval")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5000)
+    args = parser.parse_args()
+    try:
+        asyncio.run(RelayServer(args.host, args.port).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
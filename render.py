@@ -0,0 +1,100 @@
+"""
+Desenho dos tabuleiros do núcleo (game.py/board.py) com pygame.
+
+BoardView guarda a grade estática já composta numa Surface e, a cada
+quadro, compara as máscaras do Board com as do último desenho: só as
+células que mudaram são redesenhadas e devolvidas como retângulos sujos
+para pygame.display.update(rects).
+"""
+from functools import lru_cache
+
+import pygame
+
+from board import mask_to_cells
+
+CELL_SIZE = 40
+
+
+def draw_cell(surface, rect, value):
+    """Estilo do modo em rede: água azul, acerto X, erro O, navio verde."""
+    pygame.draw.rect(surface, (0, 0, 100), rect)
+    pygame.draw.rect(surface, (255, 255, 255), rect, 1)
+    if value == "X":
+        pygame.draw.line(surface, (255, 0, 0), rect.topleft, rect.bottomright, 3)
+        pygame.draw.line(surface, (255, 0, 0), rect.topright, rect.bottomleft, 3)
+    elif value == "O":
+        pygame.draw.circle(surface, (255, 255, 255), rect.center, 10, 2)
+    elif value == "N":
+        pygame.draw.rect(surface, (0, 255, 0), rect.inflate(-10, -10))
+
+
+@lru_cache(maxsize=None)
+def static_layer(cell_drawer, size, cell_size):
+    """Grade vazia (todas as células '~') composta uma vez por estilo e tamanho."""
+    layer = pygame.Surface((size * cell_size + 1, size * cell_size + 1))
+    for y in range(size):
+        for x in range(size):
+            cell_drawer(layer, pygame.Rect(x * cell_size, y * cell_size, cell_size, cell_size), "~")
+    return layer
+
+
+class BoardView:
+    """Camada de desenho de um Board numa posição fixa da tela."""
+
+    def __init__(self, board, offset_x=0, offset_y=0, reveal=False,
+                 cell_size=CELL_SIZE, cell_drawer=draw_cell):
+        self.board = board
+        self.offset = (offset_x, offset_y)
+        self.reveal = reveal
+        self.cell_size = cell_size
+        self.cell_drawer = cell_drawer
+        self._drawn = None  # (acertos, erros, navios visíveis) do último desenho
+
+    @property
+    def rect(self):
+        span = self.board.size * self.cell_size + 1
+        return pygame.Rect(self.offset, (span, span))
+
+    def invalidate(self):
+        """Força redesenho completo (ex.: a tela foi apagada por cima)."""
+        self._drawn = None
+
+    def cell_rect(self, x, y):
+        return pygame.Rect(self.offset[0] + x * self.cell_size, self.offset[1] + y * self.cell_size,
+                           self.cell_size, self.cell_size)
+
+    def _state(self):
+        board = self.board
+        return board.hit_mask, board.miss_mask, board.fleet if self.reveal else 0
+
+    def draw(self, surface):
+        """Desenha o que mudou e retorna a lista de retângulos sujos."""
+        state = self._state()
+        if self._drawn is None:
+            surface.blit(static_layer(self.cell_drawer, self.board.size, self.cell_size), self.offset)
+            changed = state[0] | state[1] | state[2]
+            rects = [self.rect]
+        else:
+            if state == self._drawn:
+                return []
+            changed = 0
+            for new, old in zip(state, self._drawn):
+                changed |= new ^ old
+            rects = None
+        self._drawn = state
+
+        dirty = []
+        for x, y in mask_to_cells(changed, self.board.size):
+            value = self.board.cell_value(x, y)
+            if value == "N" and not self.reveal:
+                value = "~"
+            rect = self.cell_rect(x, y)
+            self.cell_drawer(surface, rect, value)
+            # +1 px cobre a borda compartilhada com a célula vizinha
+            dirty.append(pygame.Rect(rect.topleft, (self.cell_size + 1, self.cell_size + 1)))
+        return rects if rects is not None else dirty
+
+
+def draw_board(surface, board, offset_x=0, offset_y=0, reveal=False):
+    """Desenho completo de um board.Board (sem cache)."""
+    BoardView(board, offset_x, offset_y, reveal).draw(surface)
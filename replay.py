@@ -0,0 +1,180 @@
+"""
+Visualizador de partidas gravadas em matchlog.
+
+Abre uma partida pelo índice (mmap) e mostra os dois tabuleiros no lance
+escolhido. Só os registros dessa partida são lidos; voltar lances
+reconstrói os tabuleiros a partir das frotas (O(lances)).
+
+Controles: ←/→ lance a lance, HOME/END início/fim, clique ou arraste na
+barra para pular, ESPAÇO toca/pausa, PGUP/PGDN partida anterior/próxima,
+ESC sai.
+
+Execução: python replay.py [id da partida] [--dir pasta_dos_logs]
+"""
+import argparse
+import sys
+
+import pygame
+
+from animation import now_ms
+from board import Board
+from event_loop import LoopDriver
+from matchlog import LOG_DIR, MatchLog
+from render import BoardView
+from text_cache import render_text
+
+WIDTH, HEIGHT = 950, 580
+BG = (0, 0, 50)
+BAR = pygame.Rect(50, 520, 850, 16)
+PLAY_STEP_MS = 300
+PLAYER_NAMES = {
+    "local": ("Jogador 1", "Jogador 2"),
+    "ai": ("Jogador 1", "Computador"),
+    "network": ("Você", "Oponente"),
+}
+
+
+class Replay:
+    def __init__(self, log, match_id):
+        self.log = log
+        self.load(match_id)
+
+    def load(self, match_id):
+        self.match = self.log.match(match_id)
+        self.step = 0
+        self.boards = None
+        self._rebuild()
+
+    def _rebuild(self):
+        """Tabuleiros com as frotas e os tiros até self.step."""
+        self.boards = []
+        for player in (0, 1):
+            board = Board(self.match.size)
+            for ship in self.match.fleets.get(player, []):
+                board.place_ship(ship)
+            self.boards.append(board)
+        self.views = [BoardView(self.boards[0], 50, 80, reveal=True),
+                      BoardView(self.boards[1], 500, 80, reveal=True)]
+        self._applied = 0
+        self._advance()
+
+    def _advance(self):
+        for shot in self.match.shots[self._applied:self.step]:
+            # O tiro de um jogador cai no tabuleiro do outro; usa o resultado gravado
+            board = self.boards[1 - shot.player]
+            bit = 1 << (shot.cell[1] * board.size + shot.cell[0])
+            if shot.hit:
+                board.hit_mask |= bit
+            else:
+                board.miss_mask |= bit
+        self._applied = self.step
+
+    def seek(self, step):
+        step = max(0, min(len(self.match.shots), step))
+        if step < self._applied:
+            self.step = step
+            self._rebuild()
+        else:
+            self.step = step
+            self._advance()
+
+    def status(self):
+        m = self.match
+        names = PLAYER_NAMES.get(m.mode, ("Jogador 1", "Jogador 2"))
+        text = f"Partida {m.id} ({m.mode})  lance {self.step}/{len(m.shots)}"
+        if self.step:
+            shot = m.shots[self.step - 1]
+            result = "afundou" if shot.sunk else "acerto" if shot.hit else "água"
+            text += f"  {names[shot.player]} em {shot.cell}: {result}"
+        if self.step == len(m.shots):
+            text += "  vencedor: " + (names[m.winner] if m.winner is not None else "nenhum")
+        return names, text
+
+
+def draw(screen, replay):
+    screen.fill(BG)
+    names, status = replay.status()
+    for view, name in zip(replay.views, names):
+        view.invalidate()
+        view.draw(screen)
+        screen.blit(render_text(name, (255, 255, 255), size=28), (view.offset[0], 45))
+    screen.blit(render_text(status, (255, 255, 0), size=26), (50, 485))
+    pygame.draw.rect(screen, (80, 80, 120), BAR)
+    total = max(1, len(replay.match.shots))
+    filled = BAR.copy()
+    filled.width = BAR.width * replay.step // total
+    pygame.draw.rect(screen, (200, 200, 60), filled)
+    pygame.display.flip()
+
+
+def run(log, match_id):
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Batalha Naval - Replay")
+    replay = Replay(log, match_id)
+    driver = LoopDriver()
+    playing = False
+    next_step = 0.0
+    dragging = False
+    redraw = True
+    while True:
+        if playing and now_ms() >= next_step:
+            next_step = now_ms() + PLAY_STEP_MS
+            replay.seek(replay.step + 1)
+            playing = replay.step < len(replay.match.shots)
+            redraw = True
+        if redraw:
+            draw(screen, replay)
+            redraw = False
+        for event in driver.events(busy=playing):
+            if event.type == pygame.QUIT:
+                return
+            if event.type == pygame.KEYDOWN:
+                redraw = True
+                if event.key == pygame.K_ESCAPE:
+                    return
+                if event.key == pygame.K_RIGHT:
+                    replay.seek(replay.step + 1)
+                elif event.key == pygame.K_LEFT:
+                    replay.seek(replay.step - 1)
+                elif event.key == pygame.K_HOME:
+                    replay.seek(0)
+                elif event.key == pygame.K_END:
+                    replay.seek(len(replay.match.shots))
+                elif event.key == pygame.K_SPACE:
+                    playing = not playing
+                elif event.key in (pygame.K_PAGEUP, pygame.K_PAGEDOWN):
+                    delta = -1 if event.key == pygame.K_PAGEUP else 1
+                    target = replay.match.id + delta
+                    if 0 <= target < log.count():
+                        replay.load(target)
+                        playing = False
+            elif event.type == pygame.MOUSEBUTTONDOWN and BAR.collidepoint(event.pos):
+                dragging = True
+            elif event.type == pygame.MOUSEBUTTONUP:
+                dragging = False
+            if event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION) and dragging:
+                fraction = (event.pos[0] - BAR.left) / BAR.width
+                replay.seek(round(fraction * len(replay.match.shots)))
+                redraw = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay de partidas gravadas")
+    parser.add_argument("match", type=int, nargs="?", help="id da partida (padrão: a última)")
+    parser.add_argument("--dir", default=LOG_DIR, help="pasta dos logs")
+    args = parser.parse_args()
+    log = MatchLog(args.dir)
+    if not log.count():
+        print(f"Nenhuma partida gravada em {args.dir}")
+        sys.exit(1)
+    match_id = args.match if args.match is not None else log.count() - 1
+    try:
+        run(log, match_id)
+    finally:
+        log.close()
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Retomada de partida em rede depois de uma queda de conexão.
+
+Na troca de codec (protocol.negotiate) o host manda um token de sessão.
+Se a conexão cair no meio do jogo, os dois lados tentam se reencontrar
+por até RESUME_GRACE segundos (o host volta a aceitar conexões, o
+cliente redisca; pelo relay os dois entram de novo na mesma sala) e
+trocam {"action": "resume", "token", "seq", "hits", "misses", "sunk", "lost"}.
+
+Os turnos alternam a cada tiro, então a sequência das mensagens de jogo
+é a própria contagem de tiros (game.shots) e no máximo um tiro pode ter
+ficado no meio do caminho. hits/misses são os tiros que cada lado já
+recebeu no próprio tabuleiro (Board.hits/misses): com eles reconcile()
+decide se o tiro pendente já foi aplicado do outro lado ou se precisa
+ser reenviado. No primeiro caso a resposta que se perdeu sai do próprio
+resume (peer_result): acerto, navio afundado (sunk) e fim de jogo (lost).
+"""
+import secrets
+import time
+
+from board import mask_to_cells
+
+RESUME_GRACE = 30.0   # segundos para o outro lado voltar
+RESUME_TIMEOUT = 15.0  # espera pelo resume depois de reconectar
+RETRY_INTERVAL = 1.0
+
+
+def new_token():
+    return secrets.token_hex(8)
+
+
+class Session:
+    """
+    token: o combinado na negociação. redial(segundos) refaz a conexão de
+    network (accept do host, reconnect do cliente, sala do relay) e
+    retorna True se conseguiu; pode lançar OSError/ValueError.
+    O convidado manda o resume primeiro; o host só responde depois de
+    conferir o token, para não entregá-lo a quem conectar por acaso.
+    """
+
+    def __init__(self, token, redial, is_host, grace=RESUME_GRACE):
+        self.token = token
+        self.redial = redial
+        self.is_host = is_host
+        self.grace = grace
+
+    def resume_message(self, game, own_board):
+        sunk = [mask_to_cells(mask, own_board.size)
+                for i, mask in enumerate(own_board.ship_masks) if own_board.is_sunk(i)]
+        return {"action": "resume", "token": self.token, "seq": game.shots,
+                "hits": sorted(own_board.hits), "misses": sorted(own_board.misses),
+                "sunk": sunk, "lost": own_board.all_ships_sunk()}
+
+    def reconnect(self, network, game, own_board, cancelled=lambda: False):
+        """
+        Reconecta e troca resume com o outro lado. Retorna o resume dele,
+        ou None se o prazo acabar (ou cancelled() ficar verdadeiro).
+        """
+        deadline = time.monotonic() + self.grace
+        codec = network.codec
+        while not cancelled():
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return None
+            network.disconnect()
+            try:
+                if self.redial(left):
+                    network.codec = codec  # a nova conexão continua no codec combinado
+                    network.set_timeout(min(RESUME_TIMEOUT, max(left, 1.0)))
+                    if not self.is_host:
+                        network.send(self.resume_message(game, own_board))
+                    reply = network.receive()
+                    if reply and reply.get("action") == "resume" and reply.get("token") == self.token:
+                        if self.is_host:
+                            network.send(self.resume_message(game, own_board))
+                        network.start_heartbeat()
+                        return reply
+            except (OSError, ValueError):
+                pass
+            # Recusado, outro cliente ou token errado: tenta de novo até o prazo
+            time.sleep(min(RETRY_INTERVAL, max(0.0, deadline - time.monotonic())))
+        return None
+
+
+_RESUME_KEYS = {"action", "token", "seq", "hits", "misses", "sunk", "lost"}
+
+
+def _check_cells(cells, size):
+    if not isinstance(cells, list):
+        raise ValueError(f"lista de células malformada: {cells!r}")
+    for cell in cells:
+        if not (isinstance(cell, list) and len(cell) == 2
+                and all(isinstance(v, int) and not isinstance(v, bool) and 0 <= v < size
+                        for v in cell)):
+            raise ValueError(f"célula inválida: {cell!r}")
+
+
+def check_resume(peer, size):
+    """
+    Confere o resume vindo do outro lado antes de reconcile()/peer_result():
+    todas as chaves, seq inteiro, lost booleano e células dentro do
+    tabuleiro (o JSON aceita qualquer coisa). Lança ValueError.
+    """
+    if not isinstance(peer, dict) or not _RESUME_KEYS <= peer.keys():
+        raise ValueError(f"resume malformado: {peer!r}")
+    seq = peer["seq"]
+    if not isinstance(seq, int) or isinstance(seq, bool) or seq < 0:
+        raise ValueError(f"seq inválido: {seq!r}")
+    if not isinstance(peer["lost"], bool):
+        raise ValueError(f"lost inválido: {peer['lost']!r}")
+    _check_cells(peer["hits"], size)
+    _check_cells(peer["misses"], size)
+    if not isinstance(peer["sunk"], list):
+        raise ValueError(f"sunk malformado: {peer['sunk']!r}")
+    for ship in peer["sunk"]:
+        _check_cells(ship, size)
+        if not ship:
+            raise ValueError("navio afundado vazio")
+
+
+def reconcile(game, fired_board, peer, pending_cell):
+    """
+    Compara o estado local com o resume do outro lado. fired_board é o
+    tabuleiro em que nós atiramos (só tiros e navios já afundados).
+    Retorna "apply" (o tiro pendente já chegou lá: aplicar aqui),
+    "resend" (não chegou: reenviar o ataque) ou None (nada a fazer).
+    Lança ValueError se os dois lados não forem a mesma partida.
+    """
+    received = {tuple(cell) for cell in peer["hits"] + peer["misses"]}
+    fired = fired_board.hits | fired_board.misses
+    if not fired <= received:
+        raise ValueError("tiros aplicados aqui não constam do outro lado")
+    seq = peer["seq"]
+    if seq == game.shots + 1 and pending_cell is not None and received == fired | {pending_cell}:
+        return "apply"
+    if received != fired:
+        raise ValueError("o outro lado tem tiros que não aconteceram aqui")
+    if seq == game.shots and pending_cell is not None:
+        return "resend"
+    if seq in (game.shots, game.shots - 1):
+        return None  # empatados, ou o outro lado é quem vai aplicar o tiro dele
+    raise ValueError(f"sequência fora de ordem ({seq} x {game.shots})")
+
+
+def peer_result(peer, cell):
+    """Resultado do tiro em cell tirado do resume do outro lado (para Game.apply_result)."""
+    cell = tuple(cell)
+    hit = cell in {tuple(c) for c in peer["hits"]}
+    sunk = next((ship for ship in peer["sunk"] if cell in map(tuple, ship)), None) if hit else None
+    return {"hit": hit, "sunk": sunk, "over": bool(peer["lost"])}
@@ -0,0 +1,190 @@
+"""
+Modo espectador: muitos visualizadores, só leitura, de uma partida em rede.
+
+Quem hospeda publica um delta por tiro (protocol.OP_SHOT: seq, jogador,
+célula, acerto, afundou, fim de jogo; 9 bytes). O SpectatorHub codifica
+cada delta uma vez e repassa os mesmos bytes a todos os espectadores.
+Quem entra atrasado recebe primeiro um snapshot (todos os tiros até ali)
+e depois os deltas. As frotas não são enviadas: o espectador vê o que
+os dois jogadores veem.
+
+Um espectador lento nunca segura os jogadores: publish() só enfileira.
+Cada espectador tem uma fila limitada (VIEWER_QUEUE quadros); se ela
+encher, os deltas pendentes são descartados e ele recebe um snapshot
+novo quando o socket voltar a andar.
+
+O hub roda em asyncio: dentro do relay.py (uma sala = um hub, o host da
+sala manda os deltas pela própria conexão) ou numa thread do host em
+rede local (SpectatorServer, porta SPECTATOR_PORT). O visualizador fica
+em watch.py.
+"""
+import asyncio
+import threading
+from collections import deque
+
+from protocol import encode
+
+SPECTATOR_PORT = 5002
+VIEWER_QUEUE = 64   # quadros pendentes por espectador antes de descartar e ressincronizar
+CLOSE_GRACE = 1.0   # segundos para um espectador receber o fim antes de ser cortado
+
+
+def _frame(payload):
+    return len(payload).to_bytes(4, 'big') + payload
+
+
+def shot_delta(player, shot):
+    """Delta de espectador de um game.ShotResult; player = 0 (host) ou 1."""
+    return {"action": "shot", "seq": 0, "player": player, "cell": list(shot.cell),
+            "hit": bool(shot.hit), "sunk": bool(shot.sunk), "game_over": shot.winner is not None}
+
+
+class _Viewer:
+    def __init__(self, hub, writer):
+        self.hub = hub
+        self.writer = writer
+        self.pending = deque()
+        self.resync = True  # o primeiro quadro é sempre um snapshot
+        self.closed = False
+        self.dropped = 0
+        self.wake = asyncio.Event()
+        self.wake.set()
+
+    def push(self, frame):
+        if self.resync:
+            return  # o snapshot que vai sair já inclui este delta
+        if len(self.pending) >= self.hub.queue_limit:
+            self.pending.clear()
+            self.resync = True
+            self.dropped += 1
+        else:
+            self.pending.append(frame)
+        self.wake.set()
+
+    def stop(self):
+        self.closed = True
+        self.wake.set()
+        # Espectador travado em drain() não pode segurar o fechamento
+        asyncio.get_running_loop().call_later(CLOSE_GRACE, self.writer.transport.abort)
+
+    async def run(self):
+        while True:
+            await self.wake.wait()
+            self.wake.clear()
+            if self.resync:
+                # Snapshot e fila limpa no mesmo passo do loop: nenhum delta some
+                self.resync = False
+                self.pending.clear()
+                self.writer.write(_frame(encode(self.hub.snapshot())))
+            while self.pending:
+                self.writer.write(self.pending.popleft())
+            await self.writer.drain()  # só este espectador espera o socket
+            if self.closed:
+                return
+
+
+class SpectatorHub:
+    """Estado da partida (para snapshots) e os espectadores conectados. Não é thread-safe."""
+
+    def __init__(self, size=10, queue_limit=VIEWER_QUEUE):
+        self.size = size
+        self.queue_limit = queue_limit
+        self.seq = 0
+        self.shots = []    # [jogador, x, y, flags] por tiro
+        self.winner = None
+        self.viewers = set()
+
+    def snapshot(self):
+        return {"action": "snapshot", "seq": self.seq, "size": self.size,
+                "shots": self.shots, "winner": self.winner}
+
+    def publish(self, delta):
+        """Registra um delta (dict de shot_delta) e o repassa a todos."""
+        self.seq += 1
+        delta = dict(delta, seq=self.seq)
+        x, y = delta["cell"]
+        flags = delta["hit"] | delta["sunk"] << 1 | delta["game_over"] << 2
+        self.shots.append([delta["player"], x, y, flags])
+        if delta["game_over"]:
+            self.winner = delta["player"]
+        frame = _frame(encode(delta, "bin1"))
+        for viewer in self.viewers:
+            viewer.push(frame)
+
+    async def serve(self, reader, writer):  # pylint: disable=unused-argument
+        """Atende um espectador até ele sair ou close()."""
+        viewer = _Viewer(self, writer)
+        self.viewers.add(viewer)
+        try:
+            await viewer.run()
+        except OSError:
+            pass  # espectador saiu
+        finally:
+            self.viewers.discard(viewer)
+            writer.close()
+
+    def close(self):
+        """Encerra os espectadores (chamar de dentro do loop asyncio)."""
+        for viewer in self.viewers:
+            viewer.stop()
+
+
+class SpectatorServer:
+    """
+    SpectatorHub num loop asyncio próprio, numa thread, para o host em
+    rede local. publish() pode ser chamada de qualquer thread.
+    """
+
+    def __init__(self, host='0.0.0.0', port=SPECTATOR_PORT, size=10):
+        self.hub = SpectatorHub(size)
+        self.loop = asyncio.new_event_loop()
+        self._server = None
+        self._error = None
+        ready = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(host, port, ready), daemon=True)
+        self.thread.start()
+        ready.wait()
+        if self._error is not None:
+            self.thread.join()
+            raise self._error
+
+    def _run(self, host, port, ready):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self._server = self.loop.run_until_complete(asyncio.start_server(self.hub.serve, host, port))
+        except OSError as e:
+            self._error = e  # porta ocupada: o jogo segue sem espectadores
+            ready.set()
+            self.loop.close()
+            return
+        ready.set()
+        self.loop.run_forever()
+        self.loop.close()
+
+    def publish(self, delta):
+        self.loop.call_soon_threadsafe(self.hub.publish, delta)
+
+    async def _shutdown(self):
+        self._server.close()
+        self.hub.close()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.loop.stop()
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
+        self.thread.join()
+
+
+class RelayPublisher:
+    """Manda os deltas para o relay pela conexão do host; o relay distribui."""
+
+    def __init__(self, network):
+        self.network = network
+
+    def publish(self, delta):
+        try:
+            # Sempre binário: o relay reconhece o quadro pelo primeiro byte
+            self.network.send(delta, codec="bin1")
+        except OSError:
+            pass  # a queda aparece para o jogo pelo Receiver
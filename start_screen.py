@@ -1,14 +1,25 @@
 import pygame
 
+from discovery import Browser
+from event_loop import LoopDriver, wake
+from text_cache import get_font, render_text
+
+MAX_HOSTS = 8  # salas que cabem na tela acima de "Digitar IP manualmente"
+
 class StartScreen:
     def __init__(self, screen):
         self.screen = screen
-        self.font = pygame.font.SysFont(None, 48)
-        self.options = ["Jogo Local", "Criar Sala (Servidor)", "Entrar em Sala (Cliente)"]
+        self.font = get_font(None, 48)
+        self.options = ["Jogo Local", "Contra o Computador", "Computador Difícil", "Criar Sala (Servidor)", "Entrar em Sala (Cliente)", "Sala Online (Relay)"]
         self.selected = 0
         self.ip_input_active = False
         self.ip_text = ''
         self.ip_prompt = "Digite o IP do servidor:"
+        self.input_choice = None  # opção que abriu a caixa de texto
+        self.browser = None       # discovery.Browser enquanto a lista de salas está aberta
+        self.hosts = []           # salas desenhadas: (nome, ip, porta)
+        self.host_selected = 0
+        self.host_rects = []
         self.sound_options = {
             "background": True,
             "pew": True,
@@ -16,18 +27,34 @@ class StartScreen:
         }
 
     def run(self):
-        clock = pygame.time.Clock()
+        try:
+            return self._run()
+        finally:
+            self.stop_browsing()
+
+    def _run(self):
+        driver = LoopDriver()
+        redraw = True
         while True:
-            self.screen.fill((0, 0, 80))
-            if self.ip_input_active:
-                self.draw_ip_input()
-            else:
-                self.draw_options()
-                self.draw_checkboxes()
+            # Menu estático: só redesenha depois de uma tecla/clique; a
+            # lista de salas redesenha a cada despertar (anúncios, expiração)
+            if redraw or self.browser:
+                self.screen.fill((0, 0, 80))
+                if self.ip_input_active:
+                    self.draw_ip_input()
+                elif self.browser:
+                    self.draw_host_list()
+                else:
+                    self.draw_options()
+                    self.draw_checkboxes()
+                pygame.display.flip()
+                redraw = False
 
-            pygame.display.flip()
+            for event in driver.events():
+                if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.VIDEOEXPOSE,
+                                  pygame.WINDOWEXPOSED):
+                    redraw = True
 
-            for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     return None, self.sound_options
 
@@ -36,14 +63,40 @@ class StartScreen:
                         if event.key == pygame.K_RETURN:
                             ip = self.ip_text.strip()
                             if ip:
-                                return ("Entrar em Sala (Cliente)", ip, self.sound_options)
+                                return (self.input_choice, ip, self.sound_options)
                         elif event.key == pygame.K_BACKSPACE:
                             self.ip_text = self.ip_text[:-1]
                         elif event.key == pygame.K_ESCAPE:
                             self.ip_input_active = False
                             self.ip_text = ''
+                        elif self.input_choice == "Sala Online (Relay)":
+                            # relay: "ip[:porta]/sala", porta e sala opcionais
+                            if len(self.ip_text) < 40 and (event.unicode.isalnum() or event.unicode in '.:/'):
+                                self.ip_text += event.unicode
                         elif len(self.ip_text) < 15 and (event.unicode.isdigit() or event.unicode == '.'):
                             self.ip_text += event.unicode
+                elif self.browser:
+                    picked = None
+                    if event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_ESCAPE:
+                            self.stop_browsing()
+                        elif event.key == pygame.K_UP:
+                            self.host_selected = (self.host_selected - 1) % (len(self.hosts) + 1)
+                        elif event.key == pygame.K_DOWN:
+                            self.host_selected = (self.host_selected + 1) % (len(self.hosts) + 1)
+                        elif event.key == pygame.K_RETURN:
+                            picked = self.host_selected
+                    elif event.type == pygame.MOUSEBUTTONDOWN:
+                        picked = next((i for i, r in enumerate(self.host_rects) if r.collidepoint(event.pos)), None)
+                    if picked is not None and picked < len(self.hosts):
+                        _, ip, port = self.hosts[picked]
+                        return (self.input_choice, f"{ip}:{port}", self.sound_options)
+                    if picked is not None:
+                        # Última linha: digitar o IP à mão
+                        self.stop_browsing()
+                        self.ip_input_active = True
+                        self.ip_text = ''
+                        self.ip_prompt = "Digite o IP do servidor:"
                 else:
                     if event.type == pygame.KEYDOWN:
                         if event.key == pygame.K_UP:
@@ -52,38 +105,79 @@ class StartScreen:
                             self.selected = (self.selected + 1) % len(self.options)
                         elif event.key == pygame.K_RETURN:
                             if self.options[self.selected] == "Entrar em Sala (Cliente)":
+                                self.input_choice = self.options[self.selected]
+                                self.start_browsing()
+                            elif self.options[self.selected] == "Sala Online (Relay)":
                                 self.ip_input_active = True
                                 self.ip_text = ''
+                                self.input_choice = self.options[self.selected]
+                                self.ip_prompt = "IP do relay/sala (sala opcional):"
                             else:
                                 return (self.options[self.selected], None, self.sound_options)
 
                     elif event.type == pygame.MOUSEBUTTONDOWN:
                         self.check_checkbox_click(event.pos)
 
-            clock.tick(30)
-
     def draw_options(self):
         for i, option in enumerate(self.options):
             color = (255, 255, 255) if i == self.selected else (180, 180, 180)
-            text = self.font.render(option, True, color)
-            rect = text.get_rect(center=(self.screen.get_width() // 2, 150 + i * 60))
+            text = render_text(option, color, self.font)
+            rect = text.get_rect(center=(self.screen.get_width() // 2, 130 + i * 45))
             self.screen.blit(text, rect)
 
+    def start_browsing(self):
+        try:
+            self.browser = Browser(notify=wake)
+        except OSError:
+            # Porta de descoberta ocupada (ou sem SO_REUSEPORT): só resta o IP à mão
+            self.ip_input_active = True
+            self.ip_text = ''
+            self.ip_prompt = "Lista de salas indisponível. IP:"
+            return
+        self.host_selected = 0
+
+    def stop_browsing(self):
+        if self.browser:
+            self.browser.stop()
+            self.browser = None
+
+    def draw_host_list(self):
+        """Salas anunciadas na rede local; a última linha abre a digitação do IP."""
+        title = render_text("Salas na rede local:", (255, 255, 255), self.font)
+        self.screen.blit(title, (50, 60))
+        # Só as salas desenhadas: o índice de cada linha é o índice em self.hosts
+        self.hosts = self.browser.hosts()[:MAX_HOSTS]
+        self.host_selected = min(self.host_selected, len(self.hosts))
+        labels = [f"{name}  ({ip})" for name, ip, _ in self.hosts] + ["Digitar IP manualmente"]
+        if not self.hosts:
+            searching = render_text("Procurando salas...", (180, 180, 180), size=32)
+            self.screen.blit(searching, (50, 130))
+        item_font = get_font(None, 36)
+        self.host_rects = []
+        top = 180
+        for i, label in enumerate(labels):
+            color = (255, 255, 255) if i == self.host_selected else (180, 180, 180)
+            text = render_text(label, color, item_font)
+            rect = self.screen.blit(text, (70, top + i * 45))
+            self.host_rects.append(rect)
+        info = render_text("Clique numa sala ou use as setas e ENTER. ESC volta.", (200, 200, 200), size=28)
+        self.screen.blit(info, (50, top + len(labels) * 45 + 20))
+
     def draw_ip_input(self):
-        prompt = self.font.render(self.ip_prompt, True, (255, 255, 255))
+        prompt = render_text(self.ip_prompt, (255, 255, 255), self.font)
         self.screen.blit(prompt, (50, 180))
 
         input_box = pygame.Rect(50, 240, 400, 50)
         pygame.draw.rect(self.screen, (255, 255, 255), input_box, 2)
 
-        ip_surface = self.font.render(self.ip_text, True, (255, 255, 255))
+        ip_surface = render_text(self.ip_text, (255, 255, 255), self.font)
         self.screen.blit(ip_surface, (input_box.x + 10, input_box.y + 10))
 
-        info = pygame.font.SysFont(None, 28).render("Pressione ESC para voltar", True, (200, 200, 200))
+        info = render_text("Pressione ESC para voltar", (200, 200, 200), size=28)
         self.screen.blit(info, (50, 310))
 
     def draw_checkboxes(self):
-        small_font = pygame.font.SysFont(None, 32)
+        small_font = get_font(None, 32)
         start_y = 400
         spacing = 40
         for i, (key, label) in enumerate({
@@ -92,7 +186,7 @@ class StartScreen:
             "boom": "Som de Acerto"
         }.items()):
             checked = self.sound_options[key]
-            text = small_font.render(label, True, (255, 255, 255))
+            text = render_text(label, (255, 255, 255), small_font)
             self.screen.blit(text, (100, start_y + i * spacing))
 
             box = pygame.Rect(60, start_y + i * spacing + 5, 20, 20)
@@ -0,0 +1,63 @@
+"""BatchGame (NumPy) contra partidas jogadas em board.Board."""
+import random
+
+import numpy as np
+
+from batch import BatchGame, random_occupancy
+from board import Board
+from game import fleet_lengths
+
+LENGTHS = fleet_lengths("dez_navios")
+
+
+def test_step_matches_board():
+    rng = random.Random(3)
+    boards = []
+    for _ in range(40):
+        board = Board()
+        board.randomize_ships(LENGTHS, rng=rng)
+        boards.append(board)
+    batch = BatchGame.from_boards(boards)
+    order = np.random.default_rng(3).permuted(np.tile(np.arange(100), (len(boards), 1)), axis=1)
+    for step in range(100):
+        cells = order[:, step]
+        hit, sunk, finished = batch.step(cells)
+        for i, board in enumerate(boards):
+            if board.all_ships_sunk():
+                assert not hit[i]
+                continue
+            cell = (int(cells[i]) % 10, int(cells[i]) // 10)
+            assert hit[i] == board.receive_attack(cell)
+            assert sunk[i] == (board.sunk_ship_at(cell) is not None)
+            assert finished[i] == board.all_ships_sunk()
+    assert batch.finished.all()
+    assert (batch.shots_fired == [len(b.hits | b.misses) for b in boards]).all()
+
+
+def test_repeated_shot_is_ignored():
+    board = Board()
+    board.place_ship([(0, 0), (1, 0)])
+    batch = BatchGame.from_boards([board])
+    assert batch.step([0])[0][0]
+    hit, sunk, finished = batch.step([0])
+    assert not hit[0] and batch.shots_fired[0] == 1
+
+
+def test_random_occupancy_follows_rules():
+    occupancy, stuck = random_occupancy(300, LENGTHS, 10, np.random.default_rng(5))
+    for i in set(range(300)) - set(stuck):
+        board = Board()
+        for index, length in enumerate(LENGTHS):
+            cells = [(c % 10, c // 10) for c in np.flatnonzero(occupancy[i] == index + 1)]
+            assert len(cells) == length
+            xs = sorted(x for x, _ in cells)
+            ys = sorted(y for _, y in cells)
+            assert board.can_place_ship(xs[0], ys[0], length, len(set(ys)) == 1)
+            board.place_ship(cells)
+
+
+def test_random_batch_plays_to_the_end():
+    batch = BatchGame.random(200, rng=random.Random(2))
+    assert ((batch.occupancy > 0).sum(axis=1) == sum(LENGTHS)).all()
+    shots = batch.run(lambda b: np.argmin(b.shots, axis=1))
+    assert batch.finished.all() and (shots <= 100).all()
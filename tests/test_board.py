@@ -0,0 +1,123 @@
+"""Board em bitboards contra as regras da grade de strings original."""
+import random
+
+import numpy as np
+import pytest
+
+from board import Board
+
+
+class GridBoard:
+    """Regras do Board original (grade de '~', 'N', 'X', 'O')."""
+
+    def __init__(self, size=10):
+        self.size = size
+        self.grid = [["~"] * size for _ in range(size)]
+        self.ships = []
+        self.hits = set()
+        self.misses = set()
+
+    def place_ship(self, positions):
+        self.ships.append(set(positions))
+        for x, y in positions:
+            self.grid[y][x] = "N"
+
+    def receive_attack(self, cell):
+        x, y = cell
+        for ship in self.ships:
+            if cell in ship:
+                self.hits.add(cell)
+                self.grid[y][x] = "X"
+                return True
+        self.misses.add(cell)
+        self.grid[y][x] = "O"
+        return False
+
+    def all_ships_sunk(self):
+        return all(ship <= self.hits for ship in self.ships)
+
+    def can_place_ship(self, x, y, length, horizontal):
+        coords = []
+        for i in range(length):
+            nx = x + i if horizontal else x
+            ny = y if horizontal else y + i
+            if nx >= self.size or ny >= self.size or self.grid[ny][nx] != "~":
+                return False
+            coords.append((nx, ny))
+        for nx, ny in coords:
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    ax, ay = nx + dx, ny + dy
+                    if 0 <= ax < self.size and 0 <= ay < self.size:
+                        if self.grid[ay][ax] == "N" and (ax, ay) not in coords:
+                            return False
+        return True
+
+
+def _random_position(rng):
+    return rng.randrange(1, 5), rng.randrange(10), rng.randrange(10), rng.random() < 0.5
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_grid_rules(seed):
+    rng = random.Random(seed)
+    for _ in range(200):
+        grid, board = GridBoard(), Board()
+        for _ in range(rng.randrange(5)):
+            length, x, y, horizontal = _random_position(rng)
+            if grid.can_place_ship(x, y, length, horizontal):
+                cells = [(x + i, y) if horizontal else (x, y + i) for i in range(length)]
+                grid.place_ship(cells)
+                board.place_ship(cells)
+        for _ in range(rng.randrange(25)):
+            cell = (rng.randrange(10), rng.randrange(10))
+            assert board.receive_attack(cell) == grid.receive_attack(cell)
+        assert board.grid == grid.grid
+        assert board.hits == grid.hits and board.misses == grid.misses
+        assert board.all_ships_sunk() == grid.all_ships_sunk()
+        for _ in range(20):
+            length, x, y, horizontal = _random_position(rng)
+            assert board.can_place_ship(x, y, length, horizontal) == \
+                grid.can_place_ship(x, y, length, horizontal)
+
+
+def test_sunk_ship():
+    board = Board()
+    board.place_ship([(2, 3), (3, 3)])
+    assert board.receive_attack((2, 3))
+    assert board.sunk_ship_at((2, 3)) is None
+    assert board.receive_attack((3, 3))
+    assert sorted(board.sunk_ship_at((2, 3))) == [(2, 3), (3, 3)]
+    assert board.all_ships_sunk()
+
+
+def test_receive_attack_out_of_range():
+    board = Board()
+    with pytest.raises(IndexError):
+        board.receive_attack((10, 0))
+    with pytest.raises(IndexError):
+        board.receive_attack((0, -1))
+    assert not board.hit_mask and not board.miss_mask
+
+
+def test_numpy_coordinates():
+    board = Board()
+    board.place_ship([(np.int64(1), np.int64(2)), (np.int64(2), np.int64(2))])
+    assert board.receive_attack((np.int64(1), np.int64(2)))
+    assert board.ship_at((np.int64(2), np.int64(2))) == 0
+    assert board.can_place_ship(np.int64(5), np.int64(5), np.int64(3), True)
+
+
+def test_randomize_ships_follows_rules():
+    rng = random.Random(1)
+    lengths = (4, 3, 3, 2, 2, 2, 1, 1, 1, 1)
+    for _ in range(50):
+        board = Board()
+        board.randomize_ships(lengths, rng=rng)
+        grid = GridBoard()
+        for ship in board.ships:
+            xs = sorted(x for x, _ in ship)
+            ys = sorted(y for _, y in ship)
+            assert grid.can_place_ship(xs[0], ys[0], len(ship), len(set(ys)) == 1)
+            grid.place_ship(ship)
+        assert sorted(len(s) for s in board.ships) == sorted(lengths)
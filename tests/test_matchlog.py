@@ -0,0 +1,42 @@
+"""Gravação e leitura do log binário de partidas."""
+import pytest
+
+from matchlog import MatchLog
+
+
+def test_write_and_read(tmp_path):
+    log = MatchLog(str(tmp_path))
+    assert log.count() == 0
+    recorder = log.recorder("ai")
+    recorder.fleet(0, [[(0, 0), (1, 0)], [(5, 5)]])
+    recorder.fleet(1, [[(9, 7), (9, 8), (9, 9)]])
+    recorder.shot(0, (9, 9), True)
+    recorder.shot(1, (3, 3), False)
+    recorder.shot(0, (9, 8), True, sunk=True)
+    assert recorder.finish(0) == 0
+    assert recorder.finish(0) is None  # só grava uma vez
+
+    second = log.recorder("network", size=8)
+    second.finish()
+
+    assert log.count() == 2
+    match = log.match(0)
+    assert (match.mode, match.size, match.winner) == ("ai", 10, 0)
+    assert match.fleets == {0: [[(0, 0), (1, 0)], [(5, 5)]], 1: [[(9, 7), (9, 8), (9, 9)]]}
+    assert [(s.player, s.cell, s.hit, s.sunk) for s in match.shots] == [
+        (0, (9, 9), True, False), (1, (3, 3), False, False), (0, (9, 8), True, True)]
+    other = log.match(1)
+    assert (other.mode, other.size, other.winner, other.shots) == ("network", 8, None, [])
+    with pytest.raises(IndexError):
+        log.match(2)
+    log.close()
+
+
+def test_reader_sees_new_matches(tmp_path):
+    reader = MatchLog(str(tmp_path))
+    writer = MatchLog(str(tmp_path))
+    writer.recorder("local").finish(1)
+    assert reader.match(0).winner == 1
+    writer.recorder("local").finish(0)
+    assert reader.count() == 2 and reader.match(1).winner == 0
+    reader.close()
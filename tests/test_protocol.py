@@ -0,0 +1,58 @@
+"""Codec das mensagens de rede: ida e volta e quadros inválidos."""
+import pytest
+
+from protocol import (OP_ATTACK, OP_COMMIT, OP_RESULT, attack_cell, check_result,
+                      decode, encode)
+
+MESSAGES = [
+    {"action": "attack", "cell": [3, 7]},
+    {"action": "ping", "t": 123456},
+    {"action": "pong", "t": 0xFFFFFFFF},
+    {"action": "shot", "seq": 42, "player": 1, "cell": [9, 0],
+     "hit": True, "sunk": False, "game_over": False},
+    {"action": "result", "hit": False, "sunk": None, "over": False},
+    {"action": "result", "hit": True, "sunk": [[1, 2], [1, 3], [1, 4]], "over": True},
+    {"action": "commit", "digest": "ab" * 32},
+    {"action": "reveal", "ships": [[[0, 0]]], "salt": "00ff"},
+]
+
+
+@pytest.mark.parametrize("codec", ["json", "bin1"])
+@pytest.mark.parametrize("message", MESSAGES, ids=lambda m: m["action"])
+def test_roundtrip(codec, message):
+    assert decode(encode(message, codec)) == message
+
+
+def test_bin1_is_compact():
+    assert encode({"action": "attack", "cell": [3, 7]}, "bin1") == bytes([OP_ATTACK, 3, 7])
+    result = encode({"action": "result", "hit": True, "sunk": None, "over": False}, "bin1")
+    assert result == bytes([OP_RESULT, 1])
+
+
+@pytest.mark.parametrize("payload", [
+    bytes([OP_ATTACK, 1]),          # attack truncado
+    bytes([OP_COMMIT]) + b"\0" * 5,  # commit com tamanho errado
+    bytes([0x05, 1, 2]),             # ping truncado
+    b"{nao e json",
+    b"\xff\xfe",
+])
+def test_decode_rejects_bad_frames(payload):
+    with pytest.raises(ValueError):
+        decode(payload)
+
+
+def test_check_result():
+    assert check_result({"hit": True, "sunk": [[1, 2]], "over": False}) == (True, [[1, 2]], False)
+    for bad in ({"hit": 1, "sunk": None, "over": False},
+                {"hit": True, "over": False, "sunk": [[1, "x"]]},
+                {"hit": True, "sunk": [], "over": False},
+                {"hit": True}):
+        with pytest.raises(ValueError):
+            check_result(bad)
+
+
+def test_attack_cell():
+    assert attack_cell({"cell": [4, 5]}) == (4, 5)
+    for bad in ({}, {"cell": [1]}, {"cell": "ab"}, {"cell": [True, 1]}, {"cell": None}):
+        with pytest.raises(ValueError):
+            attack_cell(bad)
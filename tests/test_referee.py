@@ -0,0 +1,118 @@
+"""Compromisso e revelação da frota, e o juiz do relay."""
+import asyncio
+import json
+
+import pytest
+
+from board import Board
+from referee import Commitment, Referee, check_reveal
+from relay import RelayServer, encode_frame, read_frame
+
+FLEET = [[(0, 0), (1, 0), (2, 0), (3, 0), (4, 0)],
+         [(0, 2), (0, 3), (0, 4), (0, 5)],
+         [(9, 9), (9, 8), (9, 7)],
+         [(5, 5), (6, 5), (7, 5)],
+         [(3, 8), (4, 8)]]
+OTHER = [[(0, 9), (1, 9), (2, 9), (3, 9), (4, 9)],
+         [(9, 0), (9, 1), (9, 2), (9, 3)],
+         [(5, 2), (6, 2), (7, 2)],
+         [(2, 4), (2, 5), (2, 6)],
+         [(6, 7), (7, 7)]]
+
+
+def _fired(fleet, shots):
+    """Tabuleiro de quem atirou com resultados honestos para shots."""
+    board = Board()
+    for cell in shots:
+        ship = next((s for s in fleet if cell in s), None)
+        # O navio afunda no tiro que acerta a última célula dele
+        sunk = ship if ship and all(c in shots for c in ship) and cell == max(ship, key=shots.index) else None
+        board.mark_shot(cell, ship is not None, sunk)
+    return board
+
+
+def test_honest_reveal():
+    commitment = Commitment(FLEET)
+    shots = [(0, 0), (5, 0), (3, 8), (4, 8)]
+    ships = check_reveal(commitment.reveal(), commitment.digest, _fired(FLEET, shots), over=False)
+    assert sorted(map(sorted, ships)) == sorted(map(sorted, FLEET))
+
+
+def test_reveal_different_fleet():
+    commitment = Commitment(FLEET)
+    reveal = dict(commitment.reveal(), ships=OTHER)
+    with pytest.raises(ValueError, match="compromisso"):
+        check_reveal(reveal, commitment.digest, Board(), over=False)
+
+
+def test_reveal_wrong_salt():
+    commitment = Commitment(FLEET)
+    with pytest.raises(ValueError):
+        check_reveal(dict(commitment.reveal(), salt="00"), commitment.digest, Board(), over=False)
+
+
+def test_reveal_contradicts_results():
+    commitment = Commitment(FLEET)
+    lied = Board()
+    lied.mark_shot((0, 0), False)  # era acerto
+    with pytest.raises(ValueError, match="acertos"):
+        check_reveal(commitment.reveal(), commitment.digest, lied, over=False)
+    with pytest.raises(ValueError, match="fim de jogo"):
+        check_reveal(commitment.reveal(), commitment.digest, Board(), over=True)
+
+
+def test_reveal_malformed():
+    commitment = Commitment(FLEET)
+    with pytest.raises(ValueError):
+        check_reveal({"ships": FLEET}, commitment.digest, Board(), over=False)
+    with pytest.raises(ValueError):
+        check_reveal(dict(commitment.reveal(), ships=FLEET[:4]), commitment.digest, Board(), over=False)
+
+
+def test_referee_resolves_attacks():
+    referee = Referee()
+    referee.register(0, FLEET)
+    assert referee.attack(0, (9, 9)) is None  # o outro lado ainda não mandou a frota
+    referee.register(1, OTHER)
+    assert referee.attack(1, (0, 0)) is None  # fora do turno
+    reply = referee.attack(0, (6, 7))
+    assert reply == {"action": "result", "hit": True, "sunk": None, "over": False}
+    assert referee.attack(0, (6, 7)) == reply  # reenviado após uma queda
+    assert referee.attack(1, (3, 8))["hit"]
+    assert referee.attack(0, (7, 7))["sunk"] == [[6, 7], [7, 7]]
+
+
+def test_referee_seat_needs_same_fleet():
+    referee = Referee()
+    referee.register(0, FLEET)
+    referee.register(0, list(reversed(FLEET)))  # volta de uma queda
+    with pytest.raises(ValueError):
+        referee.register(0, OTHER)
+    with pytest.raises(ValueError):
+        referee.register(1, FLEET[:3])
+
+
+def test_relay_refuses_attack_before_fleets():
+    async def scenario():
+        server = RelayServer("127.0.0.1", 0)
+        listener = await server.start()
+        port = listener.sockets[0].getsockname()[1]
+        players = [await asyncio.open_connection("127.0.0.1", port) for _ in range(2)]
+        for reader, writer in players:
+            writer.write(encode_frame({"action": "join", "room": "r1"}))
+            await writer.drain()
+            assert json.loads(await read_frame(reader))["action"] == "joined"
+        for reader, _ in players:
+            assert json.loads(await read_frame(reader))["action"] == "paired"
+        (reader, writer), (other, _) = players
+        writer.write(encode_frame({"action": "attack", "cell": [0, 0]}))
+        await writer.drain()
+        error = json.loads(await read_frame(reader))
+        # Sem as duas frotas o ataque não chega ao outro jogador
+        passed = await read_frame(other)
+        listener.close()
+        return error, passed
+
+    error, passed = asyncio.run(asyncio.wait_for(scenario(), 5))
+    assert error == {"action": "error", "reason": "frotas não registradas"}
+    assert passed is None
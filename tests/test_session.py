@@ -0,0 +1,91 @@
+"""Reconciliação do estado depois de uma queda de conexão."""
+import pytest
+
+from board import Board
+from game import Game
+from session import Session, check_resume, peer_result, reconcile
+
+
+def _match():
+    """Partida com dois tiros já trocados (o nosso erra, o dele acerta)."""
+    mine = Board()
+    mine.place_ship([(0, 0), (1, 0)])
+    game = Game(("self", "enemy"), fleet=(("a", 2),), boards={"self": mine, "enemy": Board()})
+    game.apply_result((5, 5), False)
+    game.shoot((0, 0))
+    return game
+
+
+def _peer(hits=(), misses=((5, 5),), seq=2, sunk=(), lost=False):
+    return {"action": "resume", "token": "t", "seq": seq, "hits": [list(c) for c in hits],
+            "misses": [list(c) for c in misses], "sunk": [[list(c) for c in s] for s in sunk], "lost": lost}
+
+
+def test_in_sync():
+    game = _match()
+    assert reconcile(game, game.boards["enemy"], _peer(), None) is None
+
+
+def test_pending_attack_never_arrived():
+    game = _match()
+    assert reconcile(game, game.boards["enemy"], _peer(), (6, 6)) == "resend"
+
+
+def test_pending_attack_arrived():
+    game = _match()
+    peer = _peer(hits=[(6, 6)], seq=3, sunk=[[(6, 6)]], lost=True)
+    assert reconcile(game, game.boards["enemy"], peer, (6, 6)) == "apply"
+    assert peer_result(peer, (6, 6)) == {"hit": True, "sunk": [[6, 6]], "over": True}
+    assert peer_result(_peer(misses=[(5, 5), (7, 7)]), (7, 7)) == \
+        {"hit": False, "sunk": None, "over": False}
+
+
+def test_peer_one_shot_behind():
+    game = _match()
+    assert reconcile(game, game.boards["enemy"], _peer(seq=1), None) is None
+
+
+@pytest.mark.parametrize("peer", [
+    _peer(misses=()),                    # nosso tiro não consta de lá
+    _peer(misses=[(5, 5), (8, 8)]),      # tiro que não aconteceu aqui
+    _peer(seq=7),                        # sequência fora de ordem
+])
+def test_different_match(peer):
+    game = _match()
+    with pytest.raises(ValueError):
+        reconcile(game, game.boards["enemy"], peer, None)
+
+
+def test_resume_message_roundtrip():
+    game = _match()
+    session = Session("t", redial=None, is_host=False)
+    message = session.resume_message(game, game.boards["self"])
+    assert message["seq"] == 2 and message["hits"] == [(0, 0)] and not message["lost"]
+
+
+def test_check_resume_accepts_real_message():
+    game = _match()
+    message = Session("t", redial=None, is_host=False).resume_message(game, game.boards["self"])
+    # Pela rede as tuplas chegam como listas
+    check_resume({k: [list(c) for c in v] if k in ("hits", "misses") else v
+                  for k, v in message.items()}, 10)
+    check_resume(_peer(hits=[(6, 6)], sunk=[[(6, 6)]]), 10)
+
+
+@pytest.mark.parametrize("change", [
+    {"seq": "2"}, {"seq": None}, {"seq": True}, {"seq": -1},
+    {"lost": 0}, {"hits": None}, {"hits": [[1]]}, {"misses": [[10, 0]]},
+    {"misses": [["a", 0]]}, {"sunk": [[]]}, {"sunk": [[[0, 11]]]}, {"sunk": {}},
+])
+def test_check_resume_rejects(change):
+    with pytest.raises(ValueError):
+        check_resume(dict(_peer(), **change), 10)
+
+
+def test_check_resume_missing_key():
+    peer = _peer()
+    del peer["lost"]
+    with pytest.raises(ValueError):
+        check_resume(peer, 10)
+    with pytest.raises(ValueError):
+        check_resume(["resume"], 10)
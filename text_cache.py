@@ -0,0 +1,59 @@
+"""
+Cache de fontes e de textos renderizados, compartilhado por todas as telas.
+
+pygame.font.SysFont varre as fontes do sistema a cada chamada e
+font.render cria uma Surface nova; aqui cada fonte é aberta uma vez e
+cada (fonte, tamanho, texto, cor) é renderizado uma vez, com descarte do
+menos usado (LRU) quando o cache enche. As Surfaces devolvidas são
+compartilhadas: só blit, nunca desenhar nelas.
+"""
+from collections import OrderedDict
+
+import pygame
+
+_fonts = {}
+
+
+def get_font(name=None, size=24):
+    """Fonte por nome de sistema, arquivo .ttf ou None (padrão do pygame)."""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        if name is None or name.endswith(".ttf"):
+            font = pygame.font.Font(name, size)
+        else:
+            font = pygame.font.SysFont(name, size)
+        _fonts[key] = font
+    return font
+
+
+class TextCache:
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._surfaces = OrderedDict()
+
+    def render(self, text, color, font=None, size=24, antialias=True):
+        """Surface do texto; font pode ser um pygame.font.Font ou nome para get_font."""
+        if font is None or isinstance(font, str):
+            font = get_font(font, size)
+        key = (font, text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.maxsize:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_text(text, color, font=None, size=24, antialias=True):
+    """Atalho para TEXT_CACHE.render."""
+    return TEXT_CACHE.render(text, color, font, size, antialias)
@@ -0,0 +1,170 @@
+"""
+Torneio entre estratégias de ai.py, sem pygame.
+
+Cada par de estratégias joga --games partidas com sementes fixas (a
+mesma semente gera os mesmos tabuleiros, e quem começa alterna). As
+partidas são espalhadas por um ProcessPoolExecutor, então o tempo cai
+com o número de núcleos. Ao fim mostra, por estratégia, a taxa de
+vitórias, a distribuição de tiros até vencer e a latência por jogada.
+
+Execução:
+    python tournament.py [--strategies densidade aleatorio] [--games 200]
+                         [--workers N] [--seed 0] [--budget-ms 50] [--json saida.json]
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ai import AI_PLAYERS, MonteCarloAI, make_ai
+from game import Game, fleet_lengths
+
+
+def _options(name, budget_ms):
+    """Prazo por jogada só para as estratégias que pensam em segundo plano."""
+    return {"budget_ms": budget_ms} if issubclass(AI_PLAYERS[name], MonteCarloAI) else {}
+
+
+def play_match(match):
+    """
+    Joga uma partida. match = (estratégia A, estratégia B, semente, frota,
+    budget_ms); A começa nas sementes pares. Retorna dicionário com o
+    vencedor ("A"/"B"), os tiros de cada lado e as latências (ms) por jogada.
+    """
+    name_a, name_b, seed, fleet, budget_ms = match
+    rng = random.Random(seed)
+    order = ("A", "B") if seed % 2 == 0 else ("B", "A")
+    game = Game(players=order, fleet=fleet)
+    game.randomize(rng)
+    lengths = fleet_lengths(game.fleet)
+    bots = {
+        "A": make_ai(name_a, lengths, game.size, random.Random(rng.getrandbits(32)),
+                     **_options(name_a, budget_ms)),
+        "B": make_ai(name_b, lengths, game.size, random.Random(rng.getrandbits(32)),
+                     **_options(name_b, budget_ms)),
+    }
+    shots = {"A": 0, "B": 0}
+    latency = {"A": [], "B": []}
+    while not game.over:
+        side = game.current
+        bot = bots[side]
+        start = time.perf_counter()
+        bot.start_turn()
+        cell = bot.choose()
+        latency[side].append((time.perf_counter() - start) * 1000.0)
+        shot = game.shoot(cell)
+        if shot is None:
+            raise RuntimeError(f"{(name_a, name_b)[side == 'B']} escolheu tiro inválido {cell}")
+        bot.observe(shot)
+        shots[side] += 1
+    return {"pair": (name_a, name_b), "winner": game.winner, "shots": shots, "latency": latency}
+
+
+def _percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100.0 * len(values)))]
+
+
+def summarize(results):
+    """Agrega os resultados por estratégia e por confronto."""
+    per = {}
+    pairs = {}
+    for r in results:
+        name_a, name_b = r["pair"]
+        pair = pairs.setdefault(f"{name_a} x {name_b}", {"games": 0, "wins_a": 0, "wins_b": 0})
+        pair["games"] += 1
+        pair["wins_a" if r["winner"] == "A" else "wins_b"] += 1
+        for side, name in (("A", name_a), ("B", name_b)):
+            stats = per.setdefault(name, {"games": 0, "wins": 0, "shots_to_win": [], "latency": []})
+            stats["games"] += 1
+            stats["latency"].extend(r["latency"][side])
+            if r["winner"] == side:
+                stats["wins"] += 1
+                stats["shots_to_win"].append(r["shots"][side])
+
+    strategies = {}
+    for name, stats in sorted(per.items()):
+        shots = stats["shots_to_win"]
+        lat = stats["latency"]
+        strategies[name] = {
+            "games": stats["games"],
+            "wins": stats["wins"],
+            "win_rate": stats["wins"] / stats["games"],
+            "shots_to_win": {
+                "mean": statistics.fmean(shots) if shots else None,
+                "median": statistics.median(shots) if shots else None,
+                "p90": _percentile(shots, 90),
+                "min": min(shots, default=None),
+                "max": max(shots, default=None),
+                "histogram": {str(k): shots.count(k) for k in sorted(set(shots))},
+            },
+            "latency_ms": {
+                "mean": statistics.fmean(lat) if lat else None,
+                "p50": _percentile(lat, 50),
+                "p99": _percentile(lat, 99),
+                "max": max(lat, default=None),
+            },
+        }
+    return {"strategies": strategies, "pairs": pairs}
+
+
+def run(strategies, games, workers=None, seed=0, fleet="dez_navios", budget_ms=50):
+    """Todos contra todos (inclusive espelho), games partidas por confronto."""
+    matches = [(a, b, seed * 1_000_003 + i, fleet, budget_ms)
+               for a, b in itertools.combinations_with_replacement(strategies, 2)
+               for i in range(games)]
+    workers = workers or os.cpu_count() or 1
+    # Lotes grandes o bastante para diluir o custo de envio entre processos
+    chunksize = max(1, len(matches) // (workers * 8))
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(play_match, matches, chunksize=chunksize))
+    summary = summarize(results)
+    summary["config"] = {"strategies": list(strategies), "games": games, "workers": workers,
+                         "seed": seed, "fleet": fleet, "budget_ms": budget_ms,
+                         "seconds": time.perf_counter() - start}
+    return summary
+
+
+def print_summary(summary):
+    config = summary["config"]
+    print(f"{len(config['strategies'])} estratégias, {config['games']} partidas por confronto, "
+          f"{config['workers']} processos, {config['seconds']:.1f} s")
+    print(f"{'estratégia':<14}{'vitórias':>10}{'tiros (média)':>15}{'p90':>6}{'lat. p50':>10}{'lat. p99':>10}")
+    for name, s in summary["strategies"].items():
+        shots = s["shots_to_win"]
+        lat = s["latency_ms"]
+        mean = f"{shots['mean']:.1f}" if shots["mean"] is not None else "-"
+        print(f"{name:<14}{s['win_rate']:>9.1%} {mean:>15}{shots['p90'] or '-':>6}"
+              f"{lat['p50']:>9.2f}ms{lat['p99']:>8.2f}ms")
+    for pair, p in summary["pairs"].items():
+        print(f"  {pair}: {p['wins_a']} x {p['wins_b']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Torneio entre estratégias de IA da Batalha Naval")
+    parser.add_argument("--strategies", nargs="+", default=["aleatorio", "densidade"],
+                        choices=sorted(AI_PLAYERS))
+    parser.add_argument("--games", type=int, default=200, help="partidas por confronto")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: núcleos)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fleet", default="dez_navios")
+    parser.add_argument("--budget-ms", type=int, default=50, help="prazo por jogada do monte_carlo")
+    parser.add_argument("--json", help="grava o resumo completo neste arquivo")
+    args = parser.parse_args()
+
+    summary = run(args.strategies, args.games, args.workers, args.seed, args.fleet, args.budget_ms)
+    print_summary(summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
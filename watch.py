@@ -0,0 +1,136 @@
+"""
+Visualizador do modo espectador (ver spectator.py).
+
+Conecta ao host da partida (rede local, porta SPECTATOR_PORT) ou a uma
+sala do relay e desenha os dois tabuleiros a partir do snapshot inicial
+e dos deltas de cada tiro. Só leitura: nada do que acontece aqui afeta
+os jogadores. ESC sai.
+
+Execução:
+    python watch.py ip[:porta]            # host em rede local
+    python watch.py ip[:porta] --room id  # sala do relay
+"""
+import argparse
+
+import pygame
+
+from board import Board
+from event_loop import LoopDriver, wake
+from network import NetworkClient, Receiver
+from render import BoardView
+from spectator import SPECTATOR_PORT
+from text_cache import render_text
+
+WIDTH, HEIGHT = 950, 560
+BG = (0, 0, 50)
+NAMES = ("Anfitrião", "Convidado")
+
+
+class Spectator:
+    """Tabuleiros montados a partir de snapshot + deltas."""
+
+    def __init__(self):
+        self.reset(10)
+
+    def reset(self, size):
+        self.boards = [Board(size), Board(size)]
+        self.views = [BoardView(self.boards[0], 50, 80), BoardView(self.boards[1], 500, 80)]
+        self.seq = 0
+        self.shots = 0
+        self.winner = None
+        self.last = None
+
+    def _mark(self, player, x, y, hit):
+        # O tiro de um jogador cai no tabuleiro do outro
+        board = self.boards[1 - player]
+        bit = 1 << (y * board.size + x)
+        if hit:
+            board.hit_mask |= bit
+        else:
+            board.miss_mask |= bit
+        self.shots += 1
+
+    def apply(self, data):
+        """Aplica uma mensagem do hub; retorna True se algo mudou."""
+        action = data.get("action")
+        if action == "snapshot":
+            self.reset(data["size"])
+            for player, x, y, flags in data["shots"]:
+                self._mark(player, x, y, flags & 1)
+            self.seq = data["seq"]
+            self.winner = data["winner"]
+            return True
+        if action == "shot" and data["seq"] > self.seq:
+            self.seq = data["seq"]
+            self._mark(data["player"], *data["cell"], data["hit"])
+            self.last = data
+            if data["game_over"]:
+                self.winner = data["player"]
+            return True
+        return False
+
+    def status(self):
+        text = f"Ao vivo - {self.shots} tiros"
+        if self.last is not None:
+            result = "afundou" if self.last["sunk"] else "acerto" if self.last["hit"] else "água"
+            text += f"  {NAMES[self.last['player']]} em {tuple(self.last['cell'])}: {result}"
+        if self.winner is not None:
+            text = f"Vencedor: {NAMES[self.winner]}  ({self.shots} tiros)"
+        return text
+
+
+def watch(host, port=SPECTATOR_PORT, room=None):
+    """Abre a janela e acompanha a partida até ESC ou a conexão cair."""
+    client = NetworkClient(host, port)
+    if room is not None:
+        client.send({"action": "watch", "room": room})
+    receiver = Receiver(client, notify=wake)
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Batalha Naval - Espectador")
+    spectator = Spectator()
+    driver = LoopDriver()
+    message = "Conectando..."
+    try:
+        while True:
+            screen.fill(BG)
+            for view, name in zip(spectator.views, NAMES):
+                view.invalidate()
+                view.draw(screen)
+                screen.blit(render_text(name, (255, 255, 255), size=28), (view.offset[0], 45))
+            screen.blit(render_text(message, (255, 255, 0), size=26), (50, 500))
+            pygame.display.flip()
+            changed = False
+            while not changed:
+                for event in driver.events():
+                    if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                        return
+                    if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                        changed = True
+                for data in receiver.poll():
+                    if data.get("action") == "disconnected":
+                        message = spectator.status() + "  (transmissão encerrada)"
+                        changed = True
+                    elif data.get("action") == "error":
+                        message = f"Erro: {data.get('reason')}"
+                        changed = True
+                    elif spectator.apply(data):
+                        message = spectator.status()
+                        changed = True
+    finally:
+        client.close()
+        pygame.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assistir a uma partida de Batalha Naval")
+    parser.add_argument("address", help="ip[:porta] do host (rede local) ou do relay")
+    parser.add_argument("--room", help="sala do relay (com o endereço do relay)")
+    args = parser.parse_args()
+    host, _, port = args.address.partition(":")
+    default = 5000 if args.room else SPECTATOR_PORT
+    watch(host, int(port) if port else default, args.room)
+
+
+if __name__ == "__main__":
+    main()